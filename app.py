@@ -1,13 +1,14 @@
 import os
-import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
+from logging_config import configure_logging
+from db_config import engine_options, replica_binds
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (LOG_MODE, LOG_LEVEL, LOG_FORMAT, LOG_QUEUE)
+configure_logging()
 
 class Base(DeclarativeBase):
     pass
@@ -24,18 +25,33 @@ CORS(app)
 
 # Configure the database
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///dsa_study_plan.db")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
+# Pool sizing per DB_POOL_PROFILE, see db_config
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+# Optional read replica (DATABASE_REPLICA_URL) for read-only endpoints
+app.config["SQLALCHEMY_BINDS"] = replica_binds()
 
 # Initialize the app with the extension
 db.init_app(app)
 
-with app.app_context():
-    # Import models to create tables
-    import models
-    db.create_all()
+# Import models
+import models
+
+# Create missing tables at startup. Set DB_AUTO_CREATE=0 in production and
+# run `flask --app main upgrade-db` on deploy instead
+if os.environ.get("DB_AUTO_CREATE", "1") == "1":
+    with app.app_context():
+        db.create_all()
 
 # Import routes
 import routes
+
+# Import CLI commands
+import commands
+
+# Fingerprinted static assets (see `flask --app main build-assets`)
+import assets
+assets.init_app(app)
+
+# Opt-in metrics and profiling hooks
+import instrumentation
+instrumentation.init_app(app)
@@ -0,0 +1,139 @@
+import glob
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import abort, request, send_from_directory, url_for
+from werkzeug.security import safe_join
+
+from page_cache import page_cache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Build output, served under /static/dist/
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Source files, relative to static/
+ASSET_PATTERNS = ('css/*.css', 'js/*.js', 'js/pages/*.js')
+
+# Hashed file names never change content
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# Logical path -> fingerprinted path, both relative to static/
+_manifest = {}
+
+
+def minify_css(source):
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    # Not ':', which is significant in selectors such as `div :hover`
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r'([{;][\w-]+):\s+', r'\1:', source)
+    return source.replace(';}', '}').strip()
+
+
+def minify_js(source):
+    """
+    Line-based and conservative: drops indentation, blank lines and
+    whole-line // comments but keeps every line break, so automatic
+    semicolon insertion and template literals behave exactly as before.
+    """
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def build_assets(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """
+    Minify, fingerprint and precompress every asset matching
+    ASSET_PATTERNS into dist_dir and write the manifest. Returns a list of
+    (logical path, fingerprinted path, source bytes, minified bytes,
+    gzip bytes, brotli bytes or None).
+    """
+    report = []
+    manifest = {}
+    for pattern in ASSET_PATTERNS:
+        for source_path in sorted(glob.glob(os.path.join(static_dir, pattern))):
+            logical = os.path.relpath(source_path, static_dir).replace(os.sep, '/')
+            stem, ext = os.path.splitext(logical)
+            with open(source_path, encoding='utf-8') as f:
+                source = f.read()
+            content = MINIFIERS[ext](source).encode('utf-8')
+
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            built = f'{stem}.{digest}{ext}'
+            target = os.path.join(dist_dir, built)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(content)
+            gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzipped)
+            brotlied = None
+            if brotli is not None:
+                brotlied = brotli.compress(content, quality=11)
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotlied)
+
+            manifest[logical] = 'dist/' + built
+            report.append((logical, built, len(source.encode('utf-8')), len(content),
+                           len(gzipped), len(brotlied) if brotlied is not None else None))
+
+    os.makedirs(dist_dir, exist_ok=True)
+    with open(os.path.join(dist_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    _manifest.clear()
+    _manifest.update(manifest)
+    page_cache.invalidate()
+    return report
+
+
+def load_manifest(path=MANIFEST_PATH):
+    _manifest.clear()
+    if os.path.exists(path):
+        with open(path) as f:
+            _manifest.update(json.load(f))
+    # Cached pages embed asset URLs
+    page_cache.invalidate()
+
+
+def asset_url(filename):
+    """url_for('static') of the built asset, or of the source file if it was not built"""
+    return url_for('static', filename=_manifest.get(filename, filename))
+
+
+def init_app(app):
+    """Load the manifest, expose asset_url to templates and serve /static/dist/"""
+    load_manifest()
+    app.jinja_env.globals['asset_url'] = asset_url
+
+    @app.route('/static/dist/<path:filename>')
+    def built_asset(filename):
+        """Fingerprinted asset, precompressed when the client accepts it"""
+        path = safe_join(DIST_DIR, filename)
+        if path is None:
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0]
+        encoding = None
+        for candidate, ext in (('br', '.br'), ('gzip', '.gz')):
+            if candidate in request.accept_encodings and os.path.isfile(path + ext):
+                encoding = candidate
+                filename += ext
+                break
+
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Flask API and the StudyPlanGenerator stages.
+
+Runs the app in-process against a throwaway SQLite database with Firebase
+token verification stubbed out, drives the JSON endpoints with synthetic
+users, and reports throughput, p50/p95/p99 latency and SQL queries per
+request. Results can be written to JSON and compared against a baseline.
+
+Usage:
+    python benchmarks/bench_api.py [--users 50] [--rounds 5] [--output results.json]
+                                   [--baseline old.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Rating distributions for synthetic users
+DISTRIBUTIONS = {
+    'uniform': lambda rng: rng.randint(1, 5),
+    'beginner': lambda rng: rng.choice([1, 1, 2, 2, 3]),
+    'advanced': lambda rng: rng.choice([3, 4, 4, 5, 5]),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies, queries, elapsed):
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries_per_request': round(sum(queries) / len(queries), 2),
+    }
+
+
+def setup_app(database_path):
+    os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+    # Measure every generate-plan call rather than the limiter or coalescing
+    os.environ['PLAN_RATE_LIMIT_PER_MINUTE'] = '0'
+    os.environ['PLAN_COALESCE_SECONDS'] = '0'
+    logging.disable(logging.CRITICAL)
+
+    import main  # noqa: F401  (registers routes)
+    import routes
+    from app import app, db
+    from sqlalchemy import event
+
+    def fake_verify_id_token(id_token, *args, **kwargs):
+        return {'uid': f'bench-{id_token}', 'email': f'{id_token}@bench.local',
+                'name': id_token, 'exp': time.time() + 3600}
+
+    routes._firebase_auth = SimpleNamespace(verify_id_token=fake_verify_id_token)
+
+    counter = {'queries': 0}
+    with app.app_context():
+        db.create_all()
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda *args: counter.__setitem__('queries', counter['queries'] + 1))
+    return app, counter
+
+
+def bench_api(users, rounds, seed):
+    from topic_catalog import TOPICS_INFO
+    from token_cache import token_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, counter = setup_app(os.path.join(tmp, 'bench.db'))
+        rng = random.Random(seed)
+        topics = list(TOPICS_INFO)
+        clients = []
+        for i in range(users):
+            distribution = DISTRIBUTIONS[list(DISTRIBUTIONS)[i % len(DISTRIBUTIONS)]]
+            client = app.test_client()
+            ratings = {topic: distribution(rng) for topic in topics}
+            clients.append((f'user{i}', client, ratings))
+
+        scenarios = {
+            'verify-token (cold)': lambda token, client, ratings: (
+                token_cache.clear(), client.post('/api/verify-token', json={'idToken': token}))[1],
+            'verify-token (cached)': lambda token, client, ratings:
+                client.post('/api/verify-token', json={'idToken': token}),
+            'save-ratings': lambda token, client, ratings:
+                client.post('/api/save-ratings', json={'ratings': ratings}),
+            'generate-plan': lambda token, client, ratings:
+                client.post('/api/generate-plan', json={}),
+            'user-data': lambda token, client, ratings:
+                client.get('/api/user-data'),
+            'user-data (If-None-Match)': lambda token, client, ratings:
+                client.get('/api/user-data', headers={'If-None-Match': etags[token]}),
+            'page /dashboard': lambda token, client, ratings:
+                client.get('/dashboard'),
+        }
+        etags = {}
+
+        results = {}
+        for name, call in scenarios.items():
+            # One unmeasured pass to warm caches and connections
+            for token, client, ratings in clients:
+                response = call(token, client, ratings)
+                if name == 'user-data':
+                    etags[token] = response.headers['ETag']
+
+            latencies, queries = [], []
+            start_all = time.perf_counter()
+            for round_number in range(rounds):
+                for token, client, ratings in clients:
+                    if name == 'save-ratings':
+                        # Change a couple of ratings so every save writes
+                        ratings = dict(ratings)
+                        for topic in rng.sample(topics, 2):
+                            ratings[topic] = rng.randint(1, 5)
+                    before = counter['queries']
+                    start = time.perf_counter()
+                    response = call(token, client, ratings)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    queries.append(counter['queries'] - before)
+                    if response.status_code >= 400:
+                        raise RuntimeError(f"{name} returned {response.status_code}: {response.get_data(as_text=True)}")
+            results[name] = summarize(latencies, queries, time.perf_counter() - start_all)
+        return results
+
+
+def time_call(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'p50_ms': round(percentile(samples, 50), 4), 'p95_ms': round(percentile(samples, 95), 4)}
+
+
+def bench_generator(repeat, seed):
+    from plan_cache import PlanCache
+    from plan_storage import decode_plan, encode_plan
+    from study_plan_generator import StudyPlanGenerator
+    from topic_catalog import TOPICS_INFO
+
+    rng = random.Random(seed)
+    topics = list(TOPICS_INFO)
+    ratings = {topic: rng.randint(1, 5) for topic in topics}
+    cohort = [{topic: rng.randint(1, 5) for topic in topics} for _ in range(1000)]
+
+    uncached = StudyPlanGenerator(plan_cache=None)
+    cached = StudyPlanGenerator(plan_cache=PlanCache())
+    priorities = uncached._calculate_priorities(ratings)
+    daily_plan = uncached._distribute_topics(priorities)
+    template = uncached._build_plan_template(daily_plan, ratings)
+    plan = uncached._stamp_dates(template)
+    encoded = encode_plan(plan)
+    cached.generate_plan(ratings)
+
+    return {
+        'StudyPlanGenerator()': time_call(StudyPlanGenerator, repeat),
+        '_calculate_priorities': time_call(lambda: uncached._calculate_priorities(ratings), repeat),
+        '_distribute_topics': time_call(lambda: uncached._distribute_topics(priorities), repeat),
+        '_build_plan_template': time_call(lambda: uncached._build_plan_template(daily_plan, ratings), repeat),
+        '_stamp_dates': time_call(lambda: uncached._stamp_dates(template), repeat),
+        'generate_plan (uncached)': time_call(lambda: uncached.generate_plan(ratings), repeat),
+        'generate_plan (cached)': time_call(lambda: cached.generate_plan(ratings), repeat),
+        'generate_plans (1000 users)': time_call(lambda: uncached.generate_plans(cohort), max(1, repeat // 100)),
+        'encode_plan': time_call(lambda: encode_plan(plan), repeat),
+        'decode_plan': time_call(lambda: decode_plan(encoded), repeat),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    List regressions against a baseline: p95 latency more than `tolerance`
+    (relative) above it, or any increase in queries per request.
+    """
+    regressions = []
+    for section in ('api', 'generator'):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous:
+                continue
+            if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{section}/{name} p95_ms: {previous['p95_ms']} -> {current['p95_ms']}")
+            if current.get('queries_per_request', 0) > previous.get('queries_per_request', 0) + 0.01:
+                regressions.append(f"{section}/{name} queries_per_request: "
+                                   f"{previous['queries_per_request']} -> {current['queries_per_request']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the API and plan generator.')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=1000, help='Iterations per generator microbenchmark.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results as JSON to this file.')
+    parser.add_argument('--baseline', help='Fail if results regress against this JSON file.')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative p95 regression against the baseline.')
+    args = parser.parse_args()
+
+    results = {
+        'api': bench_api(args.users, args.rounds, args.seed),
+        'generator': bench_generator(args.repeat, args.seed),
+    }
+
+    for section, entries in results.items():
+        print(f"== {section}")
+        for name, metrics in entries.items():
+            print(f"{name:>30}: " + ", ".join(f"{k}={v}" for k, v in metrics.items()))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark application startup.
+
+Imports `main` in fresh interpreters against a throwaway SQLite database
+and reports the median wall time for each startup mode: with schema
+creation at import (DB_AUTO_CREATE=1, the old behaviour) and without it.
+Also times the first token verification, which now pays for initializing
+the Firebase Admin SDK, so the deferred cost stays visible.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+FIRST_VERIFY_SNIPPET = """
+import time
+import main
+import routes
+start = time.perf_counter()
+routes.firebase_auth()
+print(time.perf_counter() - start)
+"""
+
+
+def run(snippet, env):
+    output = subprocess.run([sys.executable, '-c', snippet], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark application import time.')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                   LOG_LEVEL='WARNING', PYTHONDONTWRITEBYTECODE='1')
+        # Warm the OS file cache and create the schema once
+        run(IMPORT_SNIPPET, dict(env, DB_AUTO_CREATE='1'))
+
+        cases = {
+            'import main (DB_AUTO_CREATE=1)': (IMPORT_SNIPPET, dict(env, DB_AUTO_CREATE='1')),
+            'import main (DB_AUTO_CREATE=0)': (IMPORT_SNIPPET, dict(env, DB_AUTO_CREATE='0')),
+            'first firebase_auth()': (FIRST_VERIFY_SNIPPET, dict(env, DB_AUTO_CREATE='0')),
+        }
+        for name, (snippet, case_env) in cases.items():
+            samples = [run(snippet, case_env) for _ in range(args.repeat)]
+            print(f"{name:>32}: median_ms={statistics.median(samples):.1f}, "
+                  f"min_ms={min(samples):.1f}, max_ms={max(samples):.1f}")
+
+
+if __name__ == '__main__':
+    main()
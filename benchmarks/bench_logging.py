@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of logging.
+
+Times an uncached StudyPlanGenerator.generate_plan call (the body of a
+generate-plan request) under the old configuration (DEBUG, synchronous
+text handler) and under the production modes from logging_config, with
+output written to a temporary file. Also times a single suppressed log
+call with an eagerly built f-string against lazy %-style arguments.
+
+Usage:
+    python benchmarks/bench_logging.py [--repeat 2000]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from logging_config import configure_logging, stop_listener  # noqa: E402
+
+# name -> configure_logging arguments
+MODES = {
+    'before: DEBUG, text, sync': dict(level='DEBUG', log_format='text', use_queue=False),
+    'INFO, text, sync': dict(level='INFO', log_format='text', use_queue=False),
+    'INFO, json, queue (production)': dict(level='INFO', log_format='json', use_queue=True),
+    'DEBUG, json, queue': dict(level='DEBUG', log_format='json', use_queue=True),
+    'WARNING, json, queue': dict(level='WARNING', log_format='json', use_queue=True),
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def time_call(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return {
+        'mean_us': round(sum(samples) / len(samples), 2),
+        'p50_us': round(percentile(samples, 50), 2),
+        'p95_us': round(percentile(samples, 95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark logging overhead per request.')
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from study_plan_generator import StudyPlanGenerator
+    from topic_catalog import TOPICS_INFO
+
+    rng = random.Random(args.seed)
+    ratings = {topic: rng.randint(1, 5) for topic in TOPICS_INFO}
+    generator = StudyPlanGenerator(plan_cache=None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("== generate_plan (uncached), per call")
+        for name, options in MODES.items():
+            with open(os.path.join(tmp, 'bench.log'), 'w') as stream:
+                configure_logging(stream=stream, **options)
+                generator.generate_plan(ratings)
+                result = time_call(lambda: generator.generate_plan(ratings), args.repeat)
+                stop_listener()
+            print(f"{name:>32}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+
+        print("== one suppressed log call (INFO record, WARNING level)")
+        with open(os.path.join(tmp, 'bench.log'), 'w') as stream:
+            configure_logging(level='WARNING', log_format='text', use_queue=False, stream=stream)
+            eager = time_call(lambda: logging.info(f"Generating study plan for ratings: {ratings}"), args.repeat)
+            lazy = time_call(lambda: logging.info("Generating study plan for ratings: %s", ratings), args.repeat)
+        print(f"{'f-string':>32}: " + ", ".join(f"{k}={v}" for k, v in eager.items()))
+        print(f"{'%-style':>32}: " + ", ".join(f"{k}={v}" for k, v in lazy.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Time prerequisite graph construction and per-user penalties on large catalogs.
+
+Usage: python benchmarks/bench_prereq_graph.py [--topics 500] [--users 200] [--chain 40]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prereq_graph import PrerequisiteGraph
+
+
+def build_topics(n_topics, chain, rng):
+    """Synthetic catalog: each topic depends on up to three of the `chain` topics before it"""
+    names = [f'Topic {i}' for i in range(n_topics)]
+    prereqs = [rng.sample(names[max(0, i - chain):i], min(i, rng.randint(0, 3))) for i in range(n_topics)]
+    return names, prereqs
+
+
+def timed(func, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {'p50_ms': round(statistics.median(latencies), 3),
+            'p95_ms': round(latencies[int(0.95 * (runs - 1))], 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--chain', type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names, prereqs = build_topics(args.topics, args.chain, rng)
+    graph = PrerequisiteGraph(names, prereqs)
+    rating_sets = [{name: rng.randint(1, 5) for name in rng.sample(names, len(names) // 2)}
+                   for _ in range(args.users)]
+    users = iter(rating_sets * 4)
+
+    print(f"{args.topics} topics, {sum(map(len, prereqs))} prerequisite edges, {args.users} users")
+    print(f"{'build':>20}: {timed(lambda: PrerequisiteGraph(names, prereqs), 20)}")
+    print(f"{'direct penalties':>20}: {timed(lambda: graph.penalties(next(users)), args.users)}")
+    print(f"{'transitive penalties':>20}: {timed(lambda: graph.penalties(next(users), True), args.users)}")
+    print(f"{'unlock order':>20}: {timed(lambda: graph.unlock_order(next(users)), args.users)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compare schedule quality and latency of the greedy and bin-packing schedulers.
+
+Usage: python benchmarks/bench_scheduler.py [--users 500] [--node-budget 20000] [--topics 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import DEFAULT_DAILY_TIME_LIMITS, BinPackingScheduler, GreedyScheduler
+from study_plan_generator import StudyPlanGenerator
+from topic_catalog import PRACTICE_PROBLEMS, TOPICS_INFO, TopicCatalog
+
+
+def build_catalog(n_topics):
+    """The real catalog, extended with synthetic topics chained onto it"""
+    topics_info = dict(TOPICS_INFO)
+    rng = random.Random(0)
+    names = list(topics_info)
+    while len(topics_info) < n_topics:
+        name = f'Synthetic Topic {len(topics_info)}'
+        topics_info[name] = {
+            'time': rng.randint(1, 4),
+            'difficulty': rng.randint(1, 5),
+            'prerequisites': rng.sample(names, rng.randint(0, 2)),
+        }
+        names.append(name)
+    return TopicCatalog(topics_info, PRACTICE_PROBLEMS)
+
+
+def evaluate(days, deferred, limits, catalog):
+    """Quality metrics for one schedule"""
+    day_of = {t['topic']: d for d, topics in enumerate(days) for t in topics}
+    overload = sum(max(0, sum(t['estimated_time'] for t in topics) - limit)
+                   for topics, limit in zip(days, limits))
+    within = 0.0
+    for topics, limit in zip(days, limits):
+        used = 0
+        for t in topics:
+            used += t['estimated_time']
+            if used <= limit:
+                within += t['priority']
+    violations = sum(
+        1 for topic, day in day_of.items()
+        for prereq in catalog.prereq_names[catalog.ids[topic]]
+        if prereq in day_of and day_of[prereq] > day
+    )
+    return {'overload_hours': overload, 'priority_within_limits': within,
+            'deferred': len(deferred), 'prereq_violations': violations}
+
+
+def run(scheduler, catalog, rating_sets, limits):
+    generator = StudyPlanGenerator(catalog=catalog, plan_cache=None)
+    latencies, totals = [], {}
+    for ratings in rating_sets:
+        priorities = generator._calculate_priorities(ratings)
+        start = time.perf_counter()
+        days, deferred = scheduler.schedule(priorities, limits, catalog)
+        latencies.append((time.perf_counter() - start) * 1000)
+        for key, value in evaluate(days, deferred, limits, catalog).items():
+            totals[key] = totals.get(key, 0) + value
+    n = len(rating_sets)
+    latencies.sort()
+    result = {key: round(value / n, 3) for key, value in totals.items()}
+    result['p50_ms'] = round(statistics.median(latencies), 3)
+    result['p95_ms'] = round(latencies[int(0.95 * (n - 1))], 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--node-budget', type=int, default=20000)
+    parser.add_argument('--topics', type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.topics)
+    rng = random.Random(42)
+    rating_sets = [{name: rng.randint(1, 5) for name in catalog.names} for _ in range(args.users)]
+    limits = DEFAULT_DAILY_TIME_LIMITS
+
+    print(f"{args.users} users, {len(catalog)} topics, daily limits {list(limits)}")
+    for scheduler in (GreedyScheduler(), BinPackingScheduler(node_budget=args.node_budget)):
+        print(f"{scheduler.name:>8}: {run(scheduler, catalog, rating_sets, limits)}")
+
+
+if __name__ == '__main__':
+    main()
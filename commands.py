@@ -0,0 +1,178 @@
+import sys
+import click
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+import assets
+import export
+from app import app, db
+from models import SkillAggregate, StudyPlan, TopicRating
+from plan_storage import decode_plan, encode_plan, is_legacy
+from retention import RetentionPolicy, compact_plan_history
+
+
+@app.cli.command('upgrade-db')
+def upgrade_db():
+    """Create missing tables, columns and indexes on an existing database."""
+    db.create_all()
+
+    # create_all() skips existing tables; add columns introduced since
+    dialect = db.engine.dialect
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            table_name = dialect.identifier_preparer.format_table(table)
+            column_ddl = CreateColumn(column).compile(dialect=dialect)
+            with db.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}"))
+            click.echo(f"Added column {table.name}.{column.name}")
+
+    # The unique (user_id, topic_name) index cannot be built over duplicates;
+    # keep the most recently inserted rating of each pair
+    latest_ids = select(func.max(TopicRating.id)).group_by(TopicRating.user_id, TopicRating.topic_name)
+    removed = TopicRating.query.filter(TopicRating.id.not_in(latest_ids)).delete(synchronize_session=False)
+    db.session.commit()
+    if removed:
+        click.echo(f"Removed {removed} duplicate topic ratings")
+
+    # Counts start out empty on databases that predate them, and removed
+    # duplicates were counted
+    if removed or (SkillAggregate.query.first() is None and TopicRating.query.first() is not None):
+        SkillAggregate.rebuild()
+        db.session.commit()
+        click.echo("Rebuilt skill aggregates")
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    click.echo("Database schema is up to date")
+
+
+@app.cli.command('rebuild-skill-aggregates')
+def rebuild_skill_aggregates():
+    """Recompute the per-topic skill level counts from all topic ratings."""
+    SkillAggregate.rebuild()
+    db.session.commit()
+    rows = SkillAggregate.query.count()
+    total = db.session.execute(select(func.coalesce(func.sum(SkillAggregate.user_count), 0))).scalar()
+    click.echo(f"Rebuilt {rows} topic/skill level counts covering {total} ratings")
+
+
+@app.cli.command('compact-plans')
+@click.option('--batch-size', default=500, show_default=True, help='Rows rewritten per transaction.')
+@click.option('--after-id', default=0, show_default=True, help='Resume after this StudyPlan id.')
+@click.option('--compression', type=click.Choice(['none', 'zlib', 'zstd']), default=None,
+              help='Override PLAN_COMPRESSION.')
+def compact_plans(batch_size, after_id, compression):
+    """Rewrite legacy JSON study plans in the compact storage format."""
+    converted = skipped = bytes_before = bytes_after = 0
+    last_id = after_id
+    while True:
+        plans = (StudyPlan.query.filter(StudyPlan.id > last_id)
+                 .order_by(StudyPlan.id).limit(batch_size).all())
+        if not plans:
+            break
+        for plan in plans:
+            if is_legacy(plan.plan_data):
+                encoded = encode_plan(decode_plan(plan.plan_data), compression=compression, verify=True)
+                if is_legacy(encoded):
+                    skipped += 1
+                    continue
+                bytes_before += len(plan.plan_data)
+                bytes_after += len(encoded)
+                plan.plan_data = encoded
+                converted += 1
+        last_id = plans[-1].id
+        db.session.commit()
+        db.session.expunge_all()
+        click.echo(f"Processed plans up to id {last_id} ({converted} converted)")
+
+    click.echo(f"Converted {converted} plans, {skipped} left as JSON; "
+               f"{bytes_before} -> {bytes_after} bytes")
+
+
+@app.cli.command('prune-plans')
+@click.option('--keep-latest', type=int, default=None, help='Override PLAN_RETENTION_KEEP_LATEST.')
+@click.option('--keep-daily', type=int, default=None, help='Override PLAN_RETENTION_KEEP_DAILY.')
+@click.option('--keep-weekly', type=int, default=None, help='Override PLAN_RETENTION_KEEP_WEEKLY.')
+@click.option('--batch-size', default=100, show_default=True, help='Users pruned per transaction.')
+@click.option('--after-user-id', default=0, show_default=True, help='Resume after this user id.')
+@click.option('--dry-run', is_flag=True, help='Report what would be deleted without deleting.')
+def prune_plans(keep_latest, keep_daily, keep_weekly, batch_size, after_user_id, dry_run):
+    """Delete study plans outside the retention policy."""
+    policy = RetentionPolicy.from_env()
+    if keep_latest is not None:
+        policy.keep_latest = max(1, keep_latest)
+    if keep_daily is not None:
+        policy.keep_daily = keep_daily
+    if keep_weekly is not None:
+        policy.keep_weekly = keep_weekly
+
+    rows = reclaimed = 0
+    for progress in compact_plan_history(policy, batch_size, after_user_id, dry_run):
+        rows += progress['rows_deleted']
+        reclaimed += progress['bytes_reclaimed']
+        click.echo(f"Processed users up to id {progress['last_user_id']}: "
+                   f"{progress['rows_deleted']} plans, {progress['bytes_reclaimed']} bytes")
+
+    verb = 'Would delete' if dry_run else 'Deleted'
+    click.echo(f"{verb} {rows} plans, reclaiming {reclaimed} bytes")
+
+
+@app.cli.command('run-plan-jobs')
+@click.option('--limit', type=int, default=None, help='Stop after this many jobs.')
+def run_plan_jobs(limit):
+    """Run queued asynchronous plan generation jobs in this process."""
+    from routes import plan_jobs
+    ran = plan_jobs.run_pending(limit)
+    click.echo(f"Ran {ran} plan jobs")
+
+
+@app.cli.command('prune-plan-jobs')
+def prune_plan_jobs():
+    """Delete finished plan jobs older than PLAN_JOB_KEEP_HOURS."""
+    from routes import plan_jobs
+    deleted = plan_jobs.prune()
+    click.echo(f"Deleted {deleted} finished plan jobs")
+
+
+@app.cli.command('build-assets')
+def build_assets():
+    """Minify, fingerprint and precompress static assets into static/dist."""
+    for logical, built, source_bytes, minified_bytes, gzip_bytes, brotli_bytes in assets.build_assets():
+        sizes = f"{source_bytes} -> {minified_bytes} bytes, gzip {gzip_bytes}"
+        if brotli_bytes is not None:
+            sizes += f", brotli {brotli_bytes}"
+        click.echo(f"{logical} -> {built} ({sizes})")
+    if assets.brotli is None:
+        click.echo("brotli is not installed; wrote gzip copies only")
+
+
+@app.cli.command('export-data')
+@click.argument('table', type=click.Choice(list(export.EXPORT_TABLES)))
+@click.option('--format', 'export_format', type=click.Choice(export.FORMATS), default='ndjson', show_default=True)
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Write to this file instead of stdout.')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip the output.')
+@click.option('--since', help='Only rows created (ratings: updated) at or after this ISO date.')
+@click.option('--until', help='Only rows created (ratings: updated) before this ISO date.')
+@click.option('--after-id', default=0, show_default=True, help='Resume after this row id.')
+@click.option('--batch-size', default=export.BATCH_SIZE, show_default=True, help='Rows fetched per round trip.')
+def export_data(table, export_format, output, compress, since, until, after_id, batch_size):
+    """Stream study plans or topic ratings as NDJSON or CSV."""
+    try:
+        since, until = export.parse_datetime(since), export.parse_datetime(until)
+    except ValueError:
+        raise click.BadParameter('since and until must be ISO dates')
+    chunks = export.export_chunks(table, export_format, compress, since=since, until=until,
+                                  after_id=after_id, batch_size=batch_size)
+    stream = open(output, 'wb') if output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            stream.write(chunk)
+    finally:
+        if output:
+            stream.close()
+        else:
+            stream.flush()
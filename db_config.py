@@ -0,0 +1,53 @@
+import os
+
+# SQLAlchemy engine options per deployment shape; DB_POOL_PROFILE picks one
+# and the DB_POOL_* / DB_QUERY_CACHE_SIZE variables override single values
+POOL_PROFILES = {
+    # The original settings: small default pool, ping before every checkout
+    'default': {'pool_recycle': 300, 'pool_pre_ping': True},
+    # Threaded web workers: larger pool, fail fast when exhausted, and skip
+    # the per-checkout ping (recycle well under the server's idle timeout)
+    'web': {'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 5,
+            'pool_recycle': 1800, 'pool_pre_ping': False},
+    # CLI commands and job runners: a couple of long-lived connections
+    'worker': {'pool_size': 2, 'max_overflow': 2, 'pool_timeout': 30,
+               'pool_recycle': 3600, 'pool_pre_ping': True},
+}
+
+_OVERRIDES = {
+    'DB_POOL_SIZE': ('pool_size', int),
+    'DB_MAX_OVERFLOW': ('max_overflow', int),
+    'DB_POOL_TIMEOUT': ('pool_timeout', float),
+    'DB_POOL_RECYCLE': ('pool_recycle', int),
+    'DB_POOL_PRE_PING': ('pool_pre_ping', lambda value: value == '1'),
+    # Compiled statement cache entries per engine
+    'DB_QUERY_CACHE_SIZE': ('query_cache_size', int),
+}
+
+# Options that SQLite's single-connection pools do not accept
+_QUEUE_POOL_ONLY = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+def engine_options(url, profile=None):
+    """Engine options for a database URL under the given (or configured) profile"""
+    profile = profile or os.environ.get("DB_POOL_PROFILE", "default")
+    try:
+        options = dict(POOL_PROFILES[profile])
+    except KeyError:
+        raise ValueError(f"Unknown DB_POOL_PROFILE: {profile}")
+    for variable, (option, parse) in _OVERRIDES.items():
+        value = os.environ.get(variable)
+        if value:
+            options[option] = parse(value)
+    if url.startswith('sqlite') and (':memory:' in url or url.rstrip('/') == 'sqlite:'):
+        for option in _QUEUE_POOL_ONLY:
+            options.pop(option, None)
+    return options
+
+
+def replica_binds(url=None):
+    """SQLALCHEMY_BINDS entry for the read replica at DATABASE_REPLICA_URL, if set"""
+    url = url or os.environ.get("DATABASE_REPLICA_URL")
+    if not url:
+        return {}
+    return {'replica': {'url': url, **engine_options(url)}}
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import db
+from models import StudyPlan, TopicRating
+
+# table name -> (columns in output order, column filtered by date range)
+EXPORT_TABLES = {
+    'plans': ((StudyPlan.id, StudyPlan.user_id, StudyPlan.created_at, StudyPlan.plan_data),
+              StudyPlan.created_at),
+    'ratings': ((TopicRating.id, TopicRating.user_id, TopicRating.topic_name, TopicRating.skill_level,
+                 TopicRating.created_at, TopicRating.updated_at),
+                TopicRating.updated_at),
+}
+FORMATS = ('ndjson', 'csv')
+
+# Rows fetched per round trip, and bytes buffered before a chunk is yielded
+BATCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def parse_datetime(value):
+    """ISO date or datetime from a query string or CLI option, or None"""
+    return datetime.fromisoformat(value) if value else None
+
+
+def iter_rows(table, since=None, until=None, after_id=0, limit=None, batch_size=BATCH_SIZE,
+              decode_plans=True, bind=None):
+    """
+    Stream a table's rows as dicts in id order with a server-side cursor.
+    Rows are plain column tuples, so nothing accumulates in the session.
+    `since` is inclusive and `until` exclusive; pass the last exported id as
+    `after_id` to resume.
+    """
+    columns, date_column = EXPORT_TABLES[table]
+    id_column = columns[0]
+    stmt = select(*columns).where(id_column > after_id).order_by(id_column)
+    if since is not None:
+        stmt = stmt.where(date_column >= since)
+    if until is not None:
+        stmt = stmt.where(date_column < until)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    result = db.session.execute(
+        stmt.execution_options(yield_per=batch_size, stream_results=True),
+        bind_arguments={'bind': bind} if bind is not None else None,
+    )
+    names = [column.key for column in columns]
+    for row in result:
+        record = dict(zip(names, row))
+        for name, value in record.items():
+            if isinstance(value, datetime):
+                record[name] = value.isoformat()
+        if decode_plans and 'plan_data' in record:
+            record['plan_data'] = StudyPlan.decode_plan_data(record['plan_data'])
+        yield record
+
+
+def ndjson_chunks(records):
+    return _chunked(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+
+
+def csv_chunks(records, table):
+    """CSV with a header row; nested values (decoded plans) are JSON-encoded"""
+    names = [column.key for column in EXPORT_TABLES[table][0]]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    def lines():
+        yield line(names)
+        for record in records:
+            yield line([json.dumps(value) if isinstance(value, (dict, list)) else value
+                        for value in record.values()])
+
+    yield from _chunked(lines())
+
+
+def gzip_chunks(chunks):
+    """Compress a stream of byte chunks into one gzip member"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_chunks(table, export_format='ndjson', compress=False, **filters):
+    """Byte chunks of a whole export, ready to stream to a response or file"""
+    records = iter_rows(table, **filters)
+    chunks = ndjson_chunks(records) if export_format == 'ndjson' else csv_chunks(records, table)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def _chunked(lines):
+    pending = []
+    size = 0
+    for line in lines:
+        encoded = line.encode('utf-8')
+        pending.append(encoded)
+        size += len(encoded)
+        if size >= CHUNK_BYTES:
+            yield b''.join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b''.join(pending)
@@ -0,0 +1,26 @@
+# Gunicorn settings, loaded automatically from the working directory.
+# With GUNICORN_PRELOAD=1 (or --preload) the app is imported once in the
+# master and workers fork from it; each worker then drops the inherited
+# database connections and restarts its own log listener thread.
+import os
+
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+# Preloading does not pick up code changes on --reload, so it is opt-in
+preload_app = os.environ.get("GUNICORN_PRELOAD", "0") == "1"
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+
+    from app import app, db
+    from logging_config import configure_logging
+
+    # Threads do not survive fork; start a fresh QueueListener
+    configure_logging()
+
+    # Pooled connections opened in the master are shared with every worker;
+    # forget them without closing the parent's sockets
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
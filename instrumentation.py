@@ -0,0 +1,196 @@
+import cProfile
+import hmac
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Opt-in: request timing, per-request SQL counts, generator spans, /metrics
+# and Server-Timing headers
+METRICS_ENABLED = os.environ.get("PREPMATE_METRICS") == "1"
+# /metrics is served to admins, and to scrapers sending this bearer token
+METRICS_TOKEN = os.environ.get("PREPMATE_METRICS_TOKEN", "")
+# Dump a cProfile of one in every N requests (0 disables)
+PROFILE_SAMPLE_EVERY = int(os.environ.get("PROFILE_SAMPLE_EVERY", "0"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/prepmate-profiles")
+
+# Request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_NULL_SPAN = nullcontext()
+_local = threading.local()
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}        # (endpoint, method, status) -> count
+        self.latency = {}         # endpoint -> [bucket counts..., sum, count]
+        self.queries = {}         # endpoint -> [count, seconds]
+        self.spans = {}           # span -> [count, seconds]
+
+    def observe_request(self, endpoint, method, status, seconds, queries, query_seconds):
+        with self._lock:
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.latency.setdefault(endpoint, [0] * len(LATENCY_BUCKETS) + [0.0, 0])
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            totals = self.queries.setdefault(endpoint, [0, 0.0])
+            totals[0] += queries
+            totals[1] += query_seconds
+
+    def observe_span(self, name, seconds):
+        with self._lock:
+            totals = self.spans.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+
+    def render(self):
+        lines = [
+            '# HELP prepmate_requests_total HTTP requests handled.',
+            '# TYPE prepmate_requests_total counter',
+        ]
+        with self._lock:
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'prepmate_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+            lines += ['# HELP prepmate_request_duration_seconds Request latency.',
+                      '# TYPE prepmate_request_duration_seconds histogram']
+            for endpoint, histogram in sorted(self.latency.items()):
+                for bound, count in zip(LATENCY_BUCKETS, histogram):
+                    lines.append(f'prepmate_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                lines.append(f'prepmate_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram[-1]}')
+                lines.append(f'prepmate_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram[-2]:.6f}')
+                lines.append(f'prepmate_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram[-1]}')
+
+            lines += ['# HELP prepmate_db_queries_total SQL statements executed.',
+                      '# TYPE prepmate_db_queries_total counter']
+            for endpoint, (count, _) in sorted(self.queries.items()):
+                lines.append(f'prepmate_db_queries_total{{endpoint="{endpoint}"}} {count}')
+            lines += ['# HELP prepmate_db_query_seconds_total Time spent executing SQL.',
+                      '# TYPE prepmate_db_query_seconds_total counter']
+            for endpoint, (_, seconds) in sorted(self.queries.items()):
+                lines.append(f'prepmate_db_query_seconds_total{{endpoint="{endpoint}"}} {seconds:.6f}')
+
+            lines += ['# HELP prepmate_span_seconds Time spent in instrumented code paths.',
+                      '# TYPE prepmate_span_seconds summary']
+            for name, (count, seconds) in sorted(self.spans.items()):
+                lines.append(f'prepmate_span_seconds_sum{{span="{name}"}} {seconds:.6f}')
+                lines.append(f'prepmate_span_seconds_count{{span="{name}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def span(name):
+    """Time a block of code; a shared no-op context when metrics are disabled"""
+    if not METRICS_ENABLED:
+        return _NULL_SPAN
+    return _timed_span(name)
+
+
+@contextmanager
+def _timed_span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe_span(name, elapsed)
+        collector = getattr(_local, 'collector', None)
+        if collector is not None:
+            collector['spans'][name] = collector['spans'].get(name, 0.0) + elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own execution context, so a statement that
+    # fails (and never reaches after_cursor_execute) leaves nothing behind
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = context._query_start
+    collector = getattr(_local, 'collector', None)
+    if collector is not None:
+        collector['queries'] += 1
+        collector['query_seconds'] += time.perf_counter() - started
+
+
+def init_app(app):
+    """Register the request hooks, SQLAlchemy listeners and /metrics route"""
+    if not METRICS_ENABLED and not PROFILE_SAMPLE_EVERY:
+        return
+
+    from flask import Response, request, session
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    request_counter = itertools.count(1)
+
+    @app.before_request
+    def start_request_timer():
+        _local.collector = {'start': time.perf_counter(), 'queries': 0, 'query_seconds': 0.0,
+                            'spans': {}, 'profiler': None}
+        if PROFILE_SAMPLE_EVERY and next(request_counter) % PROFILE_SAMPLE_EVERY == 0:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            _local.collector['profiler'] = profiler
+
+    @app.after_request
+    def record_request(response):
+        collector = getattr(_local, 'collector', None)
+        if collector is None:
+            return response
+        _local.collector = None
+        elapsed = time.perf_counter() - collector['start']
+        endpoint = request.endpoint or 'unmatched'
+
+        if collector['profiler'] is not None:
+            collector['profiler'].disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            filename = f"{int(time.time() * 1000)}-{os.getpid()}-{endpoint}.prof"
+            collector['profiler'].dump_stats(os.path.join(PROFILE_DIR, filename))
+
+        if METRICS_ENABLED:
+            registry.observe_request(endpoint, request.method, response.status_code, elapsed,
+                                     collector['queries'], collector['query_seconds'])
+            timings = [f'app;dur={elapsed * 1000:.2f}',
+                       f'db;dur={collector["query_seconds"] * 1000:.2f};desc="{collector["queries"]} queries"']
+            timings += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in collector['spans'].items()]
+            response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+    @app.teardown_request
+    def discard_request_timer(exc):
+        # after_request is skipped for unhandled errors; stop any profiler
+        collector = getattr(_local, 'collector', None)
+        if collector is not None:
+            _local.collector = None
+            if collector['profiler'] is not None:
+                collector['profiler'].disable()
+
+    if METRICS_ENABLED:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        def metrics_allowed():
+            if METRICS_TOKEN and hmac.compare_digest(request.headers.get('Authorization', ''),
+                                                     f'Bearer {METRICS_TOKEN}'):
+                return True
+            from routes import ADMIN_FIREBASE_UIDS
+            return session.get('firebase_uid') in ADMIN_FIREBASE_UIDS
+
+        @app.route('/metrics')
+        def metrics():
+            """Prometheus text exposition of this worker's metrics, for admins and scrapers"""
+            if not metrics_allowed():
+                return Response('Forbidden\n', status=403, mimetype='text/plain')
+            return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,163 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, or_, update
+from app import db
+from models import PlanJob
+from plan_cache import PlanCache
+
+ACTIVE_STATUSES = ('queued', 'running')
+FINISHED_STATUSES = ('done', 'failed')
+
+
+class PlanJobQueue:
+    """
+    Database-backed queue for asynchronous plan generation.
+    Jobs are rows in PlanJob, so no external broker is needed: the web
+    process runs them on a small thread pool, and `run_pending` lets a
+    separate worker process (or a restarted one) drain whatever is queued.
+    Submitting the same ratings and options for a user while an identical
+    job is still queued or running returns that job instead of a new one.
+    
+    Active jobs hold a lease of `lease_seconds` from their `updated_at`,
+    renewed whenever they report progress. A job whose lease ran out (its
+    process died, or nothing picked it up) is no longer coalesced onto:
+    `submit` fails it and queues a fresh job, and `run_pending` reclaims
+    stale running jobs. Finished jobs are deleted by `prune` once older
+    than `keep_seconds`.
+    
+    `handler(job, ratings, options, report_progress)` does the work and
+    returns the id of the StudyPlan it stored.
+    """
+
+    def __init__(self, app, handler, max_workers=2, lease_seconds=300, keep_seconds=86400):
+        self.app = app
+        self.handler = handler
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+        self.keep_seconds = keep_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, user_id, ratings, options):
+        """Enqueue a job, coalescing with an identical live one. Returns (job, created)"""
+        dedupe_key = PlanCache.key(ratings, sorted(options.items()))
+        cutoff = self._lease_cutoff()
+        with self._lock:
+            job = PlanJob.query.filter(
+                PlanJob.user_id == user_id,
+                PlanJob.dedupe_key == dedupe_key,
+                PlanJob.status.in_(ACTIVE_STATUSES),
+                PlanJob.updated_at >= cutoff,
+            ).first()
+            if job:
+                return job, False
+            
+            # Identical jobs whose lease ran out are replaced by this one
+            db.session.execute(
+                update(PlanJob)
+                .where(PlanJob.user_id == user_id, PlanJob.dedupe_key == dedupe_key,
+                       PlanJob.status.in_(ACTIVE_STATUSES), PlanJob.updated_at < cutoff)
+                .values(status='failed', error='Lease expired', updated_at=datetime.utcnow())
+            )
+            job = PlanJob(
+                user_id=user_id,
+                dedupe_key=dedupe_key,
+                payload=json.dumps({'ratings': ratings, 'options': options}),
+                status='queued',
+                progress=0,
+            )
+            db.session.add(job)
+            db.session.commit()
+        
+        self._pool().submit(self._run_in_context, job.id)
+        return job, True
+
+    def run_pending(self, limit=None):
+        """
+        Run queued jobs, and running jobs whose lease ran out, in the
+        calling thread. Returns how many ran.
+        """
+        ran = 0
+        while limit is None or ran < limit:
+            job_id = db.session.execute(
+                db.select(PlanJob.id).where(self._claimable(self._lease_cutoff()))
+                .order_by(PlanJob.id).limit(1)
+            ).scalar()
+            if job_id is None:
+                break
+            if self.run(job_id):
+                ran += 1
+        return ran
+
+    def prune(self):
+        """Delete done and failed jobs last updated over keep_seconds ago. Returns how many"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.keep_seconds)
+        deleted = db.session.execute(
+            delete(PlanJob)
+            .where(PlanJob.status.in_(FINISHED_STATUSES), PlanJob.updated_at < cutoff)
+        ).rowcount
+        db.session.commit()
+        return deleted
+
+    def run(self, job_id):
+        """
+        Claim and run one job. Returns False without running it if another
+        worker holds it or it already finished.
+        """
+        claimed = db.session.execute(
+            update(PlanJob)
+            .where(PlanJob.id == job_id, self._claimable(self._lease_cutoff()))
+            .values(status='running', progress=10, updated_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return False
+        
+        job = db.session.get(PlanJob, job_id)
+        payload = json.loads(job.payload)
+        
+        def report_progress(progress):
+            job.progress = progress
+            db.session.commit()
+        
+        try:
+            job.study_plan_id = self.handler(job, payload['ratings'], payload['options'], report_progress)
+            job.status = 'done'
+            job.progress = 100
+        except Exception as e:
+            db.session.rollback()
+            logging.error("Plan job %s failed: %s", job_id, e)
+            job = db.session.get(PlanJob, job_id)
+            job.status = 'failed'
+            job.error = str(e)
+        db.session.commit()
+        return True
+
+    def _lease_cutoff(self):
+        # updated_at is stored as naive UTC
+        return datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+
+    @staticmethod
+    def _claimable(cutoff):
+        return or_(PlanJob.status == 'queued',
+                   and_(PlanJob.status == 'running', PlanJob.updated_at < cutoff))
+
+    def _run_in_context(self, job_id):
+        with self.app.app_context():
+            try:
+                self.run(job_id)
+            finally:
+                db.session.remove()
+
+    def _pool(self):
+        # Created on first use so that forked workers each get their own threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='plan-job')
+        return self._executor
+
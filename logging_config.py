@@ -0,0 +1,101 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+# 'development' keeps the old verbose stderr output; 'production' defaults to
+# INFO, JSON lines and a background writer thread
+LOG_MODE = os.environ.get("LOG_MODE", "development")
+_production = LOG_MODE == "production"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO" if _production else "DEBUG").upper()
+# text or json
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json" if _production else "text")
+# Hand records to a QueueListener thread so handler I/O stays off the request thread
+LOG_QUEUE = os.environ.get("LOG_QUEUE", "1" if _production else "0") == "1"
+
+TEXT_FORMAT = logging.BASIC_FORMAT
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any exception"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Resolves the message and traceback on the calling thread, but leaves
+    them as separate fields so the listener's formatter can lay them out
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level=None, log_format=None, use_queue=None, stream=None):
+    """
+    Configure the root logger from LOG_MODE, LOG_LEVEL, LOG_FORMAT and
+    LOG_QUEUE (arguments override the environment). Safe to call again, e.g.
+    in a forked worker, to restart the queue listener.
+    """
+    global _listener
+    level = (level or LOG_LEVEL).upper()
+    log_format = log_format or LOG_FORMAT
+    use_queue = LOG_QUEUE if use_queue is None else use_queue
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    stop_listener()
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.setLevel(level)
+
+    if use_queue:
+        records = queue.SimpleQueue()
+        root.addHandler(_QueueHandler(records))
+        _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        root.addHandler(handler)
+    return root
+
+
+def stop_listener():
+    """Flush queued records and stop the listener thread, if any"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_listener)
@@ -1,6 +1,12 @@
+import json
 from app import db
 from datetime import datetime
-import json
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from plan_storage import decode_plan, encode_plan
+
+# Rows per INSERT statement, well under SQLite's bound-parameter limit
+UPSERT_CHUNK_SIZE = 500
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -8,10 +14,20 @@ class User(db.Model):
     email = db.Column(db.String(120), nullable=False)
     display_name = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped on every change to the user's ratings or plans; used for ETags
+    data_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relationships
     topic_ratings = db.relationship('TopicRating', backref='user', lazy=True, cascade='all, delete-orphan')
     study_plans = db.relationship('StudyPlan', backref='user', lazy=True, cascade='all, delete-orphan')
+    horizon_plans = db.relationship('HorizonPlan', backref='user', lazy=True, cascade='all, delete-orphan')
+    
+    @classmethod
+    def bump_data_version(cls, *user_ids):
+        """Increment data_version for the given users. Does not commit."""
+        db.session.execute(
+            update(cls).where(cls.id.in_(user_ids)).values(data_version=cls.data_version + 1)
+        )
 
 class TopicRating(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -20,17 +36,205 @@ class TopicRating(db.Model):
     skill_level = db.Column(db.Integer, nullable=False)  # 1-5 scale
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_topic_rating_user_topic', 'user_id', 'topic_name', unique=True),
+    )
+    
+    @classmethod
+    def upsert_for_user(cls, user_id, ratings):
+        """
+        Write a user's ratings with one SELECT and set-based upserts.
+        Uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and SQLite and
+        falls back to ORM updates elsewhere. Does not commit.
+        
+        The user's row is locked (SELECT ... FOR UPDATE) before the current
+        ratings are read and stays locked until the caller commits, so
+        overlapping saves for one user see each other's writes and report
+        old -> new changes that add up. SQLite has no row locks and ignores
+        the FOR UPDATE.
+        
+        Returns:
+            dict: topic name -> (old skill level or None, new skill level)
+            for every rating that changed
+        """
+        db.session.execute(select(User.id).where(User.id == user_id).with_for_update())
+        insert = cls._upsert_insert()
+        if insert is None:
+            existing_rows = {r.topic_name: r for r in cls.query.filter_by(user_id=user_id)}
+            existing = {topic: r.skill_level for topic, r in existing_rows.items()}
+        else:
+            existing = dict(db.session.execute(
+                select(cls.topic_name, cls.skill_level).where(cls.user_id == user_id)
+            ).all())
+        
+        changes = {
+            topic: (existing.get(topic), skill_level)
+            for topic, skill_level in ratings.items()
+            if existing.get(topic) != skill_level
+        }
+        if not changes:
+            return changes
+        
+        if insert is None:
+            for topic, (_, skill_level) in changes.items():
+                rating = existing_rows.get(topic)
+                if rating is None:
+                    rating = cls(user_id=user_id, topic_name=topic)
+                    db.session.add(rating)
+                rating.skill_level = skill_level
+            return changes
+        
+        now = datetime.utcnow()
+        rows = [
+            {'user_id': user_id, 'topic_name': topic, 'skill_level': skill_level,
+             'created_at': now, 'updated_at': now}
+            for topic, (_, skill_level) in changes.items()
+        ]
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(cls).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'topic_name'],
+                set_={'skill_level': stmt.excluded.skill_level, 'updated_at': stmt.excluded.updated_at},
+            )
+            db.session.execute(stmt)
+        return changes
+    
+    @classmethod
+    def _upsert_insert(cls):
+        """Dialect-specific insert() supporting ON CONFLICT, or None"""
+        dialect = db.session.get_bind(mapper=cls.__mapper__).dialect.name
+        return {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}.get(dialect)
+
+class SkillAggregate(db.Model):
+    """
+    Number of users per topic and skill level. Kept current from the
+    rating changes saved by TopicRating.upsert_for_user, in the same
+    transaction; `flask rebuild-skill-aggregates` recomputes it.
+    """
+    topic_name = db.Column(db.String(100), primary_key=True)
+    skill_level = db.Column(db.Integer, primary_key=True)
+    user_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    @classmethod
+    def apply_changes(cls, changes):
+        """
+        Apply the {topic: (old level or None, new level)} changes returned by
+        TopicRating.upsert_for_user as count deltas. Does not commit.
+        """
+        deltas = {}
+        for topic, (old_level, new_level) in changes.items():
+            if old_level is not None:
+                deltas[topic, old_level] = deltas.get((topic, old_level), 0) - 1
+            if new_level is not None:
+                deltas[topic, new_level] = deltas.get((topic, new_level), 0) + 1
+        # Sorted so concurrent saves lock rows in the same order
+        rows = [
+            {'topic_name': topic, 'skill_level': level, 'user_count': delta}
+            for (topic, level), delta in sorted(deltas.items()) if delta
+        ]
+        if not rows:
+            return
+        
+        upsert = TopicRating._upsert_insert()
+        if upsert is None:
+            for row in rows:
+                updated = db.session.execute(
+                    update(cls)
+                    .where(cls.topic_name == row['topic_name'], cls.skill_level == row['skill_level'])
+                    .values(user_count=cls.user_count + row['user_count'])
+                )
+                if not updated.rowcount:
+                    db.session.execute(insert(cls).values(row))
+            return
+        
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = upsert(cls).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['topic_name', 'skill_level'],
+                set_={'user_count': cls.user_count + stmt.excluded.user_count},
+            )
+            db.session.execute(stmt)
+    
+    @classmethod
+    def rebuild(cls):
+        """Recompute every count from topic_rating with one GROUP BY. Does not commit."""
+        db.session.execute(delete(cls))
+        counts = (
+            select(TopicRating.topic_name, TopicRating.skill_level, func.count())
+            .group_by(TopicRating.topic_name, TopicRating.skill_level)
+        )
+        db.session.execute(insert(cls).from_select(['topic_name', 'skill_level', 'user_count'], counts))
 
 class StudyPlan(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    plan_data = db.Column(db.Text, nullable=False)  # JSON string of the 7-day plan
+    plan_data = db.Column(db.Text, nullable=False)  # Serialized plan, see plan_storage
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def get_plan_data(self):
-        """Parse the JSON plan data"""
-        return json.loads(self.plan_data)
+        """Parse the stored plan data"""
+        return self.decode_plan_data(self.plan_data)
+    
+    @staticmethod
+    def decode_plan_data(plan_data):
+        """Parse a raw plan_data column value in any stored format"""
+        return decode_plan(plan_data)
     
     def set_plan_data(self, data):
-        """Set the plan data as JSON string"""
-        self.plan_data = json.dumps(data)
+        """Set the plan data in the compact storage format"""
+        self.plan_data = encode_plan(data)
+
+# Latest-plan lookups filter on user_id and order by created_at descending
+db.Index('ix_study_plan_user_created', StudyPlan.user_id, StudyPlan.created_at.desc())
+
+class HorizonPlan(db.Model):
+    """
+    Header of a long-horizon (30/60/90-day) plan. Only the inputs are stored;
+    days are recomputed on read, see StudyPlanGenerator.iter_horizon_days.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    horizon_days = db.Column(db.Integer, nullable=False)
+    seed = db.Column(db.Integer, nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    settings = db.Column(db.Text, nullable=False)  # JSON ratings, daily hours and prerequisite mode
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_horizon_plan_user_created', 'user_id', 'created_at'),
+    )
+    
+    def get_settings(self):
+        settings = json.loads(self.settings)
+        # Headers saved before the mode was recorded were built with the default
+        settings.setdefault('prerequisites', 'direct')
+        return settings
+    
+    def set_settings(self, ratings, daily_hours=None, prerequisites='direct'):
+        self.settings = json.dumps({'ratings': ratings, 'daily_hours': daily_hours, 'prerequisites': prerequisites},
+                                   separators=(',', ':'))
+
+class PlanJob(db.Model):
+    """Queued asynchronous plan generation, see jobs.PlanJobQueue"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    dedupe_key = db.Column(db.String(64), nullable=False)  # Hash of ratings and options
+    payload = db.Column(db.Text, nullable=False)  # JSON ratings and generator options
+    status = db.Column(db.String(16), nullable=False, default='queued')  # queued, running, done, failed
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0-100
+    study_plan_id = db.Column(db.Integer, db.ForeignKey('study_plan.id'))
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_plan_job_user_key_status', 'user_id', 'dedupe_key', 'status'),
+        db.Index('ix_plan_job_status', 'status'),
+    )
+
+class RateLimitBucket(db.Model):
+    """Token bucket state for ratelimit.DatabaseBucketStore"""
+    key = db.Column(db.String(200), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)  # Unix time of the last refill
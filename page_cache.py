@@ -0,0 +1,68 @@
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+
+from flask import Response, current_app, render_template, request
+
+# Set to 0 to render pages on every request (always the case in debug mode)
+PAGE_CACHE_ENABLED = os.environ.get("PAGE_CACHE", "1") == "1"
+
+
+def page_context():
+    """Template variables shared by every page"""
+    return {
+        'firebase_api_key': os.environ.get("FIREBASE_API_KEY"),
+        'firebase_project_id': os.environ.get("FIREBASE_PROJECT_ID"),
+        'firebase_app_id': os.environ.get("FIREBASE_APP_ID"),
+    }
+
+
+class PageCache:
+    """
+    Rendered HTML for pages that do not vary per user or request.
+    Each template is rendered on first hit and then served from memory with
+    a strong ETag and Last-Modified, so revalidations get a 304. Call
+    `invalidate` after changing the configuration or the asset manifest.
+    """
+
+    def __init__(self):
+        self._pages = {}          # template -> (body, etag, rendered_at)
+        self._lock = threading.Lock()
+
+    def get(self, template):
+        page = self._pages.get(template)
+        if page is None:
+            body = render_template(template, **page_context()).encode('utf-8')
+            page = (body, hashlib.sha256(body).hexdigest()[:32],
+                    datetime.now(timezone.utc).replace(microsecond=0))
+            with self._lock:
+                # Keep the first render if another thread won the race
+                page = self._pages.setdefault(template, page)
+        return page
+
+    def response(self, template):
+        """Serve a cached page, or 304 when the client's copy is current"""
+        if not PAGE_CACHE_ENABLED or current_app.debug:
+            return render_template(template, **page_context())
+
+        body, etag, rendered_at = self.get(template)
+        response = Response(body, mimetype='text/html')
+        response.set_etag(etag)
+        response.last_modified = rendered_at
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+    def invalidate(self, template=None):
+        """Drop one cached page, or all of them"""
+        with self._lock:
+            if template is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(template, None)
+
+    def __len__(self):
+        return len(self._pages)
+
+
+page_cache = PageCache()
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class PlanCache:
+    """
+    Size-bounded LRU cache of date-independent plan templates.
+    Keys are a canonical hash of the ratings dict: ratings are sorted, since
+    the generator breaks priority ties in catalog order, not rating order.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(user_ratings, *config):
+        """Canonical hash of a ratings dict plus any generator configuration"""
+        payload = json.dumps([sorted(user_ratings.items()), config], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            template = self._entries.get(key)
+            if template is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return template
+
+    def put(self, key, template):
+        with self._lock:
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'size': len(self._entries), 'max_size': self.max_size,
+                'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+PLAN_CACHE = PlanCache(max_size=int(os.environ.get("PLAN_CACHE_SIZE", "1024")))
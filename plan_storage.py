@@ -0,0 +1,200 @@
+import base64
+import functools
+import json
+import logging
+import os
+import zlib
+from datetime import date, timedelta
+
+from plan_cache import PlanCache
+from study_plan_generator import StudyPlanGenerator
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Stored plan_data formats, told apart by prefix:
+#   '{'    legacy verbose JSON
+#   'c1:'  compact JSON
+#   'z1:'  compact JSON, zlib-compressed, base64
+#   's1:'  compact JSON, zstd-compressed, base64
+COMPACT = 'c1:'
+ZLIB = 'z1:'
+ZSTD = 's1:'
+
+# none, zlib or zstd
+PLAN_COMPRESSION = os.environ.get("PLAN_COMPRESSION", "none")
+# Set to 'json' to keep writing the legacy verbose format
+PLAN_STORAGE_FORMAT = os.environ.get("PLAN_STORAGE_FORMAT", "compact")
+
+_PLAN_KEYS = {'generated_at', 'updated_at', 'total_topics', 'plan_duration', 'daily_schedule', 'deferred_topics',
+              'unlock_order', 'generator_options'}
+_DAY_KEYS = {'date', 'day_name', 'topics', 'total_time', 'focus_areas'}
+_OPTION_KEYS = ('scheduler', 'prerequisites', 'daily_hours')
+_TOPIC_KEYS = {'name', 'current_skill_level', 'estimated_time', 'priority_score',
+               'recommended_problems', 'study_approach', 'resources'}
+
+_generator = StudyPlanGenerator(plan_cache=None)
+
+# Rebuilt plan templates by compact day layout, shared by every read of
+# plans with the same topics, levels and scores
+_templates = PlanCache(max_size=int(os.environ.get("PLAN_STORAGE_CACHE_SIZE", "1024")))
+
+
+def encode_plan(plan, compression=None, storage_format=None, verify=False):
+    """
+    Serialize a plan for StudyPlan.plan_data.
+    The compact form keeps only topic ids, day assignments, skill levels and
+    scores; problems, study approaches, resources and dates are rebuilt from
+    the catalog on read. Plans the compact form cannot represent exactly are
+    stored as verbose JSON.
+    
+    Plans from generate_plan and update_plan rebuild exactly by construction.
+    Pass `verify` for plans from anywhere else, such as legacy rows, to
+    rebuild them first and keep them as JSON unless they come back the same.
+    """
+    storage_format = storage_format or PLAN_STORAGE_FORMAT
+    compact = _compact(plan, verify) if storage_format == 'compact' else None
+    if compact is None:
+        return json.dumps(plan)
+
+    payload = json.dumps(compact, separators=(',', ':'))
+    compression = compression or PLAN_COMPRESSION
+    if compression == 'zstd' and zstandard is None:
+        logging.warning("PLAN_COMPRESSION=zstd but zstandard is not installed; using zlib")
+        compression = 'zlib'
+    if compression == 'zlib':
+        return ZLIB + base64.b64encode(zlib.compress(payload.encode('utf-8'), 9)).decode('ascii')
+    if compression == 'zstd':
+        compressed = zstandard.ZstdCompressor(level=10).compress(payload.encode('utf-8'))
+        return ZSTD + base64.b64encode(compressed).decode('ascii')
+    return COMPACT + payload
+
+
+def decode_plan(plan_data):
+    """Parse a stored plan in any supported format into the verbose plan dict"""
+    if plan_data.startswith(COMPACT):
+        return _expand(json.loads(plan_data[len(COMPACT):]))
+    if plan_data.startswith(ZLIB):
+        return _expand(json.loads(zlib.decompress(base64.b64decode(plan_data[len(ZLIB):]))))
+    if plan_data.startswith(ZSTD):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed plans")
+        raw = zstandard.ZstdDecompressor().decompress(base64.b64decode(plan_data[len(ZSTD):]))
+        return _expand(json.loads(raw))
+    return json.loads(plan_data)
+
+
+def is_legacy(plan_data):
+    return plan_data.startswith('{')
+
+
+def _compact(plan, verify=False):
+    """Compact representation of a plan, or None if it would lose information"""
+    catalog = _generator.catalog
+    if not set(plan) <= _PLAN_KEYS or 'daily_schedule' not in plan:
+        return None
+
+    def entries(topics):
+        rows = []
+        for topic in topics:
+            topic_id = catalog.ids.get(topic.get('name'))
+            if (set(topic) != _TOPIC_KEYS or topic_id is None
+                    or topic['estimated_time'] != catalog.time[topic_id]):
+                return None
+            rows.append([topic_id, topic['current_skill_level'], topic['priority_score']])
+        return rows
+
+    days = []
+    start = None
+    for i, (day_key, day) in enumerate(plan['daily_schedule'].items()):
+        if day_key != f'day_{i + 1}' or set(day) != _DAY_KEYS or not day['date']:
+            return None
+        day_date = date.fromisoformat(day['date'])
+        start = start or day_date
+        if day_date != start + timedelta(days=i):
+            return None
+        rows = entries(day['topics'])
+        if rows is None:
+            return None
+        days.append(rows)
+
+    compact = {
+        'g': plan.get('generated_at'),
+        'n': plan.get('total_topics'),
+        'p': plan.get('plan_duration'),
+        's': start.isoformat() if start else None,
+        'd': days,
+    }
+    if 'updated_at' in plan:
+        compact['u'] = plan['updated_at']
+    if 'generator_options' in plan:
+        if set(plan['generator_options']) != set(_OPTION_KEYS):
+            return None
+        compact['c'] = [plan['generator_options'][key] for key in _OPTION_KEYS]
+    if 'deferred_topics' in plan:
+        compact['x'] = entries(plan['deferred_topics'])
+        if compact['x'] is None:
+            return None
+    if 'unlock_order' in plan:
+        if not all(name in catalog.ids for name in plan['unlock_order']):
+            return None
+        compact['o'] = [catalog.ids[name] for name in plan['unlock_order']]
+
+    # Problems are reselected on read, so plans stored before the problem
+    # bank or its deduplication changed may not rebuild as they were
+    if verify and _expand(compact) != plan:
+        return None
+    return compact
+
+
+def _expand(compact):
+    """Rebuild the verbose plan dict from its compact representation"""
+    catalog = _generator.catalog
+    layout = json.dumps([compact['d'], compact.get('x')], separators=(',', ':'))
+    template = _templates.get(layout)
+    if template is None:
+        template = _build_template(compact)
+        _templates.put(layout, template)
+    start = date.fromisoformat(compact['s']) if compact['s'] else None
+    stamped = _generator._stamp_dates(template, start, _day_stamps(start, len(compact['d'])))
+
+    plan = {'generated_at': compact['g']}
+    if 'u' in compact:
+        plan['updated_at'] = compact['u']
+    plan['total_topics'] = compact['n']
+    plan['plan_duration'] = compact['p']
+    if 'c' in compact:
+        plan['generator_options'] = dict(zip(_OPTION_KEYS, compact['c']))
+    if 'deferred_topics' in stamped:
+        plan['deferred_topics'] = stamped['deferred_topics']
+    if 'o' in compact:
+        plan['unlock_order'] = [catalog.names[topic_id] for topic_id in compact['o']]
+    plan['daily_schedule'] = stamped['daily_schedule']
+    return plan
+
+
+@functools.lru_cache(maxsize=1024)
+def _day_stamps(start, days):
+    # Formatting dates dominates a decode once the template is cached
+    return _generator._day_stamps(start, days)
+
+
+def _build_template(compact):
+    """Date-independent plan template for the days and deferred topics of a compact plan"""
+    catalog = _generator.catalog
+
+    def topic_info(row):
+        topic_id, skill_level, priority = row
+        return {
+            'topic': catalog.names[topic_id],
+            'priority': priority,
+            'skill_level': skill_level,
+            'estimated_time': catalog.time[topic_id]
+        }
+
+    daily_plan = {f'day_{i + 1}': [topic_info(row) for row in rows] for i, rows in enumerate(compact['d'])}
+    if 'x' in compact:
+        daily_plan['deferred'] = [topic_info(row) for row in compact['x']]
+    return _generator._build_plan_template(daily_plan, ())
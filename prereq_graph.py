@@ -0,0 +1,160 @@
+import heapq
+
+# Skill level from which a prerequisite counts as known
+KNOWN_SKILL = 3
+# Weight of indirect prerequisites (prerequisites of prerequisites, at any
+# depth) relative to direct ones in the transitive penalty
+INDIRECT_PENALTY_WEIGHT = 0.5
+
+
+class PrerequisiteCycleError(ValueError):
+    """The prerequisites form a cycle, so no topic order satisfies them"""
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Prerequisite cycle: " + " -> ".join(cycle))
+
+
+def prereq_cost(skill_level):
+    """Penalty one prerequisite adds: (3 - skill) * 0.5 below skill 3, 2 when unrated"""
+    if skill_level is None:
+        return 2
+    if skill_level < KNOWN_SKILL:
+        return (KNOWN_SKILL - skill_level) * 0.5
+    return 0
+
+
+class PrerequisiteGraph:
+    """
+    Prerequisite DAG over interned topic ids, built once per catalog.
+    Construction rejects cycles and caches a topological order and bitset
+    transitive closures in both directions, so per-user penalties and
+    unlock order take one pass over the topics with bitwise set operations
+    rather than graph walks.
+    """
+
+    def __init__(self, names, prereq_names):
+        self.names = tuple(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.prereq_names = tuple(tuple(prereqs) for prereqs in prereq_names)
+        # (id, name) per listed prerequisite; the id is None outside the catalog
+        self._prereq_refs = tuple(tuple((self.ids.get(p), p) for p in prereqs) for prereqs in self.prereq_names)
+        self.prereq_ids = tuple(tuple(i for i, _ in refs if i is not None) for refs in self._prereq_refs)
+        self.prereq_masks = tuple(_mask(prereqs) for prereqs in self.prereq_ids)
+        dependent_ids = [[] for _ in self.names]
+        for topic_id, prereqs in enumerate(self.prereq_ids):
+            for prereq_id in prereqs:
+                dependent_ids[prereq_id].append(topic_id)
+        self.dependent_ids = tuple(tuple(dependents) for dependents in dependent_ids)
+
+        self.topological_order = self._topological_order()
+        self.position = [0] * len(self.names)
+        for position, topic_id in enumerate(self.topological_order):
+            self.position[topic_id] = position
+
+        # Closures: prerequisites come before their dependents in the order
+        ancestors = [0] * len(self.names)
+        for topic_id in self.topological_order:
+            mask = 0
+            for prereq_id in self.prereq_ids[topic_id]:
+                mask |= ancestors[prereq_id] | 1 << prereq_id
+            ancestors[topic_id] = mask
+        descendants = [0] * len(self.names)
+        for topic_id in reversed(self.topological_order):
+            mask = 0
+            for dependent_id in self.dependent_ids[topic_id]:
+                mask |= descendants[dependent_id] | 1 << dependent_id
+            descendants[topic_id] = mask
+        self.ancestors = tuple(ancestors)
+        self.descendants = tuple(descendants)
+
+    def _topological_order(self):
+        """Kahn's algorithm, lowest id first among ready topics so the order is stable"""
+        remaining = [len(prereqs) for prereqs in self.prereq_ids]
+        ready = [topic_id for topic_id, count in enumerate(remaining) if not count]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            topic_id = heapq.heappop(ready)
+            order.append(topic_id)
+            for dependent_id in self.dependent_ids[topic_id]:
+                remaining[dependent_id] -= 1
+                if not remaining[dependent_id]:
+                    heapq.heappush(ready, dependent_id)
+        if len(order) < len(self.names):
+            raise PrerequisiteCycleError(self._find_cycle(remaining))
+        return tuple(order)
+
+    def _find_cycle(self, remaining):
+        # Topics left unordered all wait on another unordered topic, so
+        # following those prerequisites must revisit one
+        topic_id = next(i for i, count in enumerate(remaining) if count)
+        path = []
+        seen = {}
+        while topic_id not in seen:
+            seen[topic_id] = len(path)
+            path.append(topic_id)
+            topic_id = next(p for p in self.prereq_ids[topic_id] if remaining[p])
+        cycle = path[seen[topic_id]:] + [topic_id]
+        return [self.names[i] for i in cycle]
+
+    def penalties(self, user_ratings, transitive=False):
+        """
+        Prerequisite penalty of every topic, indexed by topic id.
+        Direct mode sums prereq_cost over each topic's own prerequisites.
+        Transitive mode adds INDIRECT_PENALTY_WEIGHT times the cost of every
+        further ancestor, counted per cost value with closure bitsets.
+        """
+        costs = [prereq_cost(user_ratings.get(name)) for name in self.names]
+        penalties = []
+        for refs in self._prereq_refs:
+            penalty = 0
+            for prereq_id, prereq in refs:
+                penalty += costs[prereq_id] if prereq_id is not None else prereq_cost(user_ratings.get(prereq))
+            penalties.append(penalty)
+        if not transitive:
+            return penalties
+
+        cost_masks = {}
+        for topic_id, cost in enumerate(costs):
+            if cost:
+                cost_masks[cost] = cost_masks.get(cost, 0) | 1 << topic_id
+        for topic_id, ancestors in enumerate(self.ancestors):
+            indirect = ancestors & ~self.prereq_masks[topic_id]
+            if indirect:
+                penalties[topic_id] += INDIRECT_PENALTY_WEIGHT * sum(
+                    cost * (indirect & mask).bit_count() for cost, mask in cost_masks.items())
+        return penalties
+
+    def unlock_levels(self, user_ratings):
+        """
+        For every topic, the longest chain of not-yet-known prerequisites
+        above it: 0 when everything it builds on is known (rated
+        KNOWN_SKILL or higher), indexed by topic id.
+        """
+        known = [(user_ratings.get(name) or 0) >= KNOWN_SKILL for name in self.names]
+        levels = [0] * len(self.names)
+        for topic_id in self.topological_order:
+            levels[topic_id] = max(
+                (levels[p] + 1 for p in self.prereq_ids[topic_id] if not known[p]), default=0)
+        return levels
+
+    def unlock_order(self, user_ratings, topics=None):
+        """
+        Topics not yet known, ordered so each comes after the unknown
+        prerequisites it waits on: by unlock level, then topological order.
+        Limited to `topics` (names) when given.
+        """
+        levels = self.unlock_levels(user_ratings)
+        candidates = self.names if topics is None else [t for t in topics if t in self.ids]
+        pending = [self.ids[name] for name in candidates
+                   if (user_ratings.get(name) or 0) < KNOWN_SKILL]
+        pending.sort(key=lambda i: (levels[i], self.position[i]))
+        return [self.names[i] for i in pending]
+
+
+def _mask(topic_ids):
+    mask = 0
+    for topic_id in topic_ids:
+        mask |= 1 << topic_id
+    return mask
@@ -0,0 +1,120 @@
+import os
+import re
+import threading
+from collections.abc import Mapping
+from typing import NamedTuple
+
+PROBLEM_BANK_PATH = os.environ.get(
+    "PROBLEM_BANK_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'problem_bank.tsv'),
+)
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+
+class Problem(NamedTuple):
+    key: str           # identity of the underlying problem, shared across topics
+    title: str         # name shown for this topic
+    difficulty: str    # easy, medium, hard, or None when unknown
+
+
+def problem_key(title):
+    """Normalized identity for a title: lowercase slug without a trailing qualifier"""
+    title = re.sub(r'\s*\([^)]*\)\s*$', '', title)
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+
+class ProblemBank:
+    """
+    Practice problems per topic, loaded on first use.
+    Keeps each topic's problems in file order and per-topic difficulty
+    buckets. The data file is tab-separated (topic, key, title, difficulty)
+    so banks with many thousands of problems load in one linear pass, and
+    only when a plan first needs them.
+    """
+
+    def __init__(self, path=PROBLEM_BANK_PATH, rows=None):
+        self.path = path
+        self._rows = rows
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @classmethod
+    def from_mapping(cls, practice_problems):
+        """Bank from a {topic: [titles]} mapping, keyed by normalized title"""
+        return cls(path=None, rows=[
+            (topic, problem_key(title), title, None)
+            for topic, titles in practice_problems.items() for title in titles
+        ])
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            topics = {}
+            for topic, key, title, difficulty in (self._rows if self._rows is not None else self._read()):
+                problem = Problem(key or problem_key(title), title, difficulty or None)
+                topics.setdefault(topic, []).append(problem)
+            self._topics = {topic: tuple(problems) for topic, problems in topics.items()}
+            self._buckets = {
+                topic: {difficulty: tuple(p for p in problems if p.difficulty == difficulty)
+                        for difficulty in DIFFICULTIES + (None,)}
+                for topic, problems in self._topics.items()
+            }
+            self._rows = None
+            self._loaded = True
+
+    def _read(self):
+        with open(self.path, encoding='utf-8') as f:
+            header = None
+            for line in f:
+                line = line.rstrip('\n')
+                if not line or line.startswith('#'):
+                    continue
+                fields = line.split('\t')
+                if header is None:
+                    header = fields
+                    continue
+                row = dict(zip(header, fields))
+                yield row['topic'], row.get('key', ''), row['title'], row.get('difficulty', '')
+
+    def problems(self, topic):
+        """A topic's problems in bank order"""
+        self._ensure_loaded()
+        return self._topics.get(topic, ())
+
+    def bucket(self, topic, difficulty):
+        """A topic's problems of one difficulty, in bank order"""
+        self._ensure_loaded()
+        return self._buckets.get(topic, {}).get(difficulty, ())
+
+    def topic_names(self):
+        self._ensure_loaded()
+        return tuple(self._topics)
+
+    def __contains__(self, topic):
+        self._ensure_loaded()
+        return topic in self._topics
+
+
+class PracticeProblems(Mapping):
+    """Read-only {topic: [titles]} view of a ProblemBank"""
+
+    def __init__(self, bank):
+        self.bank = bank
+
+    def __getitem__(self, topic):
+        if topic not in self.bank:
+            raise KeyError(topic)
+        return [problem.title for problem in self.bank.problems(topic)]
+
+    def __iter__(self):
+        return iter(self.bank.topic_names())
+
+    def __len__(self):
+        return len(self.bank.topic_names())
+
+
+PROBLEM_BANK = ProblemBank()
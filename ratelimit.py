@@ -0,0 +1,133 @@
+import math
+import os
+import threading
+import time
+from functools import wraps
+
+from flask import jsonify, session
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory; each worker limits independently"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now, cost=1):
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                if len(self._buckets) > self.max_keys:
+                    self._evict_full(rate, burst, now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, (cost - tokens) / rate
+
+    def _evict_full(self, rate, burst, now):
+        # A bucket that has refilled completely carries no state
+        for key, (tokens, updated_at) in list(self._buckets.items()):
+            if tokens + (now - updated_at) * rate >= burst:
+                del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class DatabaseBucketStore:
+    """
+    Token buckets in the rate_limit_bucket table, shared by every worker.
+    Each take is one conditional UPDATE that refills and spends atomically,
+    plus an INSERT for a new key or a SELECT to compute Retry-After.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def take(self, key, rate, burst, now, cost=1):
+        from models import RateLimitBucket as Bucket
+
+        refilled = Bucket.tokens + (now - Bucket.updated_at) * rate
+        refilled = case((refilled > burst, burst), else_=refilled)
+        with self.db.engine.begin() as conn:
+            spent = conn.execute(
+                update(Bucket)
+                .where(Bucket.key == key, refilled >= cost)
+                .values(tokens=refilled - cost, updated_at=now)
+            )
+            if spent.rowcount:
+                return True, 0.0
+
+            insert = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}.get(conn.dialect.name)
+            if insert is not None:
+                created = conn.execute(
+                    insert(Bucket).values(key=key, tokens=burst - cost, updated_at=now)
+                    .on_conflict_do_nothing(index_elements=['key'])
+                )
+                if created.rowcount:
+                    return True, 0.0
+
+            row = conn.execute(select(Bucket.tokens, Bucket.updated_at).where(Bucket.key == key)).first()
+            if row is None:
+                conn.execute(Bucket.__table__.insert().values(key=key, tokens=burst - cost, updated_at=now))
+                return True, 0.0
+            tokens = min(burst, row.tokens + (now - row.updated_at) * rate)
+            return False, (cost - tokens) / rate
+
+
+class RateLimiter:
+    """
+    Token bucket limiter: `burst` requests at once, refilled at
+    `per_minute` requests per minute.
+    """
+
+    def __init__(self, store, per_minute, burst, clock=time.time):
+        self.store = store
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self._clock = clock
+
+    def hit(self, key):
+        """Spend one token; returns (allowed, retry_after_seconds)"""
+        return self.store.take(key, self.rate, self.burst, self._clock())
+
+    def limit(self, scope):
+        """Decorator limiting a view per signed-in user; returns 429 with Retry-After"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                user_id = session.get('user_id')
+                if user_id and self.rate > 0:
+                    allowed, retry_after = self.hit(f'{scope}:{user_id}')
+                    if not allowed:
+                        response = jsonify({'error': 'Too many requests. Please try again shortly.'})
+                        response.status_code = 429
+                        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                        return response
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+def create_store(name, db):
+    """Bucket store by name: 'memory' or 'db'"""
+    if name == 'memory':
+        return MemoryBucketStore()
+    if name == 'db':
+        return DatabaseBucketStore(db)
+    raise ValueError(f"Unknown RATE_LIMIT_STORE: {name}")
+
+
+def plan_rate_limiter(db):
+    """Limiter for plan generation, configured from the environment (0 per minute disables)"""
+    return RateLimiter(
+        create_store(os.environ.get("RATE_LIMIT_STORE", "memory"), db),
+        per_minute=float(os.environ.get("PLAN_RATE_LIMIT_PER_MINUTE", "6")),
+        burst=int(os.environ.get("PLAN_RATE_LIMIT_BURST", "3")),
+    )
@@ -0,0 +1,68 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    Per-user LRU cache of serialized response bodies, bounded by total bytes.
+    Each user has at most one entry, tagged with the user's data_version; a
+    lookup with any other version misses, so a write in another worker only
+    costs this worker a stale entry until it is replaced or evicted.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, version, body):
+        # Never let one response flush most of the cache
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            self._discard(user_id)
+            self._entries[user_id] = (version, body)
+            self.size_bytes += len(body)
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._discard(user_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'entries': len(self._entries), 'size_bytes': self.size_bytes,
+                'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def _discard(self, user_id):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[1])
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_data_cache = ResponseCache(max_bytes=int(os.environ.get("USER_DATA_CACHE_BYTES", str(16 * 1024 * 1024))))
@@ -0,0 +1,127 @@
+import os
+from sqlalchemy import LargeBinary, cast, func, select, update
+from app import db
+from models import PlanJob, StudyPlan
+
+# Plan ids per DELETE statement
+DELETE_CHUNK_SIZE = 500
+
+
+class RetentionPolicy:
+    """
+    Which study plans to keep for a user.
+    Keeps the latest `keep_latest` plans, plus the newest plan of each of
+    the `keep_daily` most recent days and of each of the `keep_weekly` most
+    recent ISO weeks that have plans. Everything else can be pruned.
+    """
+
+    def __init__(self, keep_latest=5, keep_daily=7, keep_weekly=4):
+        self.keep_latest = max(1, keep_latest)
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            keep_latest=int(os.environ.get("PLAN_RETENTION_KEEP_LATEST", "5")),
+            keep_daily=int(os.environ.get("PLAN_RETENTION_KEEP_DAILY", "7")),
+            keep_weekly=int(os.environ.get("PLAN_RETENTION_KEEP_WEEKLY", "4")),
+        )
+
+    def plans_to_keep(self, plans):
+        """
+        Args:
+            plans: (plan_id, created_at) pairs for one user, newest first
+
+        Returns:
+            set: ids of the plans to keep
+        """
+        keep = {plan_id for plan_id, _ in plans[:self.keep_latest]}
+        days = {}
+        weeks = {}
+        for plan_id, created_at in plans:
+            if created_at is None:
+                continue
+            day = created_at.date()
+            if day not in days and len(days) < self.keep_daily:
+                days[day] = plan_id
+            week = tuple(created_at.isocalendar()[:2])
+            if week not in weeks and len(weeks) < self.keep_weekly:
+                weeks[week] = plan_id
+        return keep | set(days.values()) | set(weeks.values())
+
+
+def compact_plan_history(policy, batch_size=100, after_user_id=0, dry_run=False):
+    """
+    Prune study plans outside the retention policy.
+    Works through users in id order, `batch_size` users per transaction, and
+    only visits users with more plans than the policy always keeps. Yields a
+    progress dict after each batch; resume a stopped run by passing the last
+    reported `last_user_id` as `after_user_id`. Plan jobs that produced a
+    deleted plan keep their row with study_plan_id cleared.
+    """
+    last_user_id = after_user_id
+    while True:
+        try:
+            progress = _compact_batch(policy, batch_size, last_user_id, dry_run)
+        except Exception:
+            db.session.rollback()
+            raise
+        if progress is None:
+            return
+        last_user_id = progress['last_user_id']
+        yield progress
+
+
+def _stored_bytes(column):
+    """SQL for a text column's size in bytes; length() counts characters"""
+    dialect = db.session.get_bind(mapper=StudyPlan.__mapper__).dialect.name
+    if dialect == 'sqlite':
+        return func.length(cast(column, LargeBinary))
+    return func.octet_length(column)
+
+
+def _compact_batch(policy, batch_size, last_user_id, dry_run):
+    """Prune the next batch of users in one transaction; None when none are left"""
+    user_ids = db.session.execute(
+        select(StudyPlan.user_id)
+        .where(StudyPlan.user_id > last_user_id)
+        .group_by(StudyPlan.user_id)
+        .having(func.count(StudyPlan.id) > policy.keep_latest)
+        .order_by(StudyPlan.user_id)
+        .limit(batch_size)
+    ).scalars().all()
+    if not user_ids:
+        return None
+
+    rows = db.session.execute(
+        select(StudyPlan.id, StudyPlan.user_id, StudyPlan.created_at, _stored_bytes(StudyPlan.plan_data))
+        .where(StudyPlan.user_id.in_(user_ids))
+        .order_by(StudyPlan.user_id, StudyPlan.created_at.desc(), StudyPlan.id.desc())
+    ).all()
+
+    plans_by_user = {}
+    sizes = {}
+    for plan_id, user_id, created_at, size in rows:
+        plans_by_user.setdefault(user_id, []).append((plan_id, created_at))
+        sizes[plan_id] = size or 0
+
+    doomed = []
+    for plans in plans_by_user.values():
+        keep = policy.plans_to_keep(plans)
+        doomed.extend(plan_id for plan_id, _ in plans if plan_id not in keep)
+
+    if not dry_run:
+        for start in range(0, len(doomed), DELETE_CHUNK_SIZE):
+            chunk = doomed[start:start + DELETE_CHUNK_SIZE]
+            db.session.execute(
+                update(PlanJob).where(PlanJob.study_plan_id.in_(chunk)).values(study_plan_id=None))
+            StudyPlan.query.filter(StudyPlan.id.in_(chunk)).delete(synchronize_session=False)
+    db.session.commit()
+
+    return {
+        'last_user_id': user_ids[-1],
+        'users': len(user_ids),
+        'rows_deleted': len(doomed),
+        'bytes_reclaimed': sum(sizes[plan_id] for plan_id in doomed),
+    }
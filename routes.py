@@ -1,68 +1,141 @@
 import os
 import json
-from flask import render_template, request, jsonify, session, redirect, url_for
+import random
+from datetime import date
+from functools import wraps
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import aliased
+from flask import Response, request, stream_with_context, jsonify, session, redirect, url_for
 from app import app, db
-from models import User, TopicRating, StudyPlan
-from study_plan_generator import StudyPlanGenerator
-import firebase_admin
-from firebase_admin import credentials, auth
+from models import User, TopicRating, SkillAggregate, StudyPlan, HorizonPlan, PlanJob
+from jobs import PlanJobQueue
+from plan_cache import PlanCache
+from ratelimit import plan_rate_limiter
+from singleflight import plan_flights
+from study_plan_generator import HORIZONS, StudyPlanGenerator
+from scheduler import SCHEDULERS, get_scheduler
+from token_cache import token_cache
+from response_cache import user_data_cache
+from page_cache import page_cache
+import assets
+import export
 import logging
+import threading
 
-# Initialize Firebase Admin SDK
-try:
-    # Try to get service account from environment
-    service_account_key = os.environ.get("FIREBASE_SERVICE_ACCOUNT_KEY")
-    if service_account_key:
-        service_account_info = json.loads(service_account_key)
-        cred = credentials.Certificate(service_account_info)
-    else:
-        # Fallback to default credentials
-        cred = credentials.ApplicationDefault()
-    
-    firebase_admin.initialize_app(cred)
-    logging.info("Firebase Admin SDK initialized successfully")
-except Exception as e:
-    logging.error(f"Failed to initialize Firebase Admin SDK: {e}")
+# Firebase Admin SDK, initialized on first token verification
+_firebase_lock = threading.Lock()
+_firebase_auth = None
+
+
+def firebase_auth():
+    """The firebase_admin.auth module, initializing the Admin SDK on first use"""
+    global _firebase_auth
+    if _firebase_auth is None:
+        with _firebase_lock:
+            if _firebase_auth is None:
+                import firebase_admin
+                from firebase_admin import credentials, auth
+                try:
+                    # Try to get service account from environment
+                    service_account_key = os.environ.get("FIREBASE_SERVICE_ACCOUNT_KEY")
+                    if service_account_key:
+                        service_account_info = json.loads(service_account_key)
+                        cred = credentials.Certificate(service_account_info)
+                    else:
+                        # Fallback to default credentials
+                        cred = credentials.ApplicationDefault()
+
+                    firebase_admin.initialize_app(cred)
+                    logging.info("Firebase Admin SDK initialized successfully")
+                except Exception as e:
+                    logging.error("Failed to initialize Firebase Admin SDK: %s", e)
+                _firebase_auth = auth
+    return _firebase_auth
+
+# Firebase UIDs allowed to call admin endpoints
+ADMIN_FIREBASE_UIDS = {
+    uid.strip() for uid in os.environ.get("ADMIN_FIREBASE_UIDS", "").split(",") if uid.strip()
+}
+
+# Default day-assignment engine and its search budget
+PLAN_SCHEDULER = os.environ.get("PLAN_SCHEDULER", "greedy")
+SCHEDULER_NODE_BUDGET = int(os.environ.get("SCHEDULER_NODE_BUDGET", "20000"))
+# Default prerequisite penalty mode, see study_plan_generator.PREREQUISITE_MODES
+PLAN_PREREQUISITES = os.environ.get("PLAN_PREREQUISITES", "direct")
+MAX_PLAN_DAYS = 31
+
+# Request options accepted by /api/generate-plan
+PLAN_OPTIONS = ('scheduler', 'daily_hours', 'incremental', 'prerequisites')
+
+# Days returned per page of a long-horizon plan by default
+HORIZON_PAGE_DAYS = 7
+
+# Users regenerated per transaction by the batch endpoint
+BATCH_CHUNK_SIZE = 1000
+
+def admin_required(view):
+    """Restrict a route to signed-in users listed in ADMIN_FIREBASE_UIDS"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not session.get('user_id'):
+            return jsonify({'error': 'Not authenticated'}), 401
+        if session.get('firebase_uid') not in ADMIN_FIREBASE_UIDS:
+            return jsonify({'error': 'Admin access required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+def build_generator(options):
+    """
+    Create a StudyPlanGenerator from optional request options:
+    'scheduler' (a name from scheduler.SCHEDULERS), 'daily_hours'
+    (hours available per day; the plan lasts one day per entry) and
+    'prerequisites' ('direct' or 'transitive' penalties).
+    Raises ValueError for invalid options.
+    """
+    scheduler_name = options.get('scheduler') or PLAN_SCHEDULER
+    if scheduler_name not in SCHEDULERS:
+        raise ValueError(f"scheduler must be one of: {', '.join(SCHEDULERS)}")
+    scheduler_options = {'node_budget': SCHEDULER_NODE_BUDGET} if scheduler_name == 'binpack' else {}
+    
+    daily_hours = options.get('daily_hours')
+    if daily_hours is not None:
+        if (not isinstance(daily_hours, list) or not 1 <= len(daily_hours) <= MAX_PLAN_DAYS
+                or not all(isinstance(h, (int, float)) and 0 <= h <= 24 for h in daily_hours)):
+            raise ValueError(f"daily_hours must be a list of 1-{MAX_PLAN_DAYS} values between 0 and 24")
+    
+    return StudyPlanGenerator(
+        scheduler=get_scheduler(scheduler_name, **scheduler_options),
+        daily_time_limits=daily_hours,
+        prerequisites=options.get('prerequisites') or PLAN_PREREQUISITES,
+    )
 
 @app.route('/')
 def index():
     """Landing page with login option"""
-    return render_template(
-        'index.html',
-        firebase_api_key=os.environ.get("FIREBASE_API_KEY"),
-        firebase_project_id=os.environ.get("FIREBASE_PROJECT_ID"),
-        firebase_app_id=os.environ.get("FIREBASE_APP_ID"),
-    )
+    return page_cache.response('index.html')
 
 @app.route('/dashboard')
 def dashboard():
     """User dashboard showing current topics and study plans"""
-    return render_template(
-        'dashboard.html',
-        firebase_api_key=os.environ.get("FIREBASE_API_KEY"),
-        firebase_project_id=os.environ.get("FIREBASE_PROJECT_ID"),
-        firebase_app_id=os.environ.get("FIREBASE_APP_ID"),
-    )
+    return page_cache.response('dashboard.html')
 
 @app.route('/topics')
 def topic_selection():
     """Topic selection and skill rating page"""
-    return render_template(
-        'topic_selection.html',
-        firebase_api_key=os.environ.get("FIREBASE_API_KEY"),
-        firebase_project_id=os.environ.get("FIREBASE_PROJECT_ID"),
-        firebase_app_id=os.environ.get("FIREBASE_APP_ID"),
-    )
+    return page_cache.response('topic_selection.html')
 
 @app.route('/study-plan')
 def study_plan_view():
     """Study plan display page"""
-    return render_template(
-        'study_plan.html',
-        firebase_api_key=os.environ.get("FIREBASE_API_KEY"),
-        firebase_project_id=os.environ.get("FIREBASE_PROJECT_ID"),
-        firebase_app_id=os.environ.get("FIREBASE_APP_ID"),
-    )
+    return page_cache.response('study_plan.html')
+
+@app.route('/api/admin/reload-pages', methods=['POST'])
+@admin_required
+def reload_pages():
+    """Reload the asset manifest and configuration for this worker's cached pages"""
+    assets.load_manifest()
+    page_cache.invalidate()
+    return jsonify({'success': True})
 
 @app.route('/api/verify-token', methods=['POST'])
 def verify_token():
@@ -73,8 +146,16 @@ def verify_token():
         if not id_token:
             return jsonify({'error': 'No token provided'}), 400
         
+        # Tokens seen before skip signature verification and the user lookup
+        cached = token_cache.get(id_token)
+        if cached:
+            firebase_uid, user_id = cached
+            session['user_id'] = user_id
+            session['firebase_uid'] = firebase_uid
+            return jsonify({'success': True, 'user_id': user_id})
+        
         # Verify the token
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = firebase_auth().verify_id_token(id_token)
         firebase_uid = decoded_token['uid']
         email = decoded_token.get('email', '')
         display_name = decoded_token.get('name', '')
@@ -89,6 +170,8 @@ def verify_token():
             db.session.add(user)
             db.session.commit()
         
+        token_cache.put(id_token, firebase_uid, user.id, decoded_token.get('exp'))
+        
         # Store user ID in session
         session['user_id'] = user.id
         session['firebase_uid'] = firebase_uid
@@ -96,7 +179,7 @@ def verify_token():
         return jsonify({'success': True, 'user_id': user.id})
     
     except Exception as e:
-        logging.error(f"Token verification failed: {e}")
+        logging.error("Token verification failed: %s", e)
         return jsonify({'error': 'Invalid token'}), 401
 
 @app.route('/api/user-data')
@@ -106,20 +189,38 @@ def get_user_data():
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
     
-    user = User.query.get(user_id)
-    if not user:
+    # Revalidation and cache hits only need the user's data version
+    version = user_data_version(user_id)
+    if version is None:
+        return jsonify({'error': 'User not found'}), 404
+    if request.if_none_match.contains(user_data_etag(user_id, version)):
+        return user_data_response(b'', user_id, version, status=304)
+    body = user_data_cache.get(user_id, version)
+    if body is not None:
+        return user_data_response(body, user_id, version)
+    
+    # The version above came from the primary; fall back to it when the
+    # replica has not caught up with this user's latest write
+    rows = db.session.execute(user_data_query(user_id), bind_arguments={'bind': read_engine()}).all()
+    if not rows or rows[0].data_version < version:
+        rows = db.session.execute(user_data_query(user_id)).all()
+    if not rows:
         return jsonify({'error': 'User not found'}), 404
     
     # Get topic ratings
     topic_ratings = {}
-    for rating in user.topic_ratings:
-        topic_ratings[rating.topic_name] = rating.skill_level
+    plan_data = None
+    for row in rows:
+        if row.topic_name is not None:
+            topic_ratings[row.topic_name] = row.skill_level
+        if row.plan_data is not None:
+            plan_data = row.plan_data
     
     # Get latest study plan
-    latest_plan = StudyPlan.query.filter_by(user_id=user_id).order_by(StudyPlan.created_at.desc()).first()
-    study_plan = latest_plan.get_plan_data() if latest_plan else None
+    study_plan = StudyPlan.decode_plan_data(plan_data) if plan_data is not None else None
     
-    return jsonify({
+    user = rows[0]
+    body = app.json.dumps({
         'user': {
             'id': user.id,
             'email': user.email,
@@ -127,7 +228,67 @@ def get_user_data():
         },
         'topic_ratings': topic_ratings,
         'study_plan': study_plan
-    })
+    }).encode('utf-8') + b'\n'
+    # Tag the body with the version read alongside it
+    user_data_cache.put(user_id, user.data_version, body)
+    return user_data_response(body, user_id, user.data_version)
+
+def user_data_version(user_id):
+    return db.session.execute(select(User.data_version).where(User.id == user_id)).scalar()
+
+def user_data_etag(user_id, version):
+    return f'u{user_id}v{version}'
+
+def user_data_response(body, user_id, version, status=200):
+    """JSON response with a strong ETag; clients must revalidate before reuse"""
+    response = Response(body, status=status, mimetype='application/json')
+    response.set_etag(user_data_etag(user_id, version))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def invalidate_user_data(*user_ids):
+    """Bump the users' data versions (committed with the caller's write)"""
+    User.bump_data_version(*user_ids)
+    for user_id in user_ids:
+        user_data_cache.invalidate(user_id)
+
+def read_engine():
+    """Engine for read-only queries: the replica bind if configured, else the primary"""
+    return db.engines.get('replica', db.engine)
+
+def user_data_query(user_id):
+    """
+    Single statement returning a user's profile, ratings and latest plan.
+    One row per rating (or one row without ratings); the latest plan's data
+    is joined onto the first row only so it is not repeated per rating.
+    """
+    first_rating = aliased(TopicRating)
+    latest_plan = aliased(StudyPlan)
+    first_rating_id = (
+        select(func.min(first_rating.id))
+        .where(first_rating.user_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    latest_plan_id = (
+        select(latest_plan.id)
+        .where(latest_plan.user_id == User.id)
+        .order_by(latest_plan.created_at.desc())
+        .limit(1)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    return (
+        select(User.id, User.email, User.display_name, User.data_version,
+               TopicRating.topic_name, TopicRating.skill_level, StudyPlan.plan_data)
+        .outerjoin(TopicRating, TopicRating.user_id == User.id)
+        .outerjoin(StudyPlan, and_(
+            StudyPlan.id == latest_plan_id,
+            or_(TopicRating.id.is_(None), TopicRating.id == first_rating_id),
+        ))
+        .where(User.id == user_id)
+        .order_by(TopicRating.id)
+    )
 
 @app.route('/api/save-ratings', methods=['POST'])
 def save_topic_ratings():
@@ -140,32 +301,27 @@ def save_topic_ratings():
         data = request.get_json()
         ratings = data.get('ratings', {}) if data else {}
         
-        for topic_name, skill_level in ratings.items():
-            # Find existing rating or create new one
-            rating = TopicRating.query.filter_by(
-                user_id=user_id, 
-                topic_name=topic_name
-            ).first()
-            
-            if rating:
-                rating.skill_level = skill_level
-            else:
-                rating = TopicRating()
-                rating.user_id = user_id
-                rating.topic_name = topic_name
-                rating.skill_level = skill_level
-                db.session.add(rating)
-        
+        # Lock the user, read existing ratings, then bulk upsert the changes;
+        # the cohort counts move by the same old -> new deltas
+        changes = TopicRating.upsert_for_user(user_id, ratings)
+        if changes:
+            SkillAggregate.apply_changes(changes)
+            invalidate_user_data(user_id)
         db.session.commit()
         return jsonify({'success': True})
     
     except Exception as e:
-        logging.error(f"Failed to save ratings: {e}")
+        db.session.rollback()
+        logging.error("Failed to save ratings: %s", e)
         return jsonify({'error': 'Failed to save ratings'}), 500
 
+# Per-user token bucket for plan generation (RATE_LIMIT_STORE, PLAN_RATE_LIMIT_*)
+plan_limiter = plan_rate_limiter(db)
+
 @app.route('/api/generate-plan', methods=['POST'])
+@plan_limiter.limit('generate-plan')
 def generate_study_plan():
-    """Generate a 7-day study plan using greedy algorithm"""
+    """Generate a study plan (7 days by default) using the configured scheduler"""
     user_id = session.get('user_id')
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
@@ -180,25 +336,335 @@ def generate_study_plan():
         if not ratings:
             return jsonify({'error': 'No topic ratings found. Please rate your skills first.'}), 400
         
-        # Generate study plan
-        generator = StudyPlanGenerator()
-        plan_data = generator.generate_plan(ratings)
+        options = request.get_json(silent=True) or {}
+        options = {key: options[key] for key in PLAN_OPTIONS if key in options}
+        try:
+            build_generator(options)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Save study plan
-        study_plan = StudyPlan()
-        study_plan.user_id = user_id
-        study_plan.set_plan_data(plan_data)
-        db.session.add(study_plan)
-        db.session.commit()
+        if request.args.get('async') == '1':
+            job, created = plan_jobs.submit(user_id, ratings, options)
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status': job.status,
+                'coalesced': not created
+            }), 202
+        
+        # Identical concurrent requests (e.g. a double click) share one plan.
+        # Incremental plans build on the stored latest plan, so a result is
+        # only shared at the data version it started from, and at the version
+        # its own write leaves behind, where a repeat would produce it again
+        options_key = PlanCache.key(ratings, sorted(options.items()))
+        flight_key = (user_id, user_data_version(user_id), options_key)
         
-        return jsonify({'success': True, 'plan': plan_data})
+        def create_shared_plan():
+            result = create_plan(user_id, ratings, options)
+            plan_flights.alias(flight_key, (user_id, user_data_version(user_id), options_key))
+            return result
+        
+        (plan_data, _, incremental), coalesced = plan_flights.do(flight_key, create_shared_plan)
+        response = {'success': True, 'plan': plan_data}
+        if incremental:
+            response['incremental'] = True
+        if coalesced:
+            response['coalesced'] = True
+        return jsonify(response)
     
     except Exception as e:
-        logging.error(f"Failed to generate study plan: {e}")
+        db.session.rollback()
+        logging.error("Failed to generate study plan: %s", e)
         return jsonify({'error': 'Failed to generate study plan'}), 500
 
+def create_plan(user_id, ratings, options, report_progress=None):
+    """
+    Generate (or incrementally update) and store a user's study plan.
+    Returns (plan_data, study_plan_id, incremental).
+    """
+    generator = build_generator(options)
+    
+    if options.get('incremental'):
+        updated, plan_id = update_latest_plan(user_id, ratings, generator)
+        if updated is not None:
+            return updated, plan_id, True
+    
+    # Generate study plan
+    plan_data = generator.generate_plan(ratings)
+    if report_progress:
+        report_progress(60)
+    
+    # Save study plan
+    study_plan = StudyPlan()
+    study_plan.user_id = user_id
+    study_plan.set_plan_data(plan_data)
+    db.session.add(study_plan)
+    invalidate_user_data(user_id)
+    db.session.commit()
+    
+    return plan_data, study_plan.id, False
+
+def run_plan_job(job, ratings, options, report_progress):
+    """PlanJobQueue handler: build and store the plan for a queued job"""
+    _, plan_id, _ = create_plan(job.user_id, ratings, options, report_progress)
+    return plan_id
+
+plan_jobs = PlanJobQueue(
+    app, run_plan_job,
+    max_workers=int(os.environ.get("PLAN_JOB_WORKERS", "2")),
+    lease_seconds=int(os.environ.get("PLAN_JOB_LEASE_SECONDS", "300")),
+    keep_seconds=int(os.environ.get("PLAN_JOB_KEEP_HOURS", "24")) * 3600,
+)
+
+@app.route('/api/plan-jobs/<int:job_id>')
+def plan_job_status(job_id):
+    """Report the status of an asynchronous plan generation job"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    job = db.session.get(PlanJob, job_id)
+    if not job or job.user_id != user_id:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {'job_id': job.id, 'status': job.status, 'progress': job.progress}
+    if job.status == 'done' and job.study_plan_id:
+        study_plan = db.session.get(StudyPlan, job.study_plan_id)
+        response['plan'] = study_plan.get_plan_data() if study_plan else None
+    elif job.status == 'failed':
+        response['error'] = 'Failed to generate study plan'
+    return jsonify(response)
+
+def update_latest_plan(user_id, ratings, generator):
+    """
+    Repair the user's latest plan in place for the ratings that changed
+    since it was generated. Returns (plan_data, study_plan_id); plan_data
+    is None when there is no plan to update or it needs a full regeneration.
+    """
+    latest_plan = StudyPlan.query.filter_by(user_id=user_id).order_by(StudyPlan.created_at.desc()).first()
+    if not latest_plan:
+        return None, None
+    
+    previous = latest_plan.get_plan_data()
+    planned = generator.plan_ratings(previous)
+    # Topics outside the catalog never appear in a plan, so they cannot be diffed
+    ratings_diff = {
+        topic: skill_level for topic, skill_level in ratings.items()
+        if topic in generator.catalog and planned.get(topic) != skill_level
+    }
+    ratings_diff.update((topic, None) for topic in planned if topic not in ratings)
+    
+    plan_data = generator.update_plan(previous, ratings_diff)
+    if plan_data is not None and plan_data is not previous:
+        latest_plan.set_plan_data(plan_data)
+        invalidate_user_data(user_id)
+        db.session.commit()
+    return plan_data, latest_plan.id
+
+@app.route('/api/generate-plans/batch', methods=['POST'])
+@admin_required
+def generate_study_plans_batch():
+    """Regenerate and store study plans for a cohort of users"""
+    try:
+        data = request.get_json()
+        user_ids = data.get('user_ids', []) if data else []
+        if not isinstance(user_ids, list) or not user_ids or not all(isinstance(u, int) for u in user_ids):
+            return jsonify({'error': 'user_ids must be a non-empty list of integers'}), 400
+        user_ids = list(dict.fromkeys(user_ids))
+        
+        generator = build_generator({})
+        generated = 0
+        skipped = []
+        for start in range(0, len(user_ids), BATCH_CHUNK_SIZE):
+            chunk = user_ids[start:start + BATCH_CHUNK_SIZE]
+            
+            # Load the whole chunk's ratings in one query
+            ratings_by_user = {user_id: {} for user_id in chunk}
+            rows = TopicRating.query.filter(TopicRating.user_id.in_(chunk)).order_by(TopicRating.id).all()
+            for rating in rows:
+                ratings_by_user[rating.user_id][rating.topic_name] = rating.skill_level
+            
+            rated_ids = [user_id for user_id in chunk if ratings_by_user[user_id]]
+            skipped.extend(user_id for user_id in chunk if not ratings_by_user[user_id])
+            plans = generator.generate_plans(ratings_by_user[user_id] for user_id in rated_ids)
+            
+            for user_id, plan_data in zip(rated_ids, plans):
+                study_plan = StudyPlan()
+                study_plan.user_id = user_id
+                study_plan.set_plan_data(plan_data)
+                db.session.add(study_plan)
+            if rated_ids:
+                invalidate_user_data(*rated_ids)
+            db.session.commit()
+            generated += len(rated_ids)
+        
+        return jsonify({'success': True, 'generated': generated, 'skipped': skipped})
+    
+    except Exception as e:
+        db.session.rollback()
+        logging.error("Failed to generate study plans in batch: %s", e)
+        return jsonify({'error': 'Failed to generate study plans'}), 500
+
+@app.route('/api/horizon-plans', methods=['POST'])
+def create_horizon_plan():
+    """
+    Start a long-horizon plan from the user's current ratings.
+    Body: days (30, 60 or 90), optional daily_hours (a weekly pattern,
+    repeated), prerequisites ('direct' or 'transitive', PLAN_PREREQUISITES
+    by default) and seed. Only this header is stored; days are computed on
+    read with the same settings.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    options = request.get_json(silent=True) or {}
+    horizon_days = options.get('days', HORIZONS[0])
+    if horizon_days not in HORIZONS:
+        return jsonify({'error': f"days must be one of: {', '.join(map(str, HORIZONS))}"}), 400
+    seed = options.get('seed')
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    elif not isinstance(seed, int) or not 0 <= seed < 2 ** 31:
+        return jsonify({'error': 'seed must be a non-negative 32-bit integer'}), 400
+    settings = {'daily_hours': options.get('daily_hours'),
+                'prerequisites': options.get('prerequisites') or PLAN_PREREQUISITES}
+    try:
+        build_generator(settings)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    ratings = dict(db.session.execute(
+        select(TopicRating.topic_name, TopicRating.skill_level).where(TopicRating.user_id == user_id)
+    ).all())
+    if not ratings:
+        return jsonify({'error': 'No topic ratings found. Please rate your skills first.'}), 400
+    
+    try:
+        plan = HorizonPlan(user_id=user_id, horizon_days=horizon_days, seed=seed, start_date=date.today())
+        plan.set_settings(ratings, **settings)
+        db.session.add(plan)
+        db.session.commit()
+        return jsonify({'success': True, 'plan': horizon_header(plan)}), 201
+    except Exception as e:
+        db.session.rollback()
+        logging.error("Failed to create horizon plan: %s", e)
+        return jsonify({'error': 'Failed to create study plan'}), 500
+
+@app.route('/api/horizon-plans/<int:plan_id>')
+def horizon_plan_days(plan_id):
+    """
+    Days of a long-horizon plan, recomputed from its header.
+    Query parameters: from_day (1-based) and count for a page of JSON, or
+    format=ndjson to stream one day per line to the end (or `count` days).
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    plan = db.session.get(HorizonPlan, plan_id)
+    if not plan or plan.user_id != user_id:
+        return jsonify({'error': 'Plan not found'}), 404
+    
+    stream = request.args.get('format') == 'ndjson'
+    from_day = request.args.get('from_day', 1, type=int)
+    count = request.args.get('count', None if stream else HORIZON_PAGE_DAYS, type=int)
+    if not 1 <= from_day <= plan.horizon_days:
+        return jsonify({'error': f'from_day must be between 1 and {plan.horizon_days}'}), 400
+    if count is not None and not 1 <= count <= (plan.horizon_days if stream else MAX_PLAN_DAYS):
+        return jsonify({'error': 'count is out of range'}), 400
+    
+    settings = plan.get_settings()
+    generator = build_generator({'daily_hours': settings['daily_hours'], 'prerequisites': settings['prerequisites']})
+    days = generator.iter_horizon_days(settings['ratings'], plan.horizon_days, plan.seed,
+                                       plan.start_date, from_day, count)
+    if stream:
+        lines = (json.dumps(day, separators=(',', ':')) + '\n' for day in days)
+        return Response(lines, mimetype='application/x-ndjson')
+    
+    days = list(days)
+    next_day = from_day + len(days)
+    return jsonify({
+        'plan': horizon_header(plan),
+        'from_day': from_day,
+        'days': days,
+        'next_from_day': next_day if next_day <= plan.horizon_days else None
+    })
+
+def horizon_header(plan):
+    """JSON summary of a stored long-horizon plan"""
+    settings = plan.get_settings()
+    return {
+        'id': plan.id,
+        'horizon_days': plan.horizon_days,
+        'seed': plan.seed,
+        'start_date': plan.start_date.isoformat(),
+        'daily_hours': settings['daily_hours'],
+        'prerequisites': settings['prerequisites'],
+        'total_topics': len(settings['ratings']),
+        'created_at': plan.created_at.isoformat() if plan.created_at else None
+    }
+
+@app.route('/api/admin/skill-distribution')
+@admin_required
+def skill_distribution():
+    """Users per skill level for every rated topic, from the maintained aggregate"""
+    rows = db.session.execute(
+        select(SkillAggregate.topic_name, SkillAggregate.skill_level, SkillAggregate.user_count)
+        .where(SkillAggregate.user_count != 0)
+        .order_by(SkillAggregate.topic_name, SkillAggregate.skill_level),
+        bind_arguments={'bind': read_engine()},
+    ).all()
+    
+    topics = {}
+    for topic_name, skill_level, user_count in rows:
+        topic = topics.setdefault(topic_name, {'topic': topic_name, 'levels': {}, 'total': 0, 'average': 0})
+        topic['levels'][str(skill_level)] = user_count
+        topic['total'] += user_count
+        topic['average'] += skill_level * user_count
+    for topic in topics.values():
+        topic['average'] = round(topic['average'] / topic['total'], 2) if topic['total'] else None
+    return jsonify({'topics': list(topics.values())})
+
+@app.route('/api/admin/export/<table>')
+@admin_required
+def export_table(table):
+    """
+    Stream every study plan or topic rating as NDJSON or CSV.
+    Query parameters: format (ndjson, csv), gzip=1, since/until (ISO dates),
+    after_id to resume and limit.
+    """
+    if table not in export.EXPORT_TABLES:
+        return jsonify({'error': f"table must be one of: {', '.join(export.EXPORT_TABLES)}"}), 404
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in export.FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(export.FORMATS)}"}), 400
+    limit = request.args.get('limit')
+    if limit is not None and not limit.isdecimal():
+        return jsonify({'error': 'limit must be a non-negative integer'}), 400
+    try:
+        filters = {
+            'since': export.parse_datetime(request.args.get('since')),
+            'until': export.parse_datetime(request.args.get('until')),
+            'after_id': request.args.get('after_id', 0, type=int),
+            'limit': int(limit) if limit is not None else None,
+        }
+    except ValueError:
+        return jsonify({'error': 'since and until must be ISO dates'}), 400
+    
+    compress = request.args.get('gzip') == '1'
+    filename = f'{table}.{export_format}' + ('.gz' if compress else '')
+    mimetype = 'application/gzip' if compress else (
+        'application/x-ndjson' if export_format == 'ndjson' else 'text/csv')
+    chunks = export.export_chunks(table, export_format, compress, bind=read_engine(), **filters)
+    return Response(stream_with_context(chunks), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 @app.route('/api/logout', methods=['POST'])
 def logout():
-    """Clear user session"""
+    """Clear user session and forget the user's cached tokens"""
+    firebase_uid = session.get('firebase_uid')
+    if firebase_uid:
+        token_cache.invalidate_uid(firebase_uid)
     session.clear()
     return jsonify({'success': True})
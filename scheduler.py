@@ -0,0 +1,310 @@
+import heapq
+import logging
+
+# Hours per day for the default 7-day plan
+DEFAULT_DAILY_TIME_LIMITS = (3, 3, 4, 4, 4, 3, 2)
+
+
+class Scheduler:
+    """
+    Assigns prioritized topics to days.
+    `schedule` receives topic info dicts sorted by priority (highest first),
+    the per-day hour limits and the topic catalog, and returns a list of
+    per-day topic lists plus a list of topics that could not be placed.
+    """
+
+    name = None
+
+    def schedule(self, topic_priorities, daily_limits, catalog):
+        raise NotImplementedError
+
+    def cache_key(self):
+        """Configuration that changes the schedule, for plan caching"""
+        return (self.name,)
+
+    def repair(self, days, deferred, topic_priorities, daily_limits, catalog):
+        """
+        Place re-scored topics into an existing schedule without moving the
+        topics already there. Each topic goes to the earliest day with room
+        that keeps it after its prerequisites and before its dependents;
+        topics that fit nowhere are deferred, and so are the topics that
+        build on a deferred one.
+        """
+        days = [list(topics) for topics in days]
+        deferred = list(deferred)
+        day_of = {t['topic']: day for day, topics in enumerate(days) for t in topics}
+        used = [sum(t['estimated_time'] for t in topics) for topics in days]
+        touched = set()
+
+        for topic_info in topic_priorities:
+            lo, hi = 0, len(days) - 1
+            topic_id = catalog.ids.get(topic_info['topic'])
+            if topic_id is not None:
+                lo = max((day_of[p] for p in catalog.prereq_names[topic_id] if p in day_of), default=lo)
+                hi = min((day_of[catalog.names[d]] for d in catalog.dependent_ids[topic_id]
+                          if catalog.names[d] in day_of), default=hi)
+            for day in range(lo, hi + 1):
+                if used[day] + topic_info['estimated_time'] <= daily_limits[day]:
+                    self._place(days, used, day_of, touched, day, topic_info)
+                    break
+            else:
+                deferred.append(topic_info)
+
+        self._defer_dependents(days, deferred, catalog)
+        return self._sort_touched(days, touched), deferred
+
+    @staticmethod
+    def _defer_dependents(days, deferred, catalog):
+        """Move scheduled topics with a deferred prerequisite to `deferred`, in place"""
+        deferred_names = {t['topic'] for t in deferred}
+        scheduled = [(catalog.graph.position[catalog.ids[t['topic']]], day, t)
+                     for day, topics in enumerate(days) for t in topics if t['topic'] in catalog.ids]
+        # Prerequisites first, so deferral cascades down to their dependents
+        for _, day, topic_info in sorted(scheduled, key=lambda entry: entry[0]):
+            prereqs = catalog.prereq_names[catalog.ids[topic_info['topic']]]
+            if deferred_names.intersection(prereqs):
+                days[day].remove(topic_info)
+                deferred.append(topic_info)
+                deferred_names.add(topic_info['topic'])
+
+    @staticmethod
+    def _place(days, used, day_of, touched, day, topic_info):
+        days[day].append(topic_info)
+        used[day] += topic_info['estimated_time']
+        day_of[topic_info['topic']] = day
+        touched.add(day)
+
+    @staticmethod
+    def _sort_touched(days, touched):
+        # Days list topics by priority, highest first
+        for day in touched:
+            days[day].sort(key=lambda t: t['priority'], reverse=True)
+        return days
+
+
+class GreedyScheduler(Scheduler):
+    """
+    First-fit in priority order. Topics that fit nowhere go to the day with
+    the least time used, so days can be overloaded but nothing is deferred.
+    """
+
+    name = 'greedy'
+
+    def schedule(self, topic_priorities, daily_limits, catalog):
+        days = [[] for _ in daily_limits]
+        daily_time_used = [0] * len(daily_limits)
+
+        for topic_info in topic_priorities:
+            # Find the best day for this topic (greedy approach)
+            best_day = -1
+            for day in range(len(daily_limits)):
+                if daily_time_used[day] + topic_info['estimated_time'] <= daily_limits[day]:
+                    best_day = day
+                    break
+
+            if best_day == -1:
+                # If no day has enough time, add to day with most available time
+                best_day = daily_time_used.index(min(daily_time_used))
+
+            days[best_day].append(topic_info)
+            daily_time_used[best_day] += topic_info['estimated_time']
+
+        return days, []
+
+    def repair(self, days, deferred, topic_priorities, daily_limits, catalog):
+        """First-fit re-scored topics into the time left on each day"""
+        days = [list(topics) for topics in days]
+        day_of = {}
+        used = [sum(t['estimated_time'] for t in topics) for topics in days]
+        touched = set()
+
+        for topic_info in topic_priorities:
+            for day in range(len(days)):
+                if used[day] + topic_info['estimated_time'] <= daily_limits[day]:
+                    break
+            else:
+                day = used.index(min(used))
+            self._place(days, used, day_of, touched, day, topic_info)
+
+        return self._sort_touched(days, touched), list(deferred)
+
+
+class BinPackingScheduler(Scheduler):
+    """
+    Priority-weighted bin packing that never exceeds a day's hour limit.
+    Maximizes the total priority of scheduled topics, slightly preferring
+    earlier days for higher priorities, subject to prerequisites landing on
+    the same or an earlier day than the topics that depend on them. Topics
+    that do not fit are deferred.
+
+    Inputs with at most `exact_limit` topics are solved by branch and bound,
+    seeded with the greedy approximation and cut off after `node_budget`
+    search nodes, so the same input always gives the same schedule; larger
+    inputs use the approximation alone.
+    """
+
+    name = 'binpack'
+
+    # Weight of the earlier-day preference relative to priority
+    EARLY_BONUS = 0.01
+    # Topics with non-positive priority still fill spare time
+    MIN_WEIGHT = 0.01
+
+    def __init__(self, node_budget=20000, exact_limit=12):
+        self.node_budget = node_budget
+        self.exact_limit = exact_limit
+
+    def cache_key(self):
+        return (self.name, self.node_budget, self.exact_limit)
+
+    def schedule(self, topic_priorities, daily_limits, catalog):
+        n_days = len(daily_limits)
+        items = list(topic_priorities)
+        weights = [max(item['priority'], self.MIN_WEIGHT) for item in items]
+        times = [item['estimated_time'] for item in items]
+
+        # Prerequisite edges between the topics being scheduled
+        index = {item['topic']: i for i, item in enumerate(items)}
+        prereqs = [[] for _ in items]
+        dependents = [[] for _ in items]
+        for i, item in enumerate(items):
+            topic_id = catalog.ids.get(item['topic'])
+            if topic_id is None:
+                continue
+            for name in catalog.prereq_names[topic_id]:
+                j = index.get(name)
+                if j is not None and j != i:
+                    prereqs[i].append(j)
+                    dependents[j].append(i)
+
+        def value(i, day):
+            return weights[i] * (1 + self.EARLY_BONUS * (n_days - day) / n_days)
+
+        def allowed_days(i, assignment):
+            # Topics are decided after their prerequisites; one whose
+            # prerequisite was deferred is deferred too
+            lo = 0
+            for j in prereqs[i]:
+                if assignment[j] is None:
+                    return range(0)
+                lo = max(lo, assignment[j])
+            return range(lo, n_days)
+
+        # Topics are decided densest first among those whose prerequisites
+        # in the plan are decided; the bound takes them by density alone
+        density = [weights[i] / times[i] if times[i] else float('inf') for i in range(len(items))]
+        order = self._ready_order(density, prereqs, dependents)
+        by_density = sorted(range(len(items)), key=lambda i: density[i], reverse=True)
+
+        # Greedy approximation: earliest feasible day with room
+        assignment = [None] * len(items)
+        remaining = list(daily_limits)
+        for i in order:
+            for day in allowed_days(i, assignment):
+                if times[i] <= remaining[day]:
+                    assignment[i] = day
+                    remaining[day] -= times[i]
+                    break
+        best = list(assignment)
+        best_value = sum(value(i, d) for i, d in enumerate(assignment) if d is not None)
+
+        if len(items) <= self.exact_limit:
+            best, best_value = self._branch_and_bound(order, by_density, times, weights, value, allowed_days,
+                                                      list(daily_limits), best, best_value)
+
+        days = [[] for _ in daily_limits]
+        deferred = []
+        for i, item in enumerate(items):
+            if best[i] is None:
+                deferred.append(item)
+            else:
+                days[best[i]].append(item)
+        return days, deferred
+
+    @staticmethod
+    def _ready_order(density, prereqs, dependents):
+        """Topic indexes with every prerequisite before its dependents, densest ready topic first"""
+        waiting = [len(p) for p in prereqs]
+        ready = [(-density[i], i) for i, count in enumerate(waiting) if not count]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, i = heapq.heappop(ready)
+            order.append(i)
+            for j in dependents[i]:
+                waiting[j] -= 1
+                if not waiting[j]:
+                    heapq.heappush(ready, (-density[j], j))
+        return order
+
+    def _branch_and_bound(self, order, by_density, times, weights, value, allowed_days, remaining, best, best_value):
+        max_value = [w * (1 + self.EARLY_BONUS) for w in weights]
+        rank = [0] * len(times)
+        for pos, i in enumerate(order):
+            rank[i] = pos
+        assignment = [None] * len(times)
+        state = {'best': best, 'best_value': best_value, 'nodes': 0, 'expired': False}
+
+        def bound(pos, current):
+            # Fractional knapsack over the remaining topics and the free time
+            # they can actually fill: each day counts only up to the largest
+            # subset sum of remaining topic times that fits in it
+            reachable = 1
+            for i in order[pos:]:
+                reachable |= reachable << times[i]
+            capacity = sum((reachable & ((2 << int(free)) - 1)).bit_length() - 1 for free in remaining if free > 0)
+            largest = max(remaining)
+            total = current
+            for i in by_density:
+                if rank[i] < pos or times[i] > largest:
+                    continue
+                if times[i] <= capacity:
+                    capacity -= times[i]
+                    total += max_value[i]
+                elif times[i]:
+                    return total + max_value[i] * capacity / times[i]
+            return total
+
+        def search(pos, current):
+            state['nodes'] += 1
+            if state['nodes'] > self.node_budget:
+                state['expired'] = True
+            if state['expired']:
+                return
+            if pos == len(order):
+                if current > state['best_value']:
+                    state['best_value'] = current
+                    state['best'] = list(assignment)
+                return
+            if bound(pos, current) <= state['best_value']:
+                return
+
+            i = order[pos]
+            for day in allowed_days(i, assignment):
+                if times[i] <= remaining[day]:
+                    assignment[i] = day
+                    remaining[day] -= times[i]
+                    search(pos + 1, current + value(i, day))
+                    remaining[day] += times[i]
+                    assignment[i] = None
+            search(pos + 1, current)
+
+        search(0, 0.0)
+        if state['expired']:
+            logging.debug("Bin packing search for %d topics stopped at its %d node budget",
+                          len(times), self.node_budget)
+        return state['best'], state['best_value']
+
+
+SCHEDULERS = {
+    GreedyScheduler.name: GreedyScheduler,
+    BinPackingScheduler.name: BinPackingScheduler,
+}
+
+
+def get_scheduler(name, **options):
+    """Instantiate a scheduler by name"""
+    try:
+        return SCHEDULERS[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown scheduler: {name}")
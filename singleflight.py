@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'finished_at')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+    The first caller runs the function; callers arriving while it runs wait
+    and receive the same result (or exception). A finished result stays
+    shareable for `linger` seconds so back-to-back duplicates, such as a
+    double click served by a single sync worker, are coalesced too.
+    `alias` shares a call under a further key, for callers whose key
+    changes because of the call's own side effects.
+    Process-local: each worker coalesces its own requests.
+    """
+
+    def __init__(self, linger=2.0, clock=time.monotonic):
+        self.linger = linger
+        self._clock = clock
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Return (result, shared) where shared is True for coalesced callers"""
+        with self._lock:
+            self._expire()
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            # Failures are not cached for later callers
+            self._drop(call)
+            raise
+        finally:
+            call.finished_at = self._clock()
+            call.done.set()
+        if not self.linger:
+            self._drop(call)
+        return call.result, False
+
+    def alias(self, key, new_key):
+        """Let callers of new_key share the call (running or lingering) under key"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._calls.setdefault(new_key, call)
+
+    def _drop(self, call):
+        with self._lock:
+            for key in [key for key, other in self._calls.items() if other is call]:
+                del self._calls[key]
+
+    def _expire(self):
+        now = self._clock()
+        stale = [key for key, call in self._calls.items()
+                 if call.finished_at is not None and now - call.finished_at >= self.linger]
+        for key in stale:
+            del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
+
+
+plan_flights = SingleFlight(linger=float(os.environ.get("PLAN_COALESCE_SECONDS", "2")))
@@ -0,0 +1,171 @@
+import { initializeApp } from 'https://www.gstatic.com/firebasejs/11.0.2/firebase-app.js';
+import { getAuth, onAuthStateChanged, signOut } from 'https://www.gstatic.com/firebasejs/11.0.2/firebase-auth.js';
+
+const firebaseConfig = window.firebaseConfig;
+
+const app = initializeApp(firebaseConfig);
+const auth = getAuth(app);
+
+let currentUser = null;
+
+// Auth state observer
+onAuthStateChanged(auth, async (user) => {
+    if (user) {
+        currentUser = user;
+        document.getElementById('userName').textContent = user.displayName || user.email;
+
+        // Verify token and load user data
+        try {
+            const idToken = await user.getIdToken();
+            await verifyToken(idToken);
+            await loadUserData();
+        } catch (error) {
+            console.error('Authentication error:', error);
+            window.location.href = '/';
+        }
+    } else {
+        window.location.href = '/';
+    }
+});
+
+// Logout handler
+document.getElementById('logoutBtn').addEventListener('click', async () => {
+    try {
+        await signOut(auth);
+        await fetch('/api/logout', { method: 'POST' });
+        window.location.href = '/';
+    } catch (error) {
+        console.error('Logout error:', error);
+    }
+});
+
+// View plan button handler
+document.getElementById('viewPlanBtn').addEventListener('click', () => {
+    window.location.href = '/study-plan';
+});
+
+async function verifyToken(idToken) {
+    const response = await fetch('/api/verify-token', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ idToken: idToken })
+    });
+
+    if (!response.ok) {
+        throw new Error('Token verification failed');
+    }
+}
+
+async function loadUserData() {
+    try {
+        const response = await fetch('/api/user-data');
+        if (!response.ok) {
+            throw new Error('Failed to load user data');
+        }
+
+        const data = await response.json();
+        displayUserData(data);
+    } catch (error) {
+        console.error('Error loading user data:', error);
+        showError('Failed to load user data');
+    } finally {
+        document.getElementById('loadingState').classList.add('d-none');
+        document.getElementById('mainContent').classList.remove('d-none');
+    }
+}
+
+function displayUserData(data) {
+    const { topic_ratings, study_plan } = data;
+
+    // Display topic ratings
+    displayTopicRatings(topic_ratings);
+
+    // Display study plan summary
+    displayStudyPlanSummary(study_plan);
+}
+
+function displayTopicRatings(ratings) {
+    const container = document.getElementById('topicRatings');
+    const countElement = document.getElementById('topicCount');
+
+    const topicCount = Object.keys(ratings).length;
+    countElement.textContent = `${topicCount} topic${topicCount !== 1 ? 's' : ''}`;
+
+    if (topicCount === 0) {
+        return; // Keep default empty state
+    }
+
+    container.innerHTML = '';
+
+    Object.entries(ratings).forEach(([topic, rating]) => {
+        const col = document.createElement('div');
+        col.className = 'col-md-4 col-sm-6 mb-3';
+
+        const stars = '★'.repeat(rating) + '☆'.repeat(5 - rating);
+
+        col.innerHTML = `
+            <div class="card topic-rating-card">
+                <div class="card-body text-center">
+                    <h6 class="card-title">${topic}</h6>
+                    <div class="rating-stars text-warning" style="font-size: 1.2em;">
+                        ${stars}
+                    </div>
+                    <small class="text-muted">Level ${rating}/5</small>
+                </div>
+            </div>
+        `;
+
+        container.appendChild(col);
+    });
+}
+
+function displayStudyPlanSummary(studyPlan) {
+    const container = document.getElementById('studyPlanSummary');
+
+    if (!studyPlan) {
+        return; // Keep default empty state
+    }
+
+    const totalTopics = studyPlan.total_topics || 0;
+    const generatedAt = new Date(studyPlan.generated_at).toLocaleDateString();
+
+    container.innerHTML = `
+        <div class="row">
+            <div class="col-md-4 text-center mb-3">
+                <div class="stat-item">
+                    <h3 class="text-primary">${totalTopics}</h3>
+                    <p class="text-muted mb-0">Topics Covered</p>
+                </div>
+            </div>
+            <div class="col-md-4 text-center mb-3">
+                <div class="stat-item">
+                    <h3 class="text-success">7</h3>
+                    <p class="text-muted mb-0">Days Plan</p>
+                </div>
+            </div>
+            <div class="col-md-4 text-center mb-3">
+                <div class="stat-item">
+                    <h3 class="text-info">${generatedAt}</h3>
+                    <p class="text-muted mb-0">Generated</p>
+                </div>
+            </div>
+        </div>
+        <div class="text-center mt-3">
+            <a href="/study-plan" class="btn btn-primary">
+                <i class="fas fa-eye me-1"></i>View Detailed Plan
+            </a>
+        </div>
+    `;
+}
+
+function showError(message) {
+    const alert = document.createElement('div');
+    alert.className = 'alert alert-danger alert-dismissible fade show';
+    alert.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    document.querySelector('.container').insertBefore(alert, document.querySelector('.container').firstChild);
+}
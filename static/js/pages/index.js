@@ -0,0 +1,103 @@
+import { initializeApp } from 'https://www.gstatic.com/firebasejs/11.0.2/firebase-app.js';
+import { getAuth, signInWithPopup, GoogleAuthProvider, onAuthStateChanged } from 'https://www.gstatic.com/firebasejs/11.0.2/firebase-auth.js';
+
+const firebaseConfig = window.firebaseConfig;
+
+// Check if Firebase config is properly loaded
+console.log("Firebase Config:", firebaseConfig);
+
+// Validate Firebase configuration
+if (!firebaseConfig.apiKey || firebaseConfig.apiKey.includes("{{")) {
+    console.error("Firebase configuration not loaded properly");
+    showError("Firebase configuration error. Please check your environment variables.");
+    throw new Error("Invalid Firebase configuration");
+}
+
+const app = initializeApp(firebaseConfig);
+const auth = getAuth(app);
+const provider = new GoogleAuthProvider();
+
+// Check if user is already signed in
+onAuthStateChanged(auth, (user) => {
+    if (user) {
+        handleAuthSuccess(user);
+    }
+});
+
+// Login button handler - using popup instead of redirect
+document.getElementById('loginBtn').addEventListener('click', async () => {
+    showLoading();
+    try {
+        const result = await signInWithPopup(auth, provider);
+        const user = result.user;
+        await handleAuthSuccess(user);
+    } catch (error) {
+        console.error("Authentication error:", error);
+        hideLoading();
+
+        // Handle specific authentication errors
+        if (error.code === "auth/unauthorized-domain") {
+            showDomainError();
+        } else if (error.code === "auth/popup-blocked") {
+            showError("Popup was blocked by your browser. Please allow popups and try again.");
+        } else if (error.code === "auth/popup-closed-by-user") {
+            showError("Sign-in was cancelled.");
+        } else {
+            showError("Authentication failed. Please try again.");
+        }
+    }
+});
+
+async function handleAuthSuccess(user) {
+    try {
+        const idToken = await user.getIdToken();
+
+        const response = await fetch("/api/verify-token", {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+            },
+            body: JSON.stringify({ idToken: idToken })
+        });
+
+        if (response.ok) {
+            window.location.href = "/dashboard";
+        } else {
+            throw new Error("Token verification failed");
+        }
+    } catch (error) {
+        console.error("Authentication error:", error);
+        hideLoading();
+        showError("Authentication failed. Please try again.");
+    }
+}
+
+function showLoading() {
+    document.getElementById("loginBtn").classList.add("d-none");
+    document.getElementById("loadingState").classList.remove("d-none");
+}
+
+function hideLoading() {
+    document.getElementById("loginBtn").classList.remove("d-none");
+    document.getElementById("loadingState").classList.add("d-none");
+}
+
+function showDomainError() {
+    const domainErrorDiv = document.getElementById("domainError");
+    const currentDomainCode = document.getElementById("currentDomain");
+
+    // Get current domain
+    currentDomainCode.textContent = window.location.hostname;
+    domainErrorDiv.classList.remove("d-none");
+}
+
+function showError(message) {
+    const errorDiv = document.createElement("div");
+    errorDiv.className = "alert alert-danger mt-3";
+    errorDiv.textContent = message;
+    document.querySelector(".card-body").appendChild(errorDiv);
+
+    setTimeout(() => {
+        errorDiv.remove();
+    }, 5000);
+}
@@ -1,297 +1,662 @@
+import copy
+import heapq
+import itertools
 import logging
+import random
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from instrumentation import span
+from plan_cache import PLAN_CACHE
+from prereq_graph import INDIRECT_PENALTY_WEIGHT
+from scheduler import DEFAULT_DAILY_TIME_LIMITS, GreedyScheduler
+from topic_catalog import CATALOG, TOPICS_INFO as _TOPICS_INFO, PRACTICE_PROBLEMS as _PRACTICE_PROBLEMS
+
+# Read-only views of the shared catalog data
+TOPICS_INFO = MappingProxyType(_TOPICS_INFO)
+PRACTICE_PROBLEMS = MappingProxyType(_PRACTICE_PROBLEMS)
+
+STUDY_APPROACHES = {
+    1: "Start with basic concepts and simple examples. Focus on understanding fundamentals.",
+    2: "Review theory briefly, then practice basic problems. Build confidence with easy exercises.",
+    3: "Quick theory review, then focus on medium-difficulty problems. Work on pattern recognition.",
+    4: "Minimal theory review. Focus on challenging problems and optimization techniques.",
+    5: "Practice advanced problems and edge cases. Focus on interview-level questions."
+}
+
+# Long-horizon plans: supported lengths in days
+HORIZONS = (30, 60, 90)
+# Days after studying a topic (then after each revisit) that a weak topic
+# is revisited; skill 1 gets every revisit, skill 2 one fewer, and so on
+REVIEW_INTERVALS = (1, 3, 7, 14, 30)
+REVIEW_MAX_SKILL = 3
+# Hours and problems per revisit
+REVIEW_HOURS = 1
+REVIEW_PROBLEMS = 2
+REVIEW_APPROACH = "Re-solve these problems without notes, then review any you could not finish."
+
+# How prerequisites count against a topic's priority: 'direct' looks only at
+# a topic's own prerequisites, 'transitive' also at theirs, at any depth
+PREREQUISITE_MODES = ('direct', 'transitive')
 
 class StudyPlanGenerator:
     """
-    Generates personalized 7-day DSA study plans using greedy algorithms.
+    Generates personalized DSA study plans (7 days by default) using greedy algorithms.
     Prioritizes topics with lower skill ratings for more focused learning.
+    Day assignment is delegated to a pluggable Scheduler.
     """
     
-    def __init__(self):
-        # DSA topics with estimated study time (in hours) and prerequisites
-        self.topics_info = {
-            'Arrays': {'time': 2, 'difficulty': 1, 'prerequisites': []},
-            'Strings': {'time': 2, 'difficulty': 1, 'prerequisites': []},
-            'Linked Lists': {'time': 3, 'difficulty': 2, 'prerequisites': []},
-            'Stacks': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
-            'Queues': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
-            'Hash Tables': {'time': 3, 'difficulty': 2, 'prerequisites': ['Arrays']},
-            'Binary Trees': {'time': 4, 'difficulty': 3, 'prerequisites': ['Linked Lists']},
-            'Binary Search Trees': {'time': 3, 'difficulty': 3, 'prerequisites': ['Binary Trees']},
-            'Heaps': {'time': 3, 'difficulty': 3, 'prerequisites': ['Binary Trees']},
-            'Graphs': {'time': 5, 'difficulty': 4, 'prerequisites': ['Hash Tables']},
-            'Dynamic Programming': {'time': 6, 'difficulty': 5, 'prerequisites': ['Arrays', 'Strings']},
-            'Greedy Algorithms': {'time': 4, 'difficulty': 4, 'prerequisites': ['Arrays']},
-            'Backtracking': {'time': 4, 'difficulty': 4, 'prerequisites': ['Arrays', 'Strings']},
-            'Sorting Algorithms': {'time': 3, 'difficulty': 2, 'prerequisites': ['Arrays']},
-            'Searching Algorithms': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
-            'Two Pointers': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
-            'Sliding Window': {'time': 3, 'difficulty': 3, 'prerequisites': ['Arrays', 'Two Pointers']},
-            'Bit Manipulation': {'time': 2, 'difficulty': 3, 'prerequisites': []},
-            'Trie': {'time': 3, 'difficulty': 3, 'prerequisites': ['Strings', 'Binary Trees']},
-            'Union Find': {'time': 3, 'difficulty': 3, 'prerequisites': ['Arrays']},
-        }
-        
-        # Practice problems for each topic
-        self.practice_problems = {
-            'Arrays': [
-                'Two Sum', 'Best Time to Buy and Sell Stock', 'Contains Duplicate',
-                'Product of Array Except Self', 'Maximum Subarray'
-            ],
-            'Strings': [
-                'Valid Anagram', 'Valid Palindrome', 'Longest Common Prefix',
-                'String to Integer (atoi)', 'Implement strStr()'
-            ],
-            'Linked Lists': [
-                'Reverse Linked List', 'Merge Two Sorted Lists', 'Linked List Cycle',
-                'Remove Nth Node From End', 'Intersection of Two Linked Lists'
-            ],
-            'Stacks': [
-                'Valid Parentheses', 'Min Stack', 'Evaluate Reverse Polish Notation',
-                'Daily Temperatures', 'Next Greater Element'
-            ],
-            'Queues': [
-                'Implement Queue using Stacks', 'Moving Average from Data Stream',
-                'Design Circular Queue', 'Number of Islands (BFS)', 'Perfect Squares'
-            ],
-            'Hash Tables': [
-                'Two Sum', 'Group Anagrams', 'Top K Frequent Elements',
-                'Subarray Sum Equals K', 'Longest Substring Without Repeating Characters'
-            ],
-            'Binary Trees': [
-                'Maximum Depth of Binary Tree', 'Same Tree', 'Invert Binary Tree',
-                'Binary Tree Level Order Traversal', 'Path Sum'
-            ],
-            'Binary Search Trees': [
-                'Validate Binary Search Tree', 'Lowest Common Ancestor of BST',
-                'Convert Sorted Array to BST', 'Kth Smallest Element in BST', 'Range Sum of BST'
-            ],
-            'Heaps': [
-                'Kth Largest Element in Array', 'Merge k Sorted Lists', 'Top K Frequent Elements',
-                'Find Median from Data Stream', 'Last Stone Weight'
-            ],
-            'Graphs': [
-                'Number of Islands', 'Clone Graph', 'Course Schedule',
-                'Pacific Atlantic Water Flow', 'Alien Dictionary'
-            ],
-            'Dynamic Programming': [
-                'Climbing Stairs', 'House Robber', 'Coin Change',
-                'Longest Increasing Subsequence', 'Edit Distance'
-            ],
-            'Greedy Algorithms': [
-                'Jump Game', 'Gas Station', 'Partition Labels',
-                'Non-overlapping Intervals', 'Minimum Number of Arrows'
-            ],
-            'Backtracking': [
-                'Permutations', 'Subsets', 'Combination Sum',
-                'N-Queens', 'Word Search'
-            ],
-            'Sorting Algorithms': [
-                'Sort Colors', 'Merge Intervals', 'Largest Number',
-                'Meeting Rooms II', 'Kth Largest Element'
-            ],
-            'Searching Algorithms': [
-                'Binary Search', 'Search in Rotated Sorted Array', 'Find First and Last Position',
-                'Search a 2D Matrix', 'Find Peak Element'
-            ],
-            'Two Pointers': [
-                'Two Sum II', 'Three Sum', 'Container With Most Water',
-                'Remove Duplicates from Sorted Array', 'Trapping Rain Water'
-            ],
-            'Sliding Window': [
-                'Maximum Subarray', 'Minimum Window Substring', 'Longest Substring Without Repeating',
-                'Permutation in String', 'Sliding Window Maximum'
-            ],
-            'Bit Manipulation': [
-                'Single Number', 'Number of 1 Bits', 'Counting Bits',
-                'Missing Number', 'Reverse Bits'
-            ],
-            'Trie': [
-                'Implement Trie', 'Word Search II', 'Add and Search Word',
-                'Replace Words', 'Map Sum Pairs'
-            ],
-            'Union Find': [
-                'Number of Islands', 'Friend Circles', 'Redundant Connection',
-                'Accounts Merge', 'Most Stones Removed'
-            ]
-        }
+    def __init__(self, catalog=None, plan_cache=PLAN_CACHE, scheduler=None, daily_time_limits=None,
+                 prerequisites='direct'):
+        # The compiled catalog is built once per process and shared, so a
+        # generator is a cheap view over it
+        self.catalog = catalog or CATALOG
+        # Plans for identical ratings are reused; the shared cache is keyed on
+        # ratings only, so it is skipped for custom catalogs. Pass None to disable
+        self.plan_cache = plan_cache if catalog is None else None
+        # Hours available on each day; the plan lasts one day per entry
+        self.scheduler = scheduler or GreedyScheduler()
+        self.daily_time_limits = tuple(daily_time_limits or DEFAULT_DAILY_TIME_LIMITS)
+        if prerequisites not in PREREQUISITE_MODES:
+            raise ValueError(f"prerequisites must be one of: {', '.join(PREREQUISITE_MODES)}")
+        # Transitive plans also list the weak topics in unlock order
+        self.prerequisites = prerequisites
+        self.topics_info = TOPICS_INFO
+        self.practice_problems = PRACTICE_PROBLEMS
     
     def generate_plan(self, user_ratings):
         """
-        Generate a 7-day study plan using greedy algorithm.
+        Generate a study plan using greedy algorithm.
         Prioritizes topics with lower skill ratings.
         
         Args:
             user_ratings: dict mapping topic names to skill levels (1-5)
         
         Returns:
-            dict: 7-day study plan with daily recommendations
+            dict: study plan with daily recommendations, one day per daily time limit
+        """
+        cache_key = None
+        if self.plan_cache is not None:
+            cache_key = self.plan_cache.key(user_ratings, self.scheduler.cache_key(), self.daily_time_limits,
+                                            self.prerequisites)
+        template = self.plan_cache.get(cache_key) if cache_key else None
+        
+        if template is None:
+            logging.debug("Generating study plan for ratings: %s", user_ratings)
+            
+            # Calculate priority scores using greedy approach
+            with span('calculate_priorities'):
+                topic_priorities = self._calculate_priorities(user_ratings)
+            
+            # Distribute topics across the plan's days
+            with span('distribute_topics'):
+                daily_plan = self._distribute_topics(topic_priorities)
+            
+            # Build the date-independent plan; dates are filled in per call
+            with span('create_detailed_plan'):
+                template = self._build_plan_template(daily_plan, user_ratings)
+            if cache_key:
+                self.plan_cache.put(cache_key, template)
+        
+        with span('stamp_dates'):
+            return self._stamp_dates(template)
+    
+    def update_plan(self, previous_plan, ratings_diff):
+        """
+        Incrementally update a plan after some ratings changed.
+        Only the changed topics and the topics that list them as
+        prerequisites are re-scored and re-placed; every other topic keeps
+        its day and details. A plan whose first day has already passed is
+        re-dated to start today.
+        
+        Args:
+            previous_plan: plan dict returned by generate_plan or update_plan
+            ratings_diff: dict mapping topic names to new skill levels, or
+                None for topics whose rating was removed
+        
+        Returns:
+            dict: the updated plan, or None when a full regeneration is
+            needed: the previous plan was built with other generator options
+            (scheduler, prerequisite mode or daily hours), or before plans
+            recorded them
+        """
+        schedule = previous_plan.get('daily_schedule', {})
+        if (len(schedule) != len(self.daily_time_limits)
+                or previous_plan.get('generator_options') != self.plan_options()):
+            return None
+        
+        catalog = self.catalog
+        user_ratings = self.plan_ratings(previous_plan)
+        
+        # Changed topics plus the dependents whose prerequisite penalty
+        # depends on the changed ratings: direct ones, or all in transitive mode
+        transitive = self.prerequisites == 'transitive'
+        affected = set()
+        total_topics = previous_plan.get('total_topics', len(user_ratings))
+        for topic, skill_level in ratings_diff.items():
+            previous_level = user_ratings.get(topic)
+            if previous_level == skill_level:
+                continue
+            if skill_level is None:
+                del user_ratings[topic]
+                total_topics -= 1
+            else:
+                if previous_level is None:
+                    total_topics += 1
+                user_ratings[topic] = skill_level
+            affected.add(topic)
+            topic_id = catalog.ids.get(topic)
+            if topic_id is None:
+                continue
+            if transitive:
+                descendants = catalog.graph.descendants[topic_id]
+                affected.update(name for i, name in enumerate(catalog.names) if descendants >> i & 1)
+            else:
+                affected.update(catalog.names[i] for i in catalog.dependent_ids[topic_id])
+        
+        if not affected:
+            return previous_plan
+        
+        # Keep unaffected topics where they are
+        days = []
+        kept_details = {}
+        for day in schedule.values():
+            kept = []
+            for topic in day['topics']:
+                if topic['name'] not in affected:
+                    kept.append(self._topic_info_from_details(topic))
+                    kept_details[topic['name']] = topic
+            days.append(kept)
+        deferred = []
+        for topic in previous_plan.get('deferred_topics', []):
+            if topic['name'] not in affected:
+                deferred.append(self._topic_info_from_details(topic))
+                kept_details[topic['name']] = topic
+        
+        # Re-score the affected topics that are still rated and repair locally
+        rescored = self._calculate_priorities(user_ratings, [t for t in user_ratings if t in affected])
+        days, deferred = self.scheduler.repair(days, deferred, rescored, self.daily_time_limits, catalog)
+        
+        updated = {key: value for key, value in previous_plan.items()
+                   if key not in ('daily_schedule', 'deferred_topics', 'unlock_order')}
+        updated['total_topics'] = total_topics
+        updated['updated_at'] = datetime.now().isoformat()
+        updated['daily_schedule'] = {}
+        # Problems are reassigned in plan order, as a full build would, so
+        # no problem repeats and stored compact plans rebuild identically
+        used_problems = set()
+        day_stamps = self._current_day_stamps(schedule)
+        for (day_key, previous_day), topics in zip(schedule.items(), days):
+            if day_stamps:
+                date_text, day_name = day_stamps[int(day_key.split('_')[1]) - 1]
+            else:
+                date_text, day_name = previous_day.get('date'), previous_day.get('day_name')
+            day_details = {
+                'date': date_text,
+                'day_name': day_name,
+                'topics': [],
+                'total_time': 0,
+                'focus_areas': []
+            }
+            for topic_info in topics:
+                day_details['topics'].append(self._updated_details(topic_info, kept_details, used_problems))
+                day_details['total_time'] += topic_info['estimated_time']
+                if topic_info['skill_level'] <= 2:
+                    day_details['focus_areas'].append(topic_info['topic'])
+            updated['daily_schedule'][day_key] = day_details
+        if deferred:
+            updated['deferred_topics'] = [self._updated_details(t, kept_details, used_problems) for t in deferred]
+        if transitive:
+            updated['unlock_order'] = self._unlock_order(user_ratings)
+        
+        return updated
+    
+    def _current_day_stamps(self, schedule):
+        """
+        Day stamps starting today when the schedule's first day is in the
+        past, or None when its dates can be kept
+        """
+        first_date = next(iter(schedule.values()), {}).get('date')
+        today = datetime.now()
+        # ISO dates compare in calendar order as strings
+        if first_date and first_date < today.strftime('%Y-%m-%d'):
+            return self._day_stamps(today, len(schedule))
+        return None
+    
+    def _updated_details(self, topic_info, kept_details, used_problems):
+        """Details for a topic in an updated plan, reusing the previous entry if kept"""
+        details = kept_details.get(topic_info['topic'])
+        if details is None:
+            return self._topic_details(topic_info, used_problems)
+        details = dict(details)
+        details['recommended_problems'] = self._select_problems(
+            details['name'], details['current_skill_level'], used_problems)
+        return details
+    
+    def plan_options(self):
+        """The options a plan from this generator was built with, as stored in the plan"""
+        return {
+            'scheduler': list(self.scheduler.cache_key()),
+            'prerequisites': self.prerequisites,
+            'daily_hours': list(self.daily_time_limits),
+        }
+    
+    @staticmethod
+    def plan_ratings(plan):
+        """Skill levels a plan was built from, for the topics it contains"""
+        topics = [topic for day in plan.get('daily_schedule', {}).values() for topic in day['topics']]
+        topics += plan.get('deferred_topics', [])
+        return {topic['name']: topic['current_skill_level'] for topic in topics}
+    
+    @staticmethod
+    def _topic_info_from_details(topic):
+        """Scheduler-facing topic info for a topic already in a detailed plan"""
+        return {
+            'topic': topic['name'],
+            'priority': topic['priority_score'],
+            'skill_level': topic['current_skill_level'],
+            'estimated_time': topic['estimated_time']
+        }
+    
+    def iter_horizon_days(self, user_ratings, horizon_days, seed, start_date, from_day=1, count=None):
+        """
+        Lazily generate the days of a long-horizon (30/60/90-day) plan.
+        New topics are taken in priority order, first fit into each day's
+        hours (daily time limits repeat as a weekly pattern), and weak topics
+        come back for short spaced-repetition revisits before any new work.
+        The schedule depends only on the arguments, so any window can be
+        recomputed from a stored header; only the days from `from_day`
+        (1-based) for `count` days are built as detailed dicts.
+        
+        Yields:
+            dict: day details with 'day', 'date', 'day_name', 'topics',
+            'total_time' and 'focus_areas'; topics carry a 'session' of
+            'study' or 'review'
+        """
+        last_day = horizon_days if count is None else min(horizon_days, from_day + count - 1)
+        used_problems = set()
+        studied_problems = {}
+        
+        days = self._horizon_sessions(user_ratings, horizon_days, seed)
+        for day_num, sessions in enumerate(itertools.islice(days, last_day), 1):
+            # Earlier days only advance the problem bookkeeping
+            if day_num < from_day:
+                for topic_info, review in sessions:
+                    if not review:
+                        studied_problems[topic_info['topic']] = self._select_problems(
+                            topic_info['topic'], topic_info['skill_level'], used_problems)
+                continue
+            
+            current_date = start_date + timedelta(days=day_num - 1)
+            day_details = {
+                'day': day_num,
+                'date': current_date.strftime('%Y-%m-%d'),
+                'day_name': current_date.strftime('%A'),
+                'topics': [],
+                'total_time': 0,
+                'focus_areas': []
+            }
+            for topic_info, review in sessions:
+                if review:
+                    details = self._review_details(topic_info, review, studied_problems)
+                else:
+                    details = self._topic_details(topic_info, used_problems)
+                    details['session'] = 'study'
+                    studied_problems[topic_info['topic']] = details['recommended_problems']
+                    if topic_info['skill_level'] <= 2:
+                        day_details['focus_areas'].append(topic_info['topic'])
+                day_details['topics'].append(details)
+                day_details['total_time'] += details['estimated_time']
+            yield day_details
+    
+    def _horizon_sessions(self, user_ratings, horizon_days, seed):
+        """
+        Yield each day's sessions as (topic_info, review) pairs, review being
+        0 for first study or the revisit number. The seed only jitters longer
+        revisit intervals by a day so revisits of topics studied together
+        spread out.
+        """
+        rng = random.Random(seed)
+        limits = self.daily_time_limits
+        largest_day = max(limits)
+        pending = self._calculate_priorities(user_ratings)
+        revisits = []  # heap of (due day, sequence, revisit number, topic info)
+        sequence = itertools.count()
+        
+        def schedule_revisit(topic_info, review, day):
+            if review > len(REVIEW_INTERVALS) + 1 - topic_info['skill_level']:
+                return
+            interval = REVIEW_INTERVALS[review - 1]
+            due = day + interval + (rng.randint(-1, 1) if interval >= 7 else 0)
+            if due < horizon_days:
+                heapq.heappush(revisits, (due, next(sequence), review, topic_info))
+        
+        for day in range(horizon_days):
+            available = limits[day % len(limits)]
+            sessions = []
+            
+            # Due revisits first; those that do not fit wait for the next day
+            while revisits and revisits[0][0] <= day and available >= REVIEW_HOURS:
+                _, _, review, topic_info = heapq.heappop(revisits)
+                sessions.append((topic_info, review))
+                available -= REVIEW_HOURS
+                schedule_revisit(topic_info, review + 1, day)
+            
+            # Then new topics, first fit in priority order; a topic longer
+            # than any day gets a day of its own
+            i = 0
+            while i < len(pending) and available > 0:
+                topic_info = pending[i]
+                if topic_info['estimated_time'] <= available or (
+                        not sessions and topic_info['estimated_time'] > largest_day):
+                    del pending[i]
+                    sessions.append((topic_info, 0))
+                    available -= topic_info['estimated_time']
+                    if topic_info['skill_level'] <= REVIEW_MAX_SKILL:
+                        schedule_revisit(topic_info, 1, day)
+                else:
+                    i += 1
+            
+            yield sessions
+    
+    def _review_details(self, topic_info, review, studied_problems):
+        """Detailed entry for a spaced-repetition revisit of a studied topic"""
+        topic_name = topic_info['topic']
+        problems = studied_problems.get(topic_name) or self._select_problems(topic_name, topic_info['skill_level'])
+        # Each revisit rotates through the problems recommended when studied
+        start = (review - 1) * REVIEW_PROBLEMS
+        recommended = [problems[(start + i) % len(problems)]
+                       for i in range(min(REVIEW_PROBLEMS, len(problems)))]
+        return {
+            'name': topic_name,
+            'current_skill_level': topic_info['skill_level'],
+            'estimated_time': REVIEW_HOURS,
+            'priority_score': round(topic_info['priority'], 2),
+            'session': 'review',
+            'review_number': review,
+            'recommended_problems': recommended,
+            'study_approach': REVIEW_APPROACH,
+            'resources': self._get_study_resources(topic_name)
+        }
+    
+    def generate_plans(self, batch_of_ratings):
+        """
+        Generate study plans for a whole cohort at once.
+        Priority scoring runs as NumPy matrix operations over a
+        users x topics ratings matrix, dates are formatted once for the
+        batch and users with identical ratings share one template; the
+        results match generate_plan for every user.
+        
+        Args:
+            batch_of_ratings: iterable of dicts mapping topic names to skill levels (1-5)
+        
+        Returns:
+            list: one study plan per ratings dict, in input order
         """
-        logging.info(f"Generating study plan for ratings: {user_ratings}")
+        batch = list(batch_of_ratings)
+        # One conversion to Python floats instead of per-row NumPy indexing
+        priority_rows = self._calculate_priority_matrix(batch).tolist()
+        logging.info("Generating %d study plans in batch", len(batch))
         
-        # Calculate priority scores using greedy approach
-        topic_priorities = self._calculate_priorities(user_ratings)
+        start_date = datetime.now()
+        day_stamps = self._day_stamps(start_date, len(self.daily_time_limits))
+        templates = {}
+        plans = []
+        for row, user_ratings in zip(priority_rows, batch):
+            ratings_key = tuple(user_ratings.items())
+            template = templates.get(ratings_key)
+            if template is None:
+                topic_priorities = self._priorities_from_row(row, user_ratings)
+                daily_plan = self._distribute_topics(topic_priorities)
+                template = templates[ratings_key] = self._build_plan_template(daily_plan, user_ratings)
+            plans.append(self._stamp_dates(template, start_date, day_stamps))
         
-        # Distribute topics across 7 days
-        daily_plan = self._distribute_topics(topic_priorities)
+        return plans
+    
+    def _calculate_priority_matrix(self, batch):
+        """
+        Vectorized _calculate_priorities for many users.
+        Returns a users x topics float matrix; unrated cells are meaningless.
+        """
+        import numpy as np
+        
+        catalog = self.catalog
+        ratings = np.zeros((len(batch), len(catalog)))
+        rated = np.zeros((len(batch), len(catalog)), dtype=bool)
+        for row, user_ratings in enumerate(batch):
+            for topic, skill_level in user_ratings.items():
+                topic_id = catalog.ids.get(topic)
+                if topic_id is not None:
+                    ratings[row, topic_id] = skill_level
+                    rated[row, topic_id] = True
         
-        # Generate detailed study plan
-        study_plan = self._create_detailed_plan(daily_plan, user_ratings)
+        # Penalty each topic contributes when it is someone's prerequisite:
+        # (3 - skill) * 0.5 below skill 3, 2 when the prerequisite is unrated,
+        # weighted down for indirect prerequisites in transitive mode
+        prereq_cost = np.where(rated, np.clip(3 - ratings, 0, None) * 0.5, 2.0)
+        prereq_penalty = prereq_cost @ self._prereq_matrix().T
+        # Prerequisites outside the catalog can never be rated
+        prereq_penalty += 2.0 * np.array([
+            len(names) - len(ids) for names, ids in zip(catalog.prereq_names, catalog.prereq_ids)
+        ])
+        
+        return ((6 - ratings) + np.asarray(catalog.difficulty_bonus)
+                + np.asarray(catalog.time_factor) - prereq_penalty)
+    
+    def _prereq_matrix(self):
+        """Topics x topics matrix of prerequisite weights"""
+        import numpy as np
         
-        return study_plan
+        catalog = self.catalog
+        matrix = np.zeros((len(catalog), len(catalog)))
+        for topic_id, prereq_ids in enumerate(catalog.prereq_ids):
+            for prereq_id in prereq_ids:
+                matrix[topic_id, prereq_id] += 1
+        if self.prerequisites == 'transitive':
+            graph = catalog.graph
+            for topic_id, ancestors in enumerate(graph.ancestors):
+                indirect = ancestors & ~graph.prereq_masks[topic_id]
+                for prereq_id in range(indirect.bit_length()):
+                    if indirect >> prereq_id & 1:
+                        matrix[topic_id, prereq_id] += INDIRECT_PENALTY_WEIGHT
+        return matrix
+    
+    def _priorities_from_row(self, row, user_ratings):
+        """Build the sorted priority list for one user from a priority matrix row (a list)"""
+        catalog = self.catalog
+        priorities = [
+            {
+                'topic': catalog.names[topic_id],
+                'priority': row[topic_id],
+                'skill_level': user_ratings[catalog.names[topic_id]],
+                'estimated_time': catalog.time[topic_id]
+            }
+            for topic_id in self._rated_ids(user_ratings)
+        ]
+        # Same stable sort as _calculate_priorities, so ties break in catalog order
+        priorities.sort(key=lambda x: x['priority'], reverse=True)
+        return priorities
     
-    def _calculate_priorities(self, user_ratings):
+    def _calculate_priorities(self, user_ratings, topics=None):
         """
         Calculate priority scores for topics using greedy algorithm.
         Lower skill rating = higher priority.
+        Only `topics` are scored when given; prerequisites are still looked
+        up in the full ratings. Topics are scored in catalog order, so equal
+        priorities break the same way whatever order the ratings came in.
         """
         priorities = []
+        catalog = self.catalog
+        # Every topic's prerequisite penalty, in one pass over the graph
+        penalties = catalog.graph.penalties(user_ratings, transitive=self.prerequisites == 'transitive')
         
-        for topic, skill_level in user_ratings.items():
-            if topic in self.topics_info:
-                # Greedy priority: inverse of skill level + difficulty factor
-                base_priority = (6 - skill_level)  # Higher score for lower skill
-                difficulty_bonus = self.topics_info[topic]['difficulty'] * 0.5
-                time_factor = self.topics_info[topic]['time'] / 10  # Normalize time
-                
-                # Check if prerequisites are met
-                prereq_penalty = self._calculate_prereq_penalty(topic, user_ratings)
-                
-                final_priority = base_priority + difficulty_bonus + time_factor - prereq_penalty
-                
-                priorities.append({
-                    'topic': topic,
-                    'priority': final_priority,
-                    'skill_level': skill_level,
-                    'estimated_time': self.topics_info[topic]['time']
-                })
+        for topic_id in self._rated_ids(user_ratings if topics is None else topics):
+            topic = catalog.names[topic_id]
+            skill_level = user_ratings[topic]
+            # Greedy priority: inverse of skill level + difficulty factor
+            base_priority = (6 - skill_level)  # Higher score for lower skill
+            difficulty_bonus = catalog.difficulty_bonus[topic_id]
+            time_factor = catalog.time_factor[topic_id]  # Normalized time
+            
+            # Check if prerequisites are met
+            prereq_penalty = penalties[topic_id]
+            
+            final_priority = base_priority + difficulty_bonus + time_factor - prereq_penalty
+            
+            priorities.append({
+                'topic': topic,
+                'priority': final_priority,
+                'skill_level': skill_level,
+                'estimated_time': catalog.time[topic_id]
+            })
         
         # Sort by priority (descending - highest priority first)
         priorities.sort(key=lambda x: x['priority'], reverse=True)
-        logging.info(f"Topic priorities calculated: {[(p['topic'], p['priority']) for p in priorities]}")
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug("Topic priorities calculated: %s", [(p['topic'], p['priority']) for p in priorities])
         
         return priorities
     
-    def _calculate_prereq_penalty(self, topic, user_ratings):
-        """Calculate penalty if prerequisites are not well understood"""
-        prereqs = self.topics_info[topic]['prerequisites']
-        penalty = 0
-        
-        for prereq in prereqs:
-            if prereq in user_ratings:
-                # Penalty if prerequisite skill is low
-                if user_ratings[prereq] < 3:
-                    penalty += (3 - user_ratings[prereq]) * 0.5
-            else:
-                # Higher penalty if prerequisite not rated (unknown)
-                penalty += 2
-        
-        return penalty
+    def _rated_ids(self, topics):
+        """Catalog ids of the given topic names, in catalog order"""
+        ids = self.catalog.ids
+        return sorted(ids[topic] for topic in topics if topic in ids)
+    
+    def _unlock_order(self, user_ratings):
+        """Rated topics below skill 3, each after the weak prerequisites it builds on"""
+        return self.catalog.graph.unlock_order(user_ratings, user_ratings)
     
     def _distribute_topics(self, topic_priorities):
-        """Distribute topics across 7 days with time constraints"""
-        daily_plan = {f'day_{i+1}': [] for i in range(7)}
-        daily_time_limits = [3, 3, 4, 4, 4, 3, 2]  # Hours per day
-        daily_time_used = [0] * 7
-        
-        for topic_info in topic_priorities:
-            # Find the best day for this topic (greedy approach)
-            best_day = -1
-            for day in range(7):
-                if daily_time_used[day] + topic_info['estimated_time'] <= daily_time_limits[day]:
-                    best_day = day
-                    break
-            
-            if best_day != -1:
-                daily_plan[f'day_{best_day + 1}'].append(topic_info)
-                daily_time_used[best_day] += topic_info['estimated_time']
-            else:
-                # If no day has enough time, add to day with most available time
-                best_day = daily_time_used.index(min(daily_time_used))
-                daily_plan[f'day_{best_day + 1}'].append(topic_info)
-                daily_time_used[best_day] += topic_info['estimated_time']
+        """
+        Distribute topics across the plan's days with time constraints.
+        Topics the scheduler could not place are listed under 'deferred'.
+        """
+        days, deferred = self.scheduler.schedule(topic_priorities, self.daily_time_limits, self.catalog)
+        daily_plan = {f'day_{i+1}': topics for i, topics in enumerate(days)}
+        if deferred:
+            daily_plan['deferred'] = deferred
         
         return daily_plan
     
     def _create_detailed_plan(self, daily_plan, user_ratings):
         """Create detailed study plan with problems and time estimates"""
-        detailed_plan = {
-            'generated_at': datetime.now().isoformat(),
+        return self._stamp_dates(self._build_plan_template(daily_plan, user_ratings))
+    
+    def _build_plan_template(self, daily_plan, user_ratings):
+        """Build the date-independent part of the detailed plan"""
+        template = {
             'total_topics': len(user_ratings),
-            'plan_duration': '7 days',
+            'plan_duration': f'{len(self.daily_time_limits)} days',
+            'generator_options': self.plan_options(),
             'daily_schedule': {}
         }
-        
-        start_date = datetime.now()
+        # Keys of problems already recommended, so none repeats in the plan
+        used_problems = set()
         
         for day_key, topics in daily_plan.items():
-            day_num = int(day_key.split('_')[1])
-            current_date = start_date + timedelta(days=day_num - 1)
+            if day_key == 'deferred':
+                template['deferred_topics'] = [self._topic_details(topic_info, used_problems) for topic_info in topics]
+                continue
             
             day_details = {
-                'date': current_date.strftime('%Y-%m-%d'),
-                'day_name': current_date.strftime('%A'),
                 'topics': [],
                 'total_time': 0,
                 'focus_areas': []
             }
             
             for topic_info in topics:
-                topic_name = topic_info['topic']
-                skill_level = topic_info['skill_level']
-                
-                # Select appropriate problems based on skill level
-                problems = self._select_problems(topic_name, skill_level)
-                
-                topic_details = {
-                    'name': topic_name,
-                    'current_skill_level': skill_level,
-                    'estimated_time': topic_info['estimated_time'],
-                    'priority_score': round(topic_info['priority'], 2),
-                    'recommended_problems': problems,
-                    'study_approach': self._get_study_approach(topic_name, skill_level),
-                    'resources': self._get_study_resources(topic_name)
-                }
-                
-                day_details['topics'].append(topic_details)
+                day_details['topics'].append(self._topic_details(topic_info, used_problems))
                 day_details['total_time'] += topic_info['estimated_time']
                 
                 # Add to focus areas if low skill level
-                if skill_level <= 2:
-                    day_details['focus_areas'].append(topic_name)
+                if topic_info['skill_level'] <= 2:
+                    day_details['focus_areas'].append(topic_info['topic'])
+            
+            template['daily_schedule'][day_key] = day_details
+        
+        if self.prerequisites == 'transitive':
+            template['unlock_order'] = self._unlock_order(user_ratings)
+        return template
+    
+    def _topic_details(self, topic_info, used_problems=None):
+        """Detailed entry for one scheduled topic"""
+        topic_name = topic_info['topic']
+        skill_level = topic_info['skill_level']
+        
+        return {
+            'name': topic_name,
+            'current_skill_level': skill_level,
+            'estimated_time': topic_info['estimated_time'],
+            'priority_score': round(topic_info['priority'], 2),
+            # Select appropriate problems based on skill level
+            'recommended_problems': self._select_problems(topic_name, skill_level, used_problems),
+            'study_approach': self._get_study_approach(topic_name, skill_level),
+            'resources': self._get_study_resources(topic_name)
+        }
+    
+    @staticmethod
+    def _day_stamps(start_date, days):
+        """(date, day_name) strings for each day of a plan starting at start_date"""
+        stamps = []
+        for day in range(days):
+            current_date = start_date + timedelta(days=day)
+            stamps.append((current_date.strftime('%Y-%m-%d'), current_date.strftime('%A')))
+        return stamps
+    
+    def _stamp_dates(self, template, start_date=None, day_stamps=None):
+        """
+        Fill in generated_at and per-day date/day_name on a plan template.
+        Returns a new plan; the template is left untouched so it can be cached.
+        `day_stamps` from _day_stamps(start_date, ...) can be shared across plans.
+        """
+        start_date = start_date or datetime.now()
+        if day_stamps is None:
+            day_stamps = self._day_stamps(start_date, len(template['daily_schedule']))
+        detailed_plan = {'generated_at': start_date.isoformat()}
+        detailed_plan.update((key, value) for key, value in template.items() if key != 'daily_schedule')
+        if 'deferred_topics' in template:
+            detailed_plan['deferred_topics'] = [dict(topic) for topic in template['deferred_topics']]
+        if 'unlock_order' in template:
+            detailed_plan['unlock_order'] = list(template['unlock_order'])
+        if 'generator_options' in template:
+            detailed_plan['generator_options'] = copy.deepcopy(template['generator_options'])
+        detailed_plan['daily_schedule'] = {}
+        
+        for day_key, day in template['daily_schedule'].items():
+            day_num = int(day_key.split('_')[1])
+            date_text, day_name = day_stamps[day_num - 1]
             
-            detailed_plan['daily_schedule'][day_key] = day_details
+            detailed_plan['daily_schedule'][day_key] = {
+                'date': date_text,
+                'day_name': day_name,
+                'topics': [dict(topic) for topic in day['topics']],
+                'total_time': day['total_time'],
+                'focus_areas': list(day['focus_areas'])
+            }
         
         return detailed_plan
     
-    def _select_problems(self, topic, skill_level):
-        """Select appropriate problems based on skill level"""
-        if topic not in self.practice_problems:
+    def _select_problems(self, topic, skill_level, used_problems=None):
+        """
+        Select appropriate problems based on skill level, skipping problems
+        whose keys are in `used_problems` (updated with the selection)
+        """
+        topic_id = self.catalog.ids.get(topic)
+        if topic_id is None:
             return []
         
-        all_problems = self.practice_problems[topic]
-        
-        # Select problems based on skill level
-        if skill_level <= 2:  # Beginner
-            return all_problems[:3]  # Easy problems
-        elif skill_level <= 3:  # Intermediate
-            return all_problems[:4]  # Mix of easy and medium
-        else:  # Advanced
-            return all_problems  # All problems including hard ones
+        # Tiers are pre-sliced: beginner gets easy problems, intermediate a
+        # mix of easy and medium, advanced all problems including hard ones
+        return self.catalog.select_problems(topic_id, skill_level, used_problems)
     
     def _get_study_approach(self, topic, skill_level):
         """Get recommended study approach based on skill level"""
-        approaches = {
-            1: "Start with basic concepts and simple examples. Focus on understanding fundamentals.",
-            2: "Review theory briefly, then practice basic problems. Build confidence with easy exercises.",
-            3: "Quick theory review, then focus on medium-difficulty problems. Work on pattern recognition.",
-            4: "Minimal theory review. Focus on challenging problems and optimization techniques.",
-            5: "Practice advanced problems and edge cases. Focus on interview-level questions."
-        }
-        return approaches.get(skill_level, approaches[3])
+        return STUDY_APPROACHES.get(skill_level, STUDY_APPROACHES[3])
     
     def _get_study_resources(self, topic):
         """Get recommended study resources for the topic"""
+        topic_id = self.catalog.ids.get(topic)
+        if topic_id is not None:
+            return dict(self.catalog.resources[topic_id])
         return {
             'theory': f"Review {topic} concepts and time complexity",
             'practice': f"LeetCode {topic} problems",
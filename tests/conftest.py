@@ -0,0 +1,65 @@
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# The app reads its configuration at import, so point it at a scratch
+# database (and switch off per-user throttling) before anything imports it
+_DB_DIR = tempfile.mkdtemp(prefix='prepmate-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_DB_DIR, 'primary.db')
+os.environ.pop('DATABASE_REPLICA_URL', None)
+os.environ['PLAN_RATE_LIMIT_PER_MINUTE'] = '0'
+os.environ['PLAN_COALESCE_SECONDS'] = '0'
+os.environ['LOG_QUEUE'] = '0'
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+# Models import the app, which imports the routes and with them the models,
+# so the app has to load first for test modules to import models directly
+import main  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = main.app
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def db(app):
+    """The app's database, emptied before each test"""
+    from app import db
+    from response_cache import user_data_cache
+    from token_cache import token_cache
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    user_data_cache.clear()
+    token_cache.clear()
+    return db
+
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(monkeypatch):
+    """Sign a test client in as a user named by its token, without Firebase"""
+    import routes
+
+    def verify_id_token(id_token, *args, **kwargs):
+        return {'uid': f'uid-{id_token}', 'email': f'{id_token}@example.com', 'name': id_token,
+                'exp': time.time() + 3600}
+
+    monkeypatch.setattr(routes, '_firebase_auth', SimpleNamespace(verify_id_token=verify_id_token))
+
+    def login(client, name='alice'):
+        response = client.post('/api/verify-token', json={'idToken': name})
+        assert response.status_code == 200
+        return response.json['user_id']
+    return login
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from study_plan_generator import StudyPlanGenerator
+
+
+def without_timestamp(plan):
+    return {key: value for key, value in plan.items() if key != 'generated_at'}
+
+
+def random_cohort(topics, users, seed):
+    rng = random.Random(seed)
+    cohort = [
+        {topic: rng.randint(1, 5) for topic in rng.sample(topics + ['Unknown Topic'], rng.randint(1, len(topics)))}
+        for _ in range(users)
+    ]
+    # Identical ratings share a template within a batch
+    return cohort + cohort[:10]
+
+
+@pytest.mark.parametrize('prerequisites', ['direct', 'transitive'])
+def test_batch_matches_single_user_plans(prerequisites):
+    generator = StudyPlanGenerator(plan_cache=None, prerequisites=prerequisites)
+    cohort = random_cohort(list(generator.topics_info), 300, seed=7)
+
+    batch = generator.generate_plans(cohort)
+
+    assert len(batch) == len(cohort)
+    for ratings, plan in zip(cohort, batch):
+        assert without_timestamp(plan) == without_timestamp(generator.generate_plan(ratings))
+
+
+def test_batch_scores_match_single_user_scores_exactly():
+    generator = StudyPlanGenerator(plan_cache=None)
+    cohort = random_cohort(list(generator.topics_info), 200, seed=11)
+
+    rows = generator._calculate_priority_matrix(cohort).tolist()
+
+    for row, ratings in zip(rows, cohort):
+        assert generator._priorities_from_row(row, ratings) == generator._calculate_priorities(ratings)
+
+
+def test_batch_plans_do_not_share_mutable_state():
+    generator = StudyPlanGenerator(plan_cache=None)
+    ratings = {'Arrays': 1, 'Strings': 2}
+
+    first, second = generator.generate_plans([ratings, dict(ratings)])
+    first['daily_schedule']['day_1']['topics'][0]['name'] = 'changed'
+
+    assert second['daily_schedule']['day_1']['topics'][0]['name'] != 'changed'
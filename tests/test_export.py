@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+import routes
+
+
+@pytest.fixture
+def admin(client, login, monkeypatch):
+    monkeypatch.setattr(routes, 'ADMIN_FIREBASE_UIDS', {'uid-admin'})
+    login(client, 'admin')
+    return client
+
+
+def save_ratings(client, login, name, ratings):
+    login(client, name)
+    assert client.post('/api/save-ratings', json={'ratings': ratings}).status_code == 200
+
+
+def test_export_streams_rows_after_id_up_to_limit(app, client, login, monkeypatch):
+    for name in ('alice', 'bob'):
+        save_ratings(client, login, name, {'Arrays': 2, 'Graphs': 4})
+    monkeypatch.setattr(routes, 'ADMIN_FIREBASE_UIDS', {'uid-admin'})
+    login(client, 'admin')
+
+    rows = [json.loads(line) for line in client.get('/api/admin/export/ratings').data.splitlines()]
+    assert len(rows) == 4
+
+    response = client.get(f"/api/admin/export/ratings?after_id={rows[0]['id']}&limit=2")
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.data.splitlines()] == rows[1:3]
+
+
+@pytest.mark.parametrize('limit', ['-1', 'ten', '1.5', ''])
+def test_export_rejects_a_limit_that_is_not_a_non_negative_integer(admin, limit):
+    response = admin.get(f'/api/admin/export/plans?limit={limit}')
+    assert response.status_code == 400
+    assert response.json == {'error': 'limit must be a non-negative integer'}
@@ -0,0 +1,65 @@
+import pytest
+
+from models import StudyPlan
+from singleflight import SingleFlight
+
+
+@pytest.fixture
+def lingering_flights(monkeypatch):
+    """Share finished plans for a minute, as PLAN_COALESCE_SECONDS does in production"""
+    import routes
+    flights = SingleFlight(linger=60)
+    monkeypatch.setattr(routes, 'plan_flights', flights)
+    return flights
+
+
+def day_count(response):
+    return len(response.json['plan']['daily_schedule'])
+
+
+def plan_count(app):
+    with app.app_context():
+        return StudyPlan.query.count()
+
+
+def test_repeated_request_shares_the_plan(app, client, login, lingering_flights):
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 2, 'Graphs': 1}})
+
+    first = client.post('/api/generate-plan', json={})
+    repeat = client.post('/api/generate-plan', json={})
+
+    assert 'coalesced' not in first.json
+    assert repeat.json['coalesced'] is True
+    assert repeat.json['plan'] == first.json['plan']
+    assert plan_count(app) == 1
+
+
+def test_incremental_request_is_not_shared_after_the_latest_plan_changed(app, client, login, lingering_flights):
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 2, 'Graphs': 1}})
+    incremental = {'incremental': True, 'daily_hours': [3, 3, 3]}
+
+    first = client.post('/api/generate-plan', json=incremental)
+    # A 7-day plan becomes the latest one within the coalescing window
+    client.post('/api/generate-plan', json={})
+    again = client.post('/api/generate-plan', json=incremental)
+
+    assert day_count(first) == 3
+    assert 'coalesced' not in again.json
+    assert day_count(again) == 3
+    assert plan_count(app) == 3
+
+
+def test_incremental_repeat_after_its_own_write_is_shared(app, client, login, lingering_flights):
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 2, 'Graphs': 1}})
+    client.post('/api/generate-plan', json={})
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 3, 'Graphs': 1}})
+
+    first = client.post('/api/generate-plan', json={'incremental': True})
+    repeat = client.post('/api/generate-plan', json={'incremental': True})
+
+    assert first.json['incremental'] is True
+    assert repeat.json['coalesced'] is True
+    assert repeat.json['plan'] == first.json['plan']
@@ -0,0 +1,85 @@
+import json
+from datetime import date
+
+import pytest
+
+import routes
+from study_plan_generator import REVIEW_INTERVALS, StudyPlanGenerator
+
+
+def sessions_by_topic(days):
+    """topic -> [(day number, session, revisit)] over the given days"""
+    found = {}
+    for day in days:
+        for topic in day['topics']:
+            found.setdefault(topic['name'], []).append((day['day'], topic['session'], topic.get('review')))
+    return found
+
+
+def test_recomputed_windows_match_the_full_plan():
+    generator = StudyPlanGenerator(plan_cache=None)
+    ratings = {'Arrays': 1, 'Strings': 2, 'Graphs': 3, 'Heaps': 4, 'Trie': 1, 'Dynamic Programming': 2}
+    start = date(2026, 1, 5)
+
+    full = list(generator.iter_horizon_days(ratings, 60, 42, start))
+    again = list(generator.iter_horizon_days(ratings, 60, 42, start))
+    window = list(generator.iter_horizon_days(ratings, 60, 42, start, from_day=20, count=10))
+
+    assert len(full) == 60
+    assert again == full
+    assert window == full[19:29]
+
+
+def test_weak_topics_come_back_at_the_review_intervals():
+    generator = StudyPlanGenerator(plan_cache=None, daily_time_limits=[8])
+    days = list(generator.iter_horizon_days({'Arrays': 1, 'Heaps': 3, 'Strings': 4}, 90, 7, date(2026, 1, 5)))
+    found = sessions_by_topic(days)
+
+    arrays = found['Arrays']
+    assert arrays[0][:2] == (1, 'study')
+    # Skill 1 is revisited once per interval
+    assert len(arrays) == 1 + len(REVIEW_INTERVALS)
+    day = arrays[0][0]
+    for (review_day, session, _), interval in zip(arrays[1:], REVIEW_INTERVALS):
+        assert session == 'review'
+        # Longer intervals are jittered by a day either way
+        assert abs(review_day - (day + interval)) <= (1 if interval >= 7 else 0)
+        day = review_day
+
+    # Skill 3 gets fewer revisits; strong topics none
+    assert [session for _, session, _ in found['Heaps']] == ['study', 'review', 'review', 'review']
+    assert [session for _, session, _ in found['Strings']] == ['study']
+
+
+@pytest.fixture
+def horizon_client(client, login):
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 1, 'Graphs': 2, 'Trie': 3, 'Heaps': 1}})
+    return client
+
+
+def test_horizon_plan_is_recomputed_identically_from_its_header(horizon_client, monkeypatch):
+    monkeypatch.setattr(routes, 'PLAN_PREREQUISITES', 'transitive')
+    created = horizon_client.post('/api/horizon-plans', json={'days': 30, 'seed': 11, 'daily_hours': [2, 3]})
+    assert created.status_code == 201
+    header = created.json['plan']
+    assert header['prerequisites'] == 'transitive'
+    url = f"/api/horizon-plans/{header['id']}"
+
+    streamed = [json.loads(line) for line in horizon_client.get(url + '?format=ndjson').data.splitlines()]
+    page = horizon_client.get(url + '?from_day=8&count=7').json
+
+    # Flipping the default later does not change a stored plan
+    monkeypatch.setattr(routes, 'PLAN_PREREQUISITES', 'direct')
+    streamed_again = [json.loads(line) for line in horizon_client.get(url + '?format=ndjson').data.splitlines()]
+
+    assert len(streamed) == 30
+    assert page['days'] == streamed[7:14]
+    assert page['next_from_day'] == 15
+    assert streamed_again == streamed
+
+
+def test_horizon_plan_rejects_invalid_options(horizon_client):
+    assert horizon_client.post('/api/horizon-plans', json={'days': 45}).status_code == 400
+    assert horizon_client.post('/api/horizon-plans', json={'prerequisites': 'deep'}).status_code == 400
+    assert horizon_client.post('/api/horizon-plans', json={'seed': -1}).status_code == 400
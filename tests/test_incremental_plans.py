@@ -0,0 +1,73 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from plan_storage import decode_plan, encode_plan
+from scheduler import BinPackingScheduler
+from study_plan_generator import StudyPlanGenerator
+
+
+def restamped(generator, plan, start_date):
+    """A copy of plan whose days start at start_date"""
+    stamps = generator._day_stamps(start_date, len(plan['daily_schedule']))
+    schedule = {}
+    for (day_key, day), (date_text, day_name) in zip(plan['daily_schedule'].items(), stamps):
+        schedule[day_key] = {**day, 'date': date_text, 'day_name': day_name}
+    return {**plan, 'daily_schedule': schedule}
+
+
+def dates(plan):
+    return [(day['date'], day['day_name']) for day in plan['daily_schedule'].values()]
+
+
+def test_update_keeps_dates_of_a_current_plan():
+    generator = StudyPlanGenerator(plan_cache=None)
+    plan = generator.generate_plan({'Arrays': 2, 'Strings': 3, 'Graphs': 1})
+
+    updated = generator.update_plan(plan, {'Arrays': 4})
+
+    assert dates(updated) == dates(plan)
+
+
+def test_update_redates_a_plan_that_started_in_the_past():
+    generator = StudyPlanGenerator(plan_cache=None)
+    plan = generator.generate_plan({'Arrays': 2, 'Strings': 3, 'Graphs': 1})
+    stale = restamped(generator, plan, datetime.now() - timedelta(days=21))
+
+    updated = generator.update_plan(stale, {'Arrays': 4})
+
+    assert dates(updated) == dates(restamped(generator, plan, datetime.now()))
+    expected = generator.update_plan(plan, {'Arrays': 4})
+    assert [day['topics'] for day in updated['daily_schedule'].values()] == \
+        [day['topics'] for day in expected['daily_schedule'].values()]
+
+
+@pytest.mark.parametrize('options', [
+    {'scheduler': BinPackingScheduler()},
+    {'prerequisites': 'transitive'},
+    {'daily_time_limits': [4, 4, 4, 4, 4, 4, 4]},
+])
+def test_plans_built_with_other_options_are_regenerated(options):
+    previous = StudyPlanGenerator(plan_cache=None).generate_plan({'Arrays': 2, 'Strings': 3, 'Graphs': 1})
+
+    assert StudyPlanGenerator(plan_cache=None, **options).update_plan(previous, {'Arrays': 4}) is None
+
+
+def test_plans_without_recorded_options_are_regenerated():
+    generator = StudyPlanGenerator(plan_cache=None)
+    previous = generator.generate_plan({'Arrays': 2, 'Strings': 3, 'Graphs': 1})
+    del previous['generator_options']
+
+    assert generator.update_plan(previous, {'Arrays': 4}) is None
+
+
+def test_stored_plans_keep_their_options():
+    generator = StudyPlanGenerator(plan_cache=None, scheduler=BinPackingScheduler(), prerequisites='transitive',
+                                   daily_time_limits=[2, 5, 3])
+    plan = json.loads(json.dumps(generator.generate_plan({'Arrays': 2, 'Strings': 3, 'Graphs': 1})))
+
+    stored = decode_plan(encode_plan(plan, storage_format='compact'))
+
+    assert stored['generator_options'] == generator.plan_options()
+    assert generator.update_plan(stored, {'Arrays': 4}) is not None
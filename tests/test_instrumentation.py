@@ -0,0 +1,61 @@
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+import instrumentation
+import routes
+
+
+@pytest.fixture
+def collector():
+    instrumentation._local.collector = {'queries': 0, 'query_seconds': 0.0, 'spans': {}}
+    yield instrumentation._local.collector
+    instrumentation._local.collector = None
+
+
+def test_failed_statements_do_not_skew_query_timing(collector):
+    engine = create_engine('sqlite://')
+    event.listen(engine, 'before_cursor_execute', instrumentation._before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', instrumentation._after_cursor_execute)
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text('SELECT * FROM missing_table'))
+        conn.execute(text('SELECT 1'))
+        leftovers = dict(conn.info)
+
+    assert collector['queries'] == 1
+    assert 0 <= collector['query_seconds'] < 1
+    assert not leftovers
+
+
+@pytest.fixture
+def metrics_client(monkeypatch):
+    monkeypatch.setattr(instrumentation, 'METRICS_ENABLED', True)
+    monkeypatch.setattr(instrumentation, 'METRICS_TOKEN', 'scrape-token')
+    monkeypatch.setattr(routes, 'ADMIN_FIREBASE_UIDS', {'uid-admin'})
+    app = Flask('metrics-test')
+    app.secret_key = 'test'
+    instrumentation.init_app(app)
+    yield app.test_client()
+    event.remove(Engine, 'before_cursor_execute', instrumentation._before_cursor_execute)
+    event.remove(Engine, 'after_cursor_execute', instrumentation._after_cursor_execute)
+
+
+def test_metrics_require_an_admin_or_the_scrape_token(metrics_client):
+    assert metrics_client.get('/metrics').status_code == 403
+    assert metrics_client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+
+    scraped = metrics_client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+    assert scraped.status_code == 200
+    assert b'prepmate_requests_total' in scraped.data
+
+    with metrics_client.session_transaction() as session:
+        session['firebase_uid'] = 'uid-other'
+    assert metrics_client.get('/metrics').status_code == 403
+    with metrics_client.session_transaction() as session:
+        session['firebase_uid'] = 'uid-admin'
+    assert metrics_client.get('/metrics').status_code == 200
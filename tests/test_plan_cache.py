@@ -0,0 +1,42 @@
+import random
+
+from plan_cache import PlanCache
+from study_plan_generator import StudyPlanGenerator
+
+
+def shuffled(ratings, rng):
+    items = list(ratings.items())
+    rng.shuffle(items)
+    return dict(items)
+
+
+def test_key_does_not_depend_on_rating_order():
+    ratings = {'Arrays': 2, 'Strings': 3, 'Trie': 1}
+
+    assert PlanCache.key(ratings, 'config') == PlanCache.key(shuffled(ratings, random.Random(1)), 'config')
+    assert PlanCache.key(ratings, 'config') != PlanCache.key({**ratings, 'Trie': 2}, 'config')
+
+
+def test_plan_does_not_depend_on_rating_order():
+    generator = StudyPlanGenerator(plan_cache=None)
+    rng = random.Random(3)
+    topics = list(generator.topics_info)
+    for _ in range(50):
+        # Few distinct levels, so many priorities tie
+        ratings = {topic: rng.choice((2, 4)) for topic in rng.sample(topics, rng.randint(2, len(topics)))}
+        expected = generator.generate_plan(ratings)
+        actual = generator.generate_plan(shuffled(ratings, rng))
+        expected.pop('generated_at')
+        actual.pop('generated_at')
+        assert actual == expected
+
+
+def test_reordered_ratings_hit_the_cache():
+    cache = PlanCache()
+    generator = StudyPlanGenerator(plan_cache=cache)
+    ratings = {'Arrays': 1, 'Graphs': 2, 'Heaps': 3}
+
+    generator.generate_plan(ratings)
+    generator.generate_plan(dict(reversed(list(ratings.items()))))
+
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from jobs import PlanJobQueue
+from models import PlanJob, User
+
+
+class DeadPool:
+    """Executor standing in for a web process that died before running its jobs"""
+    def submit(self, *args):
+        pass
+
+
+@pytest.fixture
+def queue(app, db):
+    ran = []
+
+    def handler(job, ratings, options, report_progress):
+        ran.append(job.id)
+        report_progress(60)
+        return None
+
+    queue = PlanJobQueue(app, handler, lease_seconds=60, keep_seconds=3600)
+    queue._executor = DeadPool()
+    queue.ran = ran
+    with app.app_context():
+        db.session.add(User(firebase_uid='uid-jobs', email='jobs@example.com'))
+        db.session.commit()
+        yield queue
+        db.session.remove()
+
+
+def age(db, job_id, seconds, **values):
+    db.session.execute(
+        db.update(PlanJob).where(PlanJob.id == job_id)
+        .values(updated_at=datetime.utcnow() - timedelta(seconds=seconds), **values))
+    db.session.commit()
+
+
+def user_id(db):
+    return db.session.execute(db.select(User.id)).scalar()
+
+
+def test_identical_submissions_coalesce_while_the_lease_holds(queue, db):
+    first, created = queue.submit(user_id(db), {'Arrays': 2}, {})
+    second, coalesced_created = queue.submit(user_id(db), {'Arrays': 2}, {})
+
+    assert created and not coalesced_created
+    assert second.id == first.id
+
+
+def test_stale_jobs_are_replaced_instead_of_coalesced(queue, db):
+    stale, _ = queue.submit(user_id(db), {'Arrays': 2}, {})
+    stale_id = stale.id
+    age(db, stale_id, 120)
+
+    fresh, created = queue.submit(user_id(db), {'Arrays': 2}, {})
+
+    assert created and fresh.id != stale_id
+    assert db.session.get(PlanJob, stale_id).status == 'failed'
+    assert queue.run_pending() == 1
+    assert queue.ran == [fresh.id]
+
+
+def test_run_pending_reclaims_running_jobs_past_their_lease(queue, db):
+    live, _ = queue.submit(user_id(db), {'Arrays': 2}, {})
+    stale, _ = queue.submit(user_id(db), {'Graphs': 1}, {})
+    live_id, stale_id = live.id, stale.id
+    age(db, live_id, 10, status='running')
+    age(db, stale_id, 120, status='running')
+
+    assert queue.run_pending() == 1
+    assert queue.ran == [stale_id]
+    assert db.session.get(PlanJob, stale_id).status == 'done'
+    assert db.session.get(PlanJob, live_id).status == 'running'
+
+
+def test_prune_deletes_only_old_finished_jobs(queue, db):
+    ids = [queue.submit(user_id(db), {'Arrays': level}, {})[0].id for level in range(1, 5)]
+    age(db, ids[0], 7200, status='done')
+    age(db, ids[1], 7200, status='failed')
+    age(db, ids[2], 60, status='done')
+    age(db, ids[3], 7200, status='running')
+
+    assert queue.prune() == 2
+    assert sorted(db.session.execute(db.select(PlanJob.id)).scalars()) == ids[2:]
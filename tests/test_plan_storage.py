@@ -0,0 +1,47 @@
+import copy
+import json
+
+import pytest
+
+from plan_storage import decode_plan, encode_plan, is_legacy
+from study_plan_generator import StudyPlanGenerator
+
+
+@pytest.fixture
+def plan():
+    generator = StudyPlanGenerator(plan_cache=None)
+    ratings = {'Arrays': 1, 'Strings': 2, 'Hash Tables': 1, 'Two Pointers': 2, 'Graphs': 3}
+    return json.loads(json.dumps(generator.generate_plan(ratings)))
+
+
+def topics(plan):
+    return [topic for day in plan['daily_schedule'].values() for topic in day['topics']]
+
+
+@pytest.mark.parametrize('compression', ['none', 'zlib'])
+def test_generated_plans_are_stored_compactly_and_round_trip(plan, compression):
+    stored = encode_plan(plan, compression=compression, storage_format='compact')
+
+    assert not is_legacy(stored)
+    assert decode_plan(stored) == plan
+
+
+def test_plans_that_would_rebuild_with_other_problems_stay_json(plan):
+    # Written before problems were deduplicated across topics
+    legacy = copy.deepcopy(plan)
+    first, second = topics(legacy)[:2]
+    second['recommended_problems'] = first['recommended_problems'][:1] + second['recommended_problems'][1:]
+
+    stored = encode_plan(legacy, storage_format='compact', verify=True)
+
+    assert is_legacy(stored)
+    assert decode_plan(stored) == legacy
+
+
+def test_decoded_plans_do_not_share_topic_entries(plan):
+    stored = encode_plan(plan, storage_format='compact')
+
+    first = decode_plan(stored)
+    topics(first)[0]['name'] = 'changed'
+
+    assert decode_plan(stored) == plan
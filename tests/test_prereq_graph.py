@@ -0,0 +1,64 @@
+import pytest
+
+from prereq_graph import INDIRECT_PENALTY_WEIGHT, PrerequisiteCycleError, PrerequisiteGraph, prereq_cost
+from study_plan_generator import StudyPlanGenerator
+from topic_catalog import PRACTICE_PROBLEMS, TopicCatalog
+
+
+def catalog(prerequisites):
+    """Catalog of uniform topics with the given {topic: [prerequisites]}"""
+    topics_info = {name: {'time': 2, 'difficulty': 3, 'prerequisites': prereqs}
+                   for name, prereqs in prerequisites.items()}
+    return TopicCatalog(topics_info, PRACTICE_PROBLEMS)
+
+
+def test_cyclic_catalog_raises_with_the_cycle():
+    with pytest.raises(PrerequisiteCycleError) as raised:
+        catalog({'Basics': [], 'A': ['Basics', 'C'], 'B': ['A'], 'C': ['B'], 'D': ['C']})
+
+    cycle = raised.value.cycle
+    assert cycle[0] == cycle[-1]
+    assert sorted(cycle[:-1]) == ['A', 'B', 'C']
+    assert isinstance(raised.value, ValueError)
+
+
+def test_self_prerequisite_is_a_cycle():
+    with pytest.raises(PrerequisiteCycleError):
+        PrerequisiteGraph(['A'], [['A']])
+
+
+def test_closures_and_topological_order():
+    graph = PrerequisiteGraph(['C', 'B', 'A', 'X'], [['B'], ['A'], [], []])
+
+    assert [graph.names[i] for i in graph.topological_order] == ['A', 'B', 'C', 'X']
+    assert graph.ancestors[graph.ids['C']] == 1 << graph.ids['A'] | 1 << graph.ids['B']
+    assert graph.descendants[graph.ids['A']] == 1 << graph.ids['B'] | 1 << graph.ids['C']
+    assert graph.descendants[graph.ids['X']] == 0
+
+
+def test_transitive_mode_penalizes_indirect_prerequisites():
+    chain = catalog({'A': [], 'B': ['A'], 'C': ['B']})
+    ratings = {'A': 1, 'B': 5, 'C': 3}
+
+    direct = StudyPlanGenerator(catalog=chain)._calculate_priorities(ratings)
+    transitive = StudyPlanGenerator(catalog=chain, prerequisites='transitive')._calculate_priorities(ratings)
+    direct = {t['topic']: t['priority'] for t in direct}
+    transitive = {t['topic']: t['priority'] for t in transitive}
+
+    # B is known, so only the weak A two levels up holds C back
+    assert direct['C'] == pytest.approx(transitive['C'] + INDIRECT_PENALTY_WEIGHT * prereq_cost(1))
+    assert direct['A'] == transitive['A']
+    assert direct['B'] == transitive['B']
+
+
+def test_transitive_penalties_count_each_ancestor_once():
+    # D reaches A through both B and C
+    graph = PrerequisiteGraph(['A', 'B', 'C', 'D'], [[], ['A'], ['A'], ['B', 'C']])
+    ratings = {'A': 1, 'B': 3, 'C': 3, 'D': 2}
+
+    direct = graph.penalties(ratings)
+    transitive = graph.penalties(ratings, transitive=True)
+
+    assert direct[graph.ids['D']] == 0
+    assert transitive[graph.ids['D']] == INDIRECT_PENALTY_WEIGHT * prereq_cost(1)
+    assert transitive[graph.ids['B']] == direct[graph.ids['B']] == prereq_cost(1)
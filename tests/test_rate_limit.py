@@ -0,0 +1,62 @@
+import pytest
+
+from ratelimit import DatabaseBucketStore, MemoryBucketStore, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'db'])
+def store(request, app, db):
+    if request.param == 'memory':
+        yield MemoryBucketStore()
+    else:
+        with app.app_context():
+            yield DatabaseBucketStore(db)
+
+
+def test_burst_then_refill(store):
+    clock = Clock()
+    limiter = RateLimiter(store, per_minute=6, burst=3, clock=clock)
+
+    assert [limiter.hit('user:1')[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = limiter.hit('user:1')
+    assert not allowed and retry_after == pytest.approx(10)
+
+    # Other keys have their own bucket
+    assert limiter.hit('user:2')[0]
+
+    clock.now += 10
+    assert limiter.hit('user:1')[0]
+    assert not limiter.hit('user:1')[0]
+
+
+def test_refill_is_capped_at_the_burst(store):
+    clock = Clock()
+    limiter = RateLimiter(store, per_minute=60, burst=2, clock=clock)
+    limiter.hit('user:1')
+
+    clock.now += 3600
+    assert [limiter.hit('user:1')[0] for _ in range(3)] == [True, True, False]
+
+
+def test_generate_plan_returns_429_with_retry_after(client, login, monkeypatch):
+    import routes
+
+    # The app fixture switches limiting off; allow one plan per minute
+    monkeypatch.setattr(routes.plan_limiter, 'store', MemoryBucketStore())
+    monkeypatch.setattr(routes.plan_limiter, 'rate', 1 / 60)
+    monkeypatch.setattr(routes.plan_limiter, 'burst', 1)
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 2}})
+
+    assert client.post('/api/generate-plan', json={}).status_code == 200
+    limited = client.post('/api/generate-plan', json={})
+
+    assert limited.status_code == 429
+    assert int(limited.headers['Retry-After']) >= 1
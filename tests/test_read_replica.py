@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+import routes
+
+
+@pytest.fixture
+def replica(app, db, tmp_path, monkeypatch):
+    """
+    A second SQLite file standing in for a read replica. `sync()` copies
+    the primary onto it, so anything written afterwards is replication lag.
+    Counts the statements each database runs.
+    """
+    path = tmp_path / 'replica.db'
+    engine = create_engine(f'sqlite:///{path}', poolclass=NullPool)
+    monkeypatch.setattr(routes, 'read_engine', lambda: engine)
+
+    with app.app_context():
+        primary_path = db.engine.url.database
+        primary = db.engine
+
+    class Replica:
+        statements = {'primary': 0, 'replica': 0}
+
+        @staticmethod
+        def sync():
+            with sqlite3.connect(primary_path) as source, sqlite3.connect(path) as target:
+                source.backup(target)
+
+    def counter(name):
+        def before_cursor_execute(*args):
+            Replica.statements[name] += 1
+        return before_cursor_execute
+
+    listeners = [(primary, counter('primary')), (engine, counter('replica'))]
+    for target, listener in listeners:
+        event.listen(target, 'before_cursor_execute', listener)
+    yield Replica
+    for target, listener in listeners:
+        event.remove(target, 'before_cursor_execute', listener)
+    engine.dispose()
+
+
+def get_user_data(client, replica):
+    replica.statements.update(primary=0, replica=0)
+    response = client.get('/api/user-data')
+    assert response.status_code == 200
+    return response.json, dict(replica.statements)
+
+
+def test_user_data_is_read_from_an_up_to_date_replica(client, login, replica):
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 2}})
+    replica.sync()
+
+    data, statements = get_user_data(client, replica)
+
+    assert data['topic_ratings'] == {'Arrays': 2}
+    # The version check stays on the primary; the data comes from the replica
+    assert statements == {'primary': 1, 'replica': 1}
+
+
+def test_user_data_falls_back_to_the_primary_while_the_replica_lags(client, login, replica):
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 2}})
+    replica.sync()
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 4, 'Graphs': 1}})
+
+    data, statements = get_user_data(client, replica)
+
+    assert data['topic_ratings'] == {'Arrays': 4, 'Graphs': 1}
+    assert statements == {'primary': 2, 'replica': 1}
+
+
+def test_user_data_falls_back_when_the_replica_has_not_seen_the_user(client, login, replica):
+    replica.sync()
+    login(client)
+    client.post('/api/save-ratings', json={'ratings': {'Trie': 3}})
+
+    data, statements = get_user_data(client, replica)
+
+    assert data['topic_ratings'] == {'Trie': 3}
+    assert statements == {'primary': 2, 'replica': 1}
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from models import PlanJob, StudyPlan, User
+from retention import RetentionPolicy, compact_plan_history
+
+
+@pytest.fixture
+def foreign_keys(app, db):
+    """Enforce foreign keys, which SQLite skips unless asked, as PostgreSQL does"""
+    def enable(dbapi_connection, connection_record):
+        dbapi_connection.execute('PRAGMA foreign_keys=ON')
+
+    with app.app_context():
+        engine = db.engine
+        event.listen(engine, 'connect', enable)
+        engine.dispose()
+        yield
+        db.session.remove()
+        event.remove(engine, 'connect', enable)
+        engine.dispose()
+
+
+def add_plans(db, count, plan_data='{}'):
+    user = User(firebase_uid='uid-retention', email='retention@example.com')
+    db.session.add(user)
+    db.session.flush()
+    start = datetime(2025, 1, 1)
+    plans = [StudyPlan(user_id=user.id, plan_data=plan_data, created_at=start + timedelta(days=day))
+             for day in range(count)]
+    db.session.add_all(plans)
+    db.session.commit()
+    return user.id, [plan.id for plan in plans]
+
+
+def test_pruning_keeps_jobs_that_produced_deleted_plans(db, foreign_keys):
+    user_id, plan_ids = add_plans(db, 6)
+    job = PlanJob(user_id=user_id, dedupe_key='k', payload='{}', status='done', progress=100,
+                  study_plan_id=plan_ids[0])
+    db.session.add(job)
+    db.session.commit()
+
+    progress = list(compact_plan_history(RetentionPolicy(keep_latest=5, keep_daily=0, keep_weekly=0)))
+
+    assert progress[0]['rows_deleted'] == 1
+    assert db.session.get(StudyPlan, plan_ids[0]) is None
+    assert db.session.get(PlanJob, job.id).study_plan_id is None
+
+
+def test_failed_batch_is_rolled_back(db, foreign_keys, monkeypatch):
+    add_plans(db, 6)
+    policy = RetentionPolicy(keep_latest=5, keep_daily=0, keep_weekly=0)
+
+    def fail(plans):
+        raise RuntimeError('policy failed')
+    monkeypatch.setattr(policy, 'plans_to_keep', fail)
+
+    with pytest.raises(RuntimeError):
+        list(compact_plan_history(policy))
+    assert not db.session().in_transaction()
+    assert db.session.query(StudyPlan).count() == 6
+
+
+def test_reclaimed_size_counts_bytes_not_characters(db, foreign_keys):
+    plan_data = '{"topic": "Gráficos – árvores"}'
+    add_plans(db, 7, plan_data)
+
+    progress = list(compact_plan_history(RetentionPolicy(keep_latest=5, keep_daily=0, keep_weekly=0)))
+
+    assert progress[0]['rows_deleted'] == 2
+    assert progress[0]['bytes_reclaimed'] == 2 * len(plan_data.encode('utf-8'))
+    assert len(plan_data.encode('utf-8')) > len(plan_data)
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from scheduler import DEFAULT_DAILY_TIME_LIMITS, BinPackingScheduler
+from study_plan_generator import StudyPlanGenerator
+from topic_catalog import CATALOG
+
+
+def random_priorities(generator, topics, rng):
+    ratings = {topic: rng.randint(1, 5) for topic in rng.sample(list(generator.topics_info), topics)}
+    return generator._calculate_priorities(ratings)
+
+
+@pytest.mark.parametrize('topics', [6, 12])
+def test_binpack_schedule_is_deterministic(topics):
+    generator = StudyPlanGenerator(plan_cache=None)
+    rng = random.Random(topics)
+    for _ in range(20):
+        priorities = random_priorities(generator, topics, rng)
+        first = BinPackingScheduler().schedule(priorities, DEFAULT_DAILY_TIME_LIMITS, CATALOG)
+        second = BinPackingScheduler().schedule(priorities, DEFAULT_DAILY_TIME_LIMITS, CATALOG)
+        assert first == second
+
+
+def test_binpack_stays_within_daily_limits_and_keeps_every_topic():
+    generator = StudyPlanGenerator(plan_cache=None)
+    rng = random.Random(5)
+    for _ in range(20):
+        priorities = random_priorities(generator, 10, rng)
+        days, deferred = BinPackingScheduler().schedule(priorities, DEFAULT_DAILY_TIME_LIMITS, CATALOG)
+        placed = [topic['topic'] for day in days for topic in day] + [topic['topic'] for topic in deferred]
+        assert sorted(placed) == sorted(topic['topic'] for topic in priorities)
+        for day, limit in zip(days, DEFAULT_DAILY_TIME_LIMITS):
+            assert sum(topic['estimated_time'] for topic in day) <= limit
+
+
+def test_binpack_plans_list_deferred_topics():
+    generator = StudyPlanGenerator(plan_cache=None, scheduler=BinPackingScheduler())
+    ratings = {topic: 1 for topic in generator.topics_info}
+
+    plan = generator.generate_plan(ratings)
+
+    scheduled = [t['name'] for day in plan['daily_schedule'].values() for t in day['topics']]
+    deferred = [t['name'] for t in plan['deferred_topics']]
+    assert sorted(scheduled + deferred) == sorted(ratings)
+
+
+def assert_prerequisites_respected(days, deferred, catalog):
+    """Every scheduled topic comes no earlier than its scheduled prerequisites, none of which are deferred"""
+    day_of = {topic: day for day, topics in enumerate(days) for topic in topics}
+    deferred = set(deferred)
+    for topic, day in day_of.items():
+        for prereq in catalog.prereq_names[catalog.ids[topic]]:
+            assert prereq not in deferred, f'{topic} is scheduled but its prerequisite {prereq} is deferred'
+            if prereq in day_of:
+                assert day_of[prereq] <= day, f'{topic} comes before its prerequisite {prereq}'
+
+
+def plan_layout(plan):
+    days = [[t['name'] for t in day['topics']] for day in plan['daily_schedule'].values()]
+    return days, [t['name'] for t in plan.get('deferred_topics', [])]
+
+
+def test_binpack_defers_dependents_of_deferred_prerequisites():
+    generator = StudyPlanGenerator(plan_cache=None, scheduler=BinPackingScheduler())
+    ratings = {'Binary Trees': 2, 'Sliding Window': 2, 'Backtracking': 3, 'Two Pointers': 1,
+               'Binary Search Trees': 3, 'Graphs': 1, 'Greedy Algorithms': 2, 'Strings': 5, 'Heaps': 5,
+               'Bit Manipulation': 5}
+
+    assert_prerequisites_respected(*plan_layout(generator.generate_plan(ratings)), CATALOG)
+
+
+@pytest.mark.parametrize('daily_hours', [list(DEFAULT_DAILY_TIME_LIMITS), [4, 4, 4]])
+def test_binpack_respects_prerequisites_in_new_and_updated_plans(daily_hours):
+    generator = StudyPlanGenerator(plan_cache=None, scheduler=BinPackingScheduler(),
+                                   daily_time_limits=daily_hours)
+    topics = list(generator.topics_info)
+    rng = random.Random(17)
+    for _ in range(60):
+        ratings = {topic: rng.randint(1, 5) for topic in rng.sample(topics, rng.randint(2, 12))}
+        plan = generator.generate_plan(ratings)
+        assert_prerequisites_respected(*plan_layout(plan), CATALOG)
+
+        updated = generator.update_plan(plan, {topic: rng.randint(1, 5) for topic in rng.sample(topics, 2)})
+        assert_prerequisites_respected(*plan_layout(updated), CATALOG)
@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight(linger=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'plan'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('key', slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flights.do('key', slow)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results, key=lambda r: r[1]) == [('plan', False), ('plan', True)]
+    assert len(flights) == 0
+
+
+def test_finished_results_linger_then_expire():
+    clock = Clock()
+    flights = SingleFlight(linger=2, clock=clock)
+
+    assert flights.do('key', lambda: 1) == (1, False)
+    clock.now = 1.5
+    assert flights.do('key', lambda: 2) == (1, True)
+    clock.now = 3.5
+    assert flights.do('key', lambda: 3) == (3, False)
+
+
+def test_failures_are_not_shared_with_later_callers():
+    flights = SingleFlight(linger=60, clock=Clock())
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        flights.do('key', fail)
+    assert len(flights) == 0
+    assert flights.do('key', lambda: 'ok') == ('ok', False)
+
+
+def test_alias_shares_the_call_under_a_second_key():
+    flights = SingleFlight(linger=60, clock=Clock())
+
+    def run():
+        flights.alias('v1', 'v2')
+        return 'plan'
+
+    assert flights.do('v1', run) == ('plan', False)
+    assert flights.do('v2', lambda: 'other') == ('plan', True)
+
+
+def test_aliases_of_a_failed_call_are_dropped():
+    flights = SingleFlight(linger=60, clock=Clock())
+
+    def fail():
+        flights.alias('v1', 'v2')
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        flights.do('v1', fail)
+    assert flights.do('v2', lambda: 'ok') == ('ok', False)
@@ -0,0 +1,41 @@
+from token_cache import TokenCache, token_cache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_at_the_token_exp_claim():
+    clock = Clock()
+    cache = TokenCache(clock=clock)
+    cache.put('token', 'uid-a', 1, expires_at=clock.now + 60)
+    assert cache.get('token') == ('uid-a', 1)
+
+    clock.now += 60
+    assert cache.get('token') is None
+    assert len(cache) == 0
+
+
+def test_invalidate_uid_drops_only_that_users_tokens():
+    clock = Clock()
+    cache = TokenCache(clock=clock)
+    cache.put('laptop', 'uid-a', 1, expires_at=clock.now + 60)
+    cache.put('phone', 'uid-a', 1, expires_at=clock.now + 60)
+    cache.put('other', 'uid-b', 2, expires_at=clock.now + 60)
+
+    cache.invalidate_uid('uid-a')
+    assert cache.get('laptop') is None
+    assert cache.get('phone') is None
+    assert cache.get('other') == ('uid-b', 2)
+
+
+def test_logout_forgets_the_users_cached_tokens(client, login):
+    login(client, 'alice')
+    assert token_cache.get('alice') is not None
+
+    assert client.post('/api/logout').status_code == 200
+    assert token_cache.get('alice') is None
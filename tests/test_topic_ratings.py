@@ -0,0 +1,44 @@
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from models import SkillAggregate, TopicRating, User
+
+
+def add_user(db):
+    user = User(firebase_uid='uid-ratings', email='ratings@example.com')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def test_upsert_locks_the_user_before_reading_ratings(app, db):
+    with app.app_context():
+        user_id = add_user(db)
+        statements = []
+
+        def record(orm_execute_state):
+            statements.append(orm_execute_state.statement)
+
+        event.listen(db.session, 'do_orm_execute', record)
+        try:
+            TopicRating.upsert_for_user(user_id, {'Arrays': 2})
+        finally:
+            event.remove(db.session, 'do_orm_execute', record)
+        db.session.rollback()
+
+    lock, read = (str(statement.compile(dialect=postgresql.dialect())) for statement in statements[:2])
+    assert lock.startswith('SELECT "user".id') and lock.endswith('FOR UPDATE')
+    assert 'FROM topic_rating' in read
+
+
+def test_sequential_saves_keep_aggregates_in_step(app, db):
+    with app.app_context():
+        user_id = add_user(db)
+        for ratings in ({'Arrays': 2, 'Graphs': 1}, {'Arrays': 4}, {'Graphs': 1, 'Trie': 5}):
+            SkillAggregate.apply_changes(TopicRating.upsert_for_user(user_id, ratings))
+            db.session.commit()
+
+        counts = {(row.topic_name, row.skill_level): row.user_count
+                  for row in SkillAggregate.query if row.user_count}
+
+    assert counts == {('Arrays', 4): 1, ('Graphs', 1): 1, ('Trie', 5): 1}
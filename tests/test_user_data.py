@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def statements(app, db):
+    """Collects the SQL statements run inside a `with statements.count():` block"""
+    class Recorder:
+        def __init__(self):
+            self.executed = []
+
+        @contextmanager
+        def count(self):
+            self.executed.clear()
+            engines = set(db.engines.values())
+
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                self.executed.append(statement)
+
+            for engine in engines:
+                event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+            try:
+                yield self.executed
+            finally:
+                for engine in engines:
+                    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    with app.app_context():
+        yield Recorder()
+
+
+def test_user_data_round_trips_per_response_kind(client, login, statements):
+    login(client)
+    assert client.post('/api/save-ratings', json={'ratings': {'Arrays': 2, 'Graphs': 4}}).status_code == 200
+
+    # Cache miss: the data version, then the profile, ratings and plan in one statement
+    with statements.count() as executed:
+        response = client.get('/api/user-data')
+    assert response.status_code == 200
+    assert response.json['topic_ratings'] == {'Arrays': 2, 'Graphs': 4}
+    assert len(executed) == 2
+
+    # Revalidation with the current ETag only reads the version
+    with statements.count() as executed:
+        revalidated = client.get('/api/user-data', headers={'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert len(executed) == 1
+
+    # Cached body for the same version: no data query either
+    with statements.count() as executed:
+        cached = client.get('/api/user-data')
+    assert cached.data == response.data
+    assert len(executed) == 1
+
+
+def test_saving_ratings_changes_the_user_data_etag(client, login):
+    login(client)
+    first = client.get('/api/user-data')
+
+    client.post('/api/save-ratings', json={'ratings': {'Arrays': 3}})
+    second = client.get('/api/user-data', headers={'If-None-Match': first.headers['ETag']})
+
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.json['topic_ratings'] == {'Arrays': 3}
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified Firebase ID tokens.
+    Maps a SHA-256 of the raw token to (firebase_uid, user_id) and expires
+    each entry at the token's own `exp` claim, so a token is never trusted
+    for longer than Firebase would trust it.
+    """
+
+    def __init__(self, max_size=10000, clock=time.time):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(id_token):
+        return hashlib.sha256(id_token.encode('utf-8')).hexdigest()
+
+    def get(self, id_token):
+        """Return (firebase_uid, user_id) for a cached, unexpired token or None"""
+        key = self._key(id_token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            firebase_uid, user_id, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return firebase_uid, user_id
+
+    def put(self, id_token, firebase_uid, user_id, expires_at):
+        """Remember a verified token until its `exp` claim"""
+        if not expires_at or expires_at <= self._clock():
+            return
+        key = self._key(id_token)
+        with self._lock:
+            self._entries[key] = (firebase_uid, user_id, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_uid(self, firebase_uid):
+        """Drop every cached token belonging to a Firebase user"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[0] == firebase_uid]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(max_size=int(os.environ.get("TOKEN_CACHE_SIZE", "10000")))
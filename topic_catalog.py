@@ -0,0 +1,145 @@
+from array import array
+from types import MappingProxyType
+from prereq_graph import PrerequisiteGraph
+from problem_bank import PROBLEM_BANK, PracticeProblems, ProblemBank
+
+# DSA topics with estimated study time (in hours) and prerequisites.
+# Append new topics at the end: a topic's position is its interned id.
+TOPICS_INFO = {
+    'Arrays': {'time': 2, 'difficulty': 1, 'prerequisites': []},
+    'Strings': {'time': 2, 'difficulty': 1, 'prerequisites': []},
+    'Linked Lists': {'time': 3, 'difficulty': 2, 'prerequisites': []},
+    'Stacks': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
+    'Queues': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
+    'Hash Tables': {'time': 3, 'difficulty': 2, 'prerequisites': ['Arrays']},
+    'Binary Trees': {'time': 4, 'difficulty': 3, 'prerequisites': ['Linked Lists']},
+    'Binary Search Trees': {'time': 3, 'difficulty': 3, 'prerequisites': ['Binary Trees']},
+    'Heaps': {'time': 3, 'difficulty': 3, 'prerequisites': ['Binary Trees']},
+    'Graphs': {'time': 5, 'difficulty': 4, 'prerequisites': ['Hash Tables']},
+    'Dynamic Programming': {'time': 6, 'difficulty': 5, 'prerequisites': ['Arrays', 'Strings']},
+    'Greedy Algorithms': {'time': 4, 'difficulty': 4, 'prerequisites': ['Arrays']},
+    'Backtracking': {'time': 4, 'difficulty': 4, 'prerequisites': ['Arrays', 'Strings']},
+    'Sorting Algorithms': {'time': 3, 'difficulty': 2, 'prerequisites': ['Arrays']},
+    'Searching Algorithms': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
+    'Two Pointers': {'time': 2, 'difficulty': 2, 'prerequisites': ['Arrays']},
+    'Sliding Window': {'time': 3, 'difficulty': 3, 'prerequisites': ['Arrays', 'Two Pointers']},
+    'Bit Manipulation': {'time': 2, 'difficulty': 3, 'prerequisites': []},
+    'Trie': {'time': 3, 'difficulty': 3, 'prerequisites': ['Strings', 'Binary Trees']},
+    'Union Find': {'time': 3, 'difficulty': 3, 'prerequisites': ['Arrays']},
+}
+
+# Practice problems for each topic, ordered easy to hard, from
+# data/problem_bank.tsv (loaded on first use)
+PRACTICE_PROBLEMS = PracticeProblems(PROBLEM_BANK)
+
+# Number of problems offered to beginner and intermediate users; advanced
+# users get the full list
+SKILL_TIER_LIMITS = (3, 4)
+
+
+def skill_tier(skill_level):
+    """Map a 1-5 skill level to a problem tier (0 beginner, 1 intermediate, 2 advanced)"""
+    if skill_level <= 2:
+        return 0
+    elif skill_level <= 3:
+        return 1
+    return 2
+
+
+class TopicCatalog:
+    """
+    Immutable, array-backed view of the topic catalog.
+    Topic names are interned to integer ids; per-topic scalars live in
+    compact arrays, prerequisites live in a PrerequisiteGraph (ordered id
+    tuples, bitmasks and transitive closures), and problem lists are
+    pre-sliced per skill tier. Built once per process and shared by every
+    StudyPlanGenerator.
+    """
+
+    def __init__(self, topics_info, practice_problems):
+        self.names = tuple(topics_info)
+        self.ids = MappingProxyType({name: i for i, name in enumerate(self.names)})
+        self.time = array('h', (topics_info[name]['time'] for name in self.names))
+        self.difficulty = array('b', (topics_info[name]['difficulty'] for name in self.names))
+        # Score terms precomputed in the same float form the generator uses
+        self.difficulty_bonus = array('d', (d * 0.5 for d in self.difficulty))
+        self.time_factor = array('d', (t / 10 for t in self.time))
+
+        # Raises PrerequisiteCycleError if the prerequisites form a cycle
+        self.graph = PrerequisiteGraph(self.names, (topics_info[name]['prerequisites'] for name in self.names))
+        self.prereq_names = self.graph.prereq_names
+        self.prereq_ids = self.graph.prereq_ids
+        self.prereq_masks = self.graph.prereq_masks
+        self.dependent_ids = self.graph.dependent_ids
+
+        # A ProblemBank, or a {topic: [titles]} mapping
+        if isinstance(practice_problems, PracticeProblems):
+            practice_problems = practice_problems.bank
+        if not isinstance(practice_problems, ProblemBank):
+            practice_problems = ProblemBank.from_mapping(practice_problems)
+        self.bank = practice_problems
+        self._problems = None
+        self.resources = tuple(
+            MappingProxyType({
+                'theory': f"Review {name} concepts and time complexity",
+                'practice': f"LeetCode {name} problems",
+                'reference': f"GeeksforGeeks {name} articles"
+            })
+            for name in self.names
+        )
+
+    @property
+    def problems(self):
+        """Per-topic problem titles pre-sliced per skill tier, built on first use"""
+        if self._problems is None:
+            self._problems = tuple(
+                self._slice_tiers(tuple(problem.title for problem in self.bank.problems(name)))
+                for name in self.names
+            )
+        return self._problems
+
+    @staticmethod
+    def _slice_tiers(problems):
+        return tuple(problems[:limit] for limit in SKILL_TIER_LIMITS) + (problems,)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, topic):
+        return topic in self.ids
+
+    def problems_for(self, topic_id, skill_level):
+        """Pre-sliced problem tuple for a topic at the given skill level"""
+        return self.problems[topic_id][skill_tier(skill_level)]
+
+    def select_problems(self, topic_id, skill_level, used=None):
+        """
+        Problem titles for a topic at a skill level. With `used`, a set of
+        problem keys already recommended elsewhere in the plan, repeats are
+        swapped for the topic's next unused problem of the same difficulty
+        (else of any difficulty) or dropped, and the chosen keys are added
+        to `used`.
+        """
+        entries = self.bank.problems(self.names[topic_id])
+        titles = self.problems_for(topic_id, skill_level)
+        if used is None:
+            return list(titles)
+
+        tier = entries[:len(titles)]
+        tier_keys = {problem.key for problem in tier}
+        if len(tier_keys) == len(tier) and used.isdisjoint(tier_keys):
+            used |= tier_keys
+            return list(titles)
+        chosen = []
+        for problem in tier:
+            if problem.key in used:
+                candidates = self.bank.bucket(self.names[topic_id], problem.difficulty) + entries
+                problem = next((p for p in candidates if p.key not in used and p.key not in tier_keys), None)
+                if problem is None:
+                    continue
+            used.add(problem.key)
+            chosen.append(problem.title)
+        return chosen
+
+
+CATALOG = TopicCatalog(TOPICS_INFO, PRACTICE_PROBLEMS)